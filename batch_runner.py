@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+헤드리스 일괄 예측 실행기 (Tk 없이 실행)
+
+인원 명단(CSV/XLSX)을 일정 크기 묶음(chunk)으로 읽어 ML/DL 모델을 병렬로 실행하고,
+결과를 생성되는 즉시 CSV/Parquet/JSONL 파일로 기록합니다.
+동시에 처리 중인 묶음 수가 제한되므로 명단 크기와 관계없이 메모리 사용량이 일정합니다.
+
+사용법:
+    python main.py --batch roster.csv --output forecast.csv
+    python main.py --batch roster.xlsx --output forecast.parquet --hours 168 --workers 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# 명단 열 이름 별칭 (한글 헤더 지원)
+ROSTER_ALIASES = {
+    'name': ['name', '이름', '성명'],
+    'gender': ['gender', '성별'],
+    'age': ['age', '나이'],
+    'service_years': ['service_years', '근속연수', '근속'],
+    'mission': ['mission', '임무']
+}
+
+OUTPUT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+
+def _rename_columns(columns):
+    """명단 헤더 → 표준 열 이름 매핑"""
+    mapping = {}
+    for column in columns:
+        key = str(column).strip().lower()
+        for field, aliases in ROSTER_ALIASES.items():
+            if key in aliases:
+                mapping[column] = field
+    return mapping
+
+
+def read_roster_chunks(path, chunk_size):
+    """명단 파일을 chunk_size 명씩 DataFrame 으로 스트리밍"""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        # read_only 모드: 시트 전체를 메모리에 올리지 않고 행 단위로 읽음
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows)
+            mapping = _rename_columns(header)
+            chunk = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield pd.DataFrame(chunk, columns=header).rename(columns=mapping)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header).rename(columns=mapping)
+        finally:
+            workbook.close()
+    else:
+        for frame in pd.read_csv(path, chunksize=chunk_size, encoding='utf-8-sig'):
+            yield frame.rename(columns=_rename_columns(frame.columns))
+
+
+class ResultSink:
+    """예측 결과 스트리밍 기록기 (CSV / JSONL / Parquet)"""
+
+    def __init__(self, path, output_format=None):
+        self.path = Path(path)
+        self.format = output_format or OUTPUT_FORMATS.get(self.path.suffix.lower())
+        if self.format not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {self.path.suffix} (csv, jsonl, parquet)")
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        if self.format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise RuntimeError("Parquet 출력에는 pyarrow 가 필요합니다: pip install pyarrow") from None
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8-sig' if self.format == 'csv' else 'utf-8',
+                              newline='')
+        return self
+
+    def write(self, frame):
+        """DataFrame 묶음 하나를 파일에 이어 쓰기"""
+        if self.format == 'csv':
+            frame.to_csv(self._file, header=self.rows == 0, index=False)
+        elif self.format == 'jsonl':
+            frame.to_json(self._file, orient='records', lines=True, force_ascii=False, date_format='iso')
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        self.rows += len(frame)
+
+    def __exit__(self, *exc):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def predict_chunk(ml_model, dl_model, roster, missions, hours, start_time, keyword_pool=None, person_offset=0):
+    """명단 묶음 하나 예측 (ML 시간대별 위험지수 + DL 위험 키워드)"""
+    import numpy as np
+
+    # DL 키워드는 ML 배치 계산과 병렬로 생성
+    keywords_future = None
+    if dl_model is not None and keyword_pool is not None:
+        keywords_future = keyword_pool.submit(chunk_keywords, dl_model, roster, missions, start_time)
+
+    frame = ml_model.predict_batch(roster, missions, hours, start_time)
+    frame['person'] += person_offset  # 명단 전체 기준 인원 번호
+
+    if keywords_future is not None:
+        # (인원, 임무) 키워드를 시간 축으로 반복해 행에 맞춤
+        keywords = keywords_future.result()
+        frame['risk_keywords'] = np.repeat(keywords, hours)
+    return frame
+
+
+def chunk_keywords(dl_model, roster, missions, start_time=None):
+    """(인원 × 임무) 위험 키워드 (' | ' 로 연결한 문자열 배열, 같은 시작 시각이면 같은 키워드)"""
+    import numpy as np
+
+    # 인원 × 임무 행으로 펼쳐 키워드 인덱스 일괄 추출 한 번으로 처리
+    people = roster[['gender', 'age', 'service_years']].iloc[np.repeat(np.arange(len(roster)), len(missions))]
+    keywords = dl_model.generate_risk_keywords_batch(people, list(missions) * len(roster),
+                                                     start_time=start_time)
+    return np.array([' | '.join(row) for row in keywords], dtype=object)
+
+
+def run_batch(roster_path, output_path, missions=None, hours=24, chunk_size=500, workers=2,
+              start_time=None, use_dl=True, output_format=None):
+    """명단 전체 일괄 예측 후 결과 스트리밍 기록, 처리 통계 반환"""
+    from models.dummy_model import DummyMLModel, DummyDLModel, check_missions
+
+    # 모델 로딩 / 출력 파일 생성 전에 임무 목록 검증
+    missions = check_missions(missions or DummyMLModel.MISSION_RISKS)
+    ml_model = DummyMLModel()
+    dl_model = DummyDLModel() if use_dl else None
+    start_time = start_time or datetime.now()
+
+    started = time.perf_counter()
+    people = 0
+    # 동시에 처리 중인 묶음 수를 제한해 메모리 사용량을 일정하게 유지
+    max_in_flight = workers * 2
+    with ResultSink(output_path, output_format) as sink, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as pool, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='keywords') as keyword_pool:
+        in_flight = deque()
+        for roster in read_roster_chunks(roster_path, chunk_size):
+            in_flight.append(pool.submit(
+                predict_chunk, ml_model, dl_model, roster, missions, hours, start_time, keyword_pool, people))
+            people += len(roster)
+            # 입력 순서대로 완료된 묶음부터 기록
+            while len(in_flight) >= max_in_flight:
+                sink.write(in_flight.popleft().result())
+        while in_flight:
+            sink.write(in_flight.popleft().result())
+        rows = sink.rows
+
+    elapsed = time.perf_counter() - started
+    return {
+        'people': people,
+        'missions': len(missions),
+        'hours': hours,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="안전 예측 헤드리스 일괄 실행")
+    parser.add_argument('--batch', required=True, metavar='ROSTER', help="인원 명단 파일 (CSV/XLSX)")
+    parser.add_argument('--output', required=True, help="결과 파일 (.csv / .jsonl / .parquet)")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], help="출력 형식 (기본: 확장자)")
+    parser.add_argument('--missions', nargs='+', help="예측할 임무 (기본: 전체)")
+    parser.add_argument('--hours', type=int, default=24, help="예측 시간 수 (기본: 24)")
+    parser.add_argument('--start', type=datetime.fromisoformat, help="예측 시작 시각 (ISO 형식, 기본: 현재)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="묶음당 인원 수 (기본: 500)")
+    parser.add_argument('--workers', type=int, default=2, help="병렬 작업자 수 (기본: 2)")
+    parser.add_argument('--no-dl', action='store_true', help="DL 위험 키워드 생략")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 일괄 예측 시작: {args.batch} → {args.output}")
+    try:
+        stats = run_batch(
+            args.batch, args.output, args.missions, args.hours, args.chunk_size, args.workers,
+            args.start, not args.no_dl, args.format
+        )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ 일괄 예측 실패: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ 일괄 예측 완료: {stats['people']:,}명 × {stats['missions']}개 임무 × {stats['hours']}시간 "
+          f"= {stats['rows']:,}행")
+    print(f"⏱️ {stats['seconds']:.2f}초, 처리량 {stats['rows_per_sec']:,.0f}행/초")
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
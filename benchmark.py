@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예측 성능 벤치마크 스크립트
+기존 시간 루프 방식과 벡터화 방식의 위험지수 예측 속도 비교,
+고정 시드 / 합성 명단으로 주요 경로를 측정해 기준 파일(JSON)과 비교하는 회귀 검사
+
+사용법:
+    python benchmark.py                                       # 기존 방식 대비 속도 비교
+    python benchmark.py --suite --output benchmark_baseline.json
+    python benchmark.py --suite --compare benchmark_baseline.json --threshold 0.25   # 회귀 시 종료 코드 1
+"""
+
+import argparse
+import json
+import itertools
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from models.dummy_model import DummyMLModel, DummyDLModel
+from models.keyword_index import MISSION_KEYWORDS, COMMON_KEYWORDS
+from models.incremental_forecast import IncrementalForecast
+from models.random_streams import hourly_uniform, hour_numbers, STREAM_RISK_SERIES
+
+# 벤치마크 대상 예측 기간 (1일, 1주일, 전체 기간(8-12월))
+BENCH_HOURS = [24, 168, 3672]
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# 회귀 검사 스위트: 예측 기간, 일괄 처리 명단 크기, 고정 시작 시각 / 임무
+SUITE_HOURS = [1, 24, 168, 3672]
+SUITE_ROSTER = 1000
+SUITE_START = datetime(2025, 8, 1, 0, 0)
+SUITE_MISSION = '복합적층장갑'
+
+# 기준 대비 이 비율 이상 느려지면 회귀 (최소 시간 기준), 이보다 작은 차이(ms)는 측정 잡음으로 무시
+DEFAULT_THRESHOLD = 0.25
+MIN_REGRESSION_MS = 0.05
+
+TEST_USER = {
+    'name': '정수호',
+    'gender': '남성',
+    'age': '30',
+    'service_years': '5'
+}
+
+
+def legacy_predict_risk_score(model, user_info, mission_type, prediction_hours, start_time, noise=None):
+    """기존 시간 루프 방식 예측 (비교 기준, noise: 시간별 변동 값, 생략 시 전역 np.random)"""
+    base_risk = 5.0
+    base_risk += min(abs(int(user_info['age']) - 30) * 0.05, 2.0)
+    base_risk += max(0, 3 - int(user_info['service_years'])) * 0.3
+    mission_risk = model.MISSION_RISKS.get(mission_type, model.DEFAULT_MISSION_RISK)
+
+    predictions = []
+    for hour in range(prediction_hours):
+        hour_of_day = (start_time.hour + hour) % 24
+
+        if 22 <= hour_of_day or hour_of_day <= 6:
+            time_factor = 1.2
+        elif 8 <= hour_of_day <= 17:
+            time_factor = 0.9
+        else:
+            time_factor = 1.0
+
+        final_risk = (base_risk + mission_risk) / 2 * time_factor
+        final_risk += noise[hour] if noise is not None else np.random.uniform(-0.5, 0.5)
+        final_risk = np.clip(final_risk, 0.0, 10.0)
+
+        predictions.append({
+            'timestamp': start_time + timedelta(hours=hour),
+            'risk_score': round(final_risk, 1),
+            'hour_of_day': hour_of_day,
+            'risk_level': model.get_risk_level(final_risk)
+        })
+
+    return predictions
+
+
+def vectorized_predict_risk_score(model, user_info, mission_type, prediction_hours, start_time):
+    """벡터화 방식 예측 (딕셔너리 리스트 변환 포함)"""
+    series = model.predict_risk_series(user_info, mission_type, prediction_hours, start_time)
+    return [
+        {
+            'timestamp': timestamp,
+            'risk_score': risk_score,
+            'hour_of_day': hour_of_day,
+            'risk_level': risk_level
+        }
+        for timestamp, risk_score, hour_of_day, risk_level in zip(
+            series['timestamp'].astype(object),
+            series['risk_score'].tolist(),
+            series['hour_of_day'].tolist(),
+            series['risk_level'].tolist()
+        )
+    ]
+
+
+def time_call(func, repeat):
+    """최소 실행 시간 측정 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_parity(model, prediction_hours, start_time):
+    """같은 시간별 난수에서 두 방식의 결과가 같은지 확인"""
+    noise = hourly_uniform(STREAM_RISK_SERIES, TEST_USER, '복합적층장갑',
+                           hour_numbers(start_time, prediction_hours), -0.5, 0.5).tolist()
+    legacy = legacy_predict_risk_score(model, TEST_USER, '복합적층장갑', prediction_hours, start_time, noise)
+    vectorized = vectorized_predict_risk_score(model, TEST_USER, '복합적층장갑', prediction_hours, start_time)
+    return legacy == vectorized
+
+
+def bench_predict_risk_score(model, repeat=5):
+    """예측 기간별 속도 비교"""
+    start_time = datetime(2025, 8, 1, 0, 0)
+
+    print(f"{'기간(시간)':>10} {'루프(ms)':>12} {'벡터화(ms)':>12} {'배열만(ms)':>12} {'속도향상':>10} {'결과일치':>8}")
+    for hours in BENCH_HOURS:
+        legacy = time_call(
+            lambda: legacy_predict_risk_score(model, TEST_USER, '복합적층장갑', hours, start_time), repeat)
+        vectorized = time_call(
+            lambda: vectorized_predict_risk_score(model, TEST_USER, '복합적층장갑', hours, start_time), repeat)
+        arrays_only = time_call(
+            lambda: model.predict_risk_series(TEST_USER, '복합적층장갑', hours, start_time), repeat)
+        parity = check_parity(model, hours, start_time)
+
+        print(f"{hours:>10} {legacy * 1000:>12.3f} {vectorized * 1000:>12.3f} "
+              f"{arrays_only * 1000:>12.3f} {legacy / arrays_only:>9.1f}x {'O' if parity else 'X':>8}")
+
+
+def make_roster(size, seed=2025):
+    """합성 인원 명단 생성"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': [f'정비사{i:05d}' for i in range(size)],
+        'gender': rng.choice(['남성', '여성'], size),
+        'age': rng.integers(20, 60, size),
+        'service_years': rng.integers(0, 30, size)
+    })
+
+
+def bench_predict_batch(model, roster_sizes=(100, 1000, 5000), hours=24):
+    """인원 × 임무 × 시간 일괄 예측 속도"""
+    missions = list(model.MISSION_RISKS)
+    start_time = datetime(2025, 8, 1, 0, 0)
+
+    print(f"{'인원':>8} {'행 수':>12} {'배열(ms)':>12} {'DataFrame(ms)':>15} {'행/초':>14}")
+    for size in roster_sizes:
+        roster = make_roster(size)
+        arrays_only = time_call(
+            lambda: model.predict_batch(roster, missions, hours, start_time, as_frame=False), 3)
+        frame = time_call(lambda: model.predict_batch(roster, missions, hours, start_time), 3)
+        rows = size * len(missions) * hours
+        print(f"{size:>8} {rows:>12,} {arrays_only * 1000:>12.1f} {frame * 1000:>15.1f} {rows / frame:>14,.0f}")
+
+
+def legacy_feature_rows(model, user_info, start_time, prediction_hours):
+    """기존 방식: 행마다 인코더 딕셔너리 조회 + 스케일링 계산"""
+    tables = model.features
+    rows = []
+    for hour in range(prediction_hours):
+        timestamp = start_time + timedelta(hours=hour)
+        rows.append([
+            (tables.gender_codes[user_info['gender']] - tables.mean['gender']) / tables.std['gender'],
+            (int(user_info['age']) - tables.mean['age']) / tables.std['age'],
+            (int(user_info['service_years']) - tables.mean['service_years']) / tables.std['service_years'],
+            0.0, 0.0, 0.0,
+            (timestamp.month - tables.mean['month']) / tables.std['month'],
+            (timestamp.weekday() - tables.mean['weekday']) / tables.std['weekday'],
+            (timestamp.hour - tables.mean['hour']) / tables.std['hour']
+        ])
+    return np.array(rows)
+
+
+def bench_feature_matrix(model, repeat=5):
+    """3,672 × 9 설계 행렬 생성 속도"""
+    start_time = datetime(2025, 8, 1, 0, 0)
+    hours = BENCH_HOURS[-1]
+    legacy = time_call(lambda: legacy_feature_rows(model, TEST_USER, start_time, hours), repeat)
+    gathered = time_call(lambda: model.build_feature_matrix(TEST_USER, start_time, hours), repeat)
+    parity = np.allclose(legacy_feature_rows(model, TEST_USER, start_time, hours),
+                         model.build_feature_matrix(TEST_USER, start_time, hours))
+    print(f"설계 행렬 {hours}×{len(model.feature_names)}: 행 단위 {legacy * 1000:.2f}ms → "
+          f"룩업 gather {gathered * 1000:.3f}ms ({legacy / gathered:.0f}x, 결과일치 {'O' if parity else 'X'})")
+
+
+def legacy_generate_risk_keywords(user_info, mission_type, num_keywords=10):
+    """기존 방식: 호출마다 키워드 리스트 생성 + 중복 제거 + 전역 셔플"""
+    base_keywords = {mission: list(words) for mission, words in MISSION_KEYWORDS.items()}
+    common_keywords = list(COMMON_KEYWORDS)
+
+    personal_keywords = []
+    age = int(user_info['age'])
+    service_years = int(user_info['service_years'])
+    if age >= 50:
+        personal_keywords.extend(['신체 기능 저하', '반응속도 지연'])
+    elif age <= 25:
+        personal_keywords.extend(['경험 부족', '과신 위험'])
+    if service_years <= 2:
+        personal_keywords.extend(['숙련도 부족', '절차 미숙지'])
+    elif service_years >= 15:
+        personal_keywords.extend(['관습적 작업', '안전 불감증'])
+
+    mission_keywords = base_keywords.get(mission_type, common_keywords[:6])
+    unique_keywords = list(set(mission_keywords + common_keywords + personal_keywords))
+    random.shuffle(unique_keywords)
+    return unique_keywords[:num_keywords]
+
+
+def bench_keywords(model, roster_sizes=(1, 1000, 10000)):
+    """위험 키워드 생성 속도 (기존 방식 인원별 호출 vs 키워드 인덱스 일괄 추출)"""
+    missions = list(MISSION_KEYWORDS)
+    start_time = datetime(2025, 8, 1, 0, 0)
+
+    print(f"{'인원':>8} {'기존(ms)':>12} {'인덱스(ms)':>12} {'속도향상':>10}")
+    for size in roster_sizes:
+        roster = make_roster(size)
+        records = roster.to_dict('records')
+        roster_missions = [missions[i % len(missions)] for i in range(size)]
+        legacy = time_call(
+            lambda: [legacy_generate_risk_keywords(record, mission)
+                     for record, mission in zip(records, roster_missions)], 3)
+        indexed = time_call(
+            lambda: model.generate_risk_keywords_batch(roster, roster_missions, start_time=start_time), 3)
+        print(f"{size:>8} {legacy * 1000:>12.2f} {indexed * 1000:>12.2f} {legacy / indexed:>9.1f}x")
+
+
+# ----------------------------------------------------------------------
+# 회귀 검사 스위트
+
+def measure(func, repeat, setup=None):
+    """반복 실행 시간 (setup 은 매 반복 전 실행, 측정 제외) → 최소 / 중앙값 (ms)"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': min(times), 'median_ms': float(np.median(times)), 'repeat': repeat}
+
+
+def measure_cold_start(statement, repeat=5):
+    """새 프로세스에서 statement 실행 시간 (인터프리터 시작 제외, ms)"""
+    code = f"import time; _t = time.perf_counter(); {statement}; print((time.perf_counter() - _t) * 1000)"
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"콜드 스타트 측정 실패 ({statement}):\n{result.stderr}")
+        times.append(float(result.stdout.split()[-1]))
+    return {'best_ms': min(times), 'median_ms': float(np.median(times)), 'repeat': repeat}
+
+
+def suite_report_results(ml_model, dl_model, hours):
+    """보고서 기록 측정용 예측 결과 (GUI 엑셀 저장과 같은 구조)"""
+    keywords = dl_model.generate_risk_keywords(TEST_USER, SUITE_MISSION, seed=2025)
+    measures = dl_model.recommend_safety_measures(TEST_USER, SUITE_MISSION, keywords)
+    hourly = ml_model.predict_risk_series(TEST_USER, SUITE_MISSION, hours, SUITE_START)
+    return {
+        'risk_score': float(hourly['risk_score'][0]),
+        'keywords': keywords,
+        'safety_tips': '\n'.join(measures['measures']),
+        'hourly': hourly,
+        'timestamp': SUITE_START,
+        'user_info': dict(TEST_USER, mission=SUITE_MISSION)
+    }
+
+
+def suite_cases(ml_model, dl_model, workdir):
+    """(이름, 함수, 반복 횟수, 반복 전 준비) 목록"""
+    from main import SafetyPredictionApp
+
+    roster = make_roster(SUITE_ROSTER)
+    missions = [list(MISSION_KEYWORDS)[i % len(MISSION_KEYWORDS)] for i in range(SUITE_ROSTER)]
+    keywords = dl_model.generate_risk_keywords(TEST_USER, SUITE_MISSION, seed=2025)
+    roster_keywords = dl_model.generate_risk_keywords_batch(roster, missions, start_time=SUITE_START)
+    # create_excel_report 는 GUI 상태(prediction_results)만 사용하므로 창 없이 호출
+    app = SimpleNamespace(prediction_results=suite_report_results(ml_model, dl_model, BENCH_HOURS[-1]))
+    system_info = {'프로그램 버전': 'v1.0', '예측 모드': 'ML + DL 통합', '예측 기간': f"{BENCH_HOURS[-1]}시간"}
+
+    cases = [
+        (f'predict_risk_score_{hours}h',
+         lambda hours=hours: vectorized_predict_risk_score(ml_model, TEST_USER, SUITE_MISSION, hours, SUITE_START),
+         5 if hours > 1000 else 20, None)
+        for hours in SUITE_HOURS
+    ]
+    # 증분 예측: 매 반복 한 시간씩 시계를 진행 (새 시간 1개 계산 + 정렬된 결과 생성)
+    forecast = IncrementalForecast(ml_model, TEST_USER, SUITE_MISSION, BENCH_HOURS[-1])
+    forecast.series(SUITE_START)
+    clock = itertools.count(1)
+    cases.append((f'incremental_forecast_refresh_{BENCH_HOURS[-1]}h',
+                  lambda: forecast.series(SUITE_START + timedelta(hours=next(clock))), 20, None))
+    cases += [
+        # 캐시 적중이 아닌 계산 시간을 재도록 매 반복 전 캐시 비움
+        ('recommend_safe_missions', lambda: ml_model.recommend_safe_missions(TEST_USER), 20, ml_model.cache.clear),
+        (f'recommend_safe_missions_batch_{SUITE_ROSTER}',
+         lambda: ml_model.recommend_safe_missions_batch(roster), 5, None),
+        ('generate_risk_keywords',
+         lambda: dl_model.generate_risk_keywords(TEST_USER, SUITE_MISSION, seed=2025), 20, None),
+        (f'generate_risk_keywords_batch_{SUITE_ROSTER}',
+         lambda: dl_model.generate_risk_keywords_batch(roster, missions, start_time=SUITE_START), 5, None),
+        ('recommend_safety_measures',
+         lambda: dl_model.recommend_safety_measures(TEST_USER, SUITE_MISSION, keywords), 20, None),
+        (f'recommend_safety_measures_batch_{SUITE_ROSTER}',
+         lambda: dl_model.recommend_safety_measures_batch(roster, missions, roster_keywords), 5, None),
+        (f'create_excel_report_{BENCH_HOURS[-1]}h',
+         lambda: SafetyPredictionApp.create_excel_report(app, Path(workdir) / 'report.xlsx', system_info), 3, None)
+    ]
+    return cases
+
+
+def run_suite(only=None):
+    """전체 스위트 실행 → {'meta': 환경 정보, 'cases': {이름: 측정값}}"""
+    import numpy
+
+    cases = {}
+    for name, statement in [
+        ('cold_start_import_main', 'import main'),
+        ('cold_start_import_models', 'import models.dummy_model'),
+        ('cold_start_load_models', 'from models.dummy_model import DummyMLModel, DummyDLModel; '
+                                   'DummyMLModel(); DummyDLModel()')
+    ]:
+        if not only or only in name:
+            cases[name] = measure_cold_start(statement)
+            print(f"   {name:<45} {cases[name]['best_ms']:>10.2f}ms")
+
+    ml_model = DummyMLModel()
+    dl_model = DummyDLModel()
+    with tempfile.TemporaryDirectory(prefix='safety_bench_') as workdir:
+        for name, func, repeat, setup in suite_cases(ml_model, dl_model, workdir):
+            if only and only not in name:
+                continue
+            func()  # 첫 호출(지연 임포트, 캐시 준비)은 측정 제외
+            cases[name] = measure(func, repeat, setup)
+            print(f"   {name:<45} {cases[name]['best_ms']:>10.2f}ms")
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'roster': SUITE_ROSTER
+        },
+        'cases': cases
+    }
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """기준 대비 비교표 출력 → 회귀 항목 이름 리스트"""
+    regressions = []
+    print(f"\n{'항목':<45} {'기준(ms)':>10} {'현재(ms)':>10} {'변화':>8}")
+    for name, result in current['cases'].items():
+        reference = baseline['cases'].get(name)
+        if reference is None:
+            print(f"{name:<45} {'-':>10} {result['best_ms']:>10.2f} {'신규':>8}")
+            continue
+        before, after = reference['best_ms'], result['best_ms']
+        change = after / before - 1 if before > 0 else 0.0
+        regressed = change > threshold and after - before > MIN_REGRESSION_MS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<45} {before:>10.2f} {after:>10.2f} {change:>+7.0%} {'❌' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="위험지수 예측 / 키워드 / 보고서 벤치마크")
+    parser.add_argument('--suite', action='store_true', help="회귀 검사 스위트 실행")
+    parser.add_argument('--output', help="스위트 결과를 기준 파일(JSON)로 저장")
+    parser.add_argument('--compare', help="기준 파일(JSON)과 비교, 회귀 시 종료 코드 1")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀 판정 비율 (기본 {DEFAULT_THRESHOLD}: 25%% 이상 느려지면 회귀)")
+    parser.add_argument('--only', help="이름에 이 문자열이 포함된 항목만 실행")
+    args = parser.parse_args(argv)
+
+    if not args.suite:
+        print("⏱️ 위험지수 예측 벤치마크 시작\n")
+        ml_model = DummyMLModel()
+        print()
+        bench_predict_risk_score(ml_model)
+        print()
+        bench_predict_batch(ml_model)
+        print()
+        bench_feature_matrix(ml_model)
+        print()
+        bench_keywords(DummyDLModel())
+        print("\n✅ 벤치마크 완료!")
+        return 0
+
+    print("⏱️ 벤치마크 스위트 시작 (최소 시간)\n")
+    results = run_suite(args.only)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 기준 파일 저장 완료: {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 성능 회귀 {len(regressions)}건 (기준 대비 {args.threshold:.0%} 초과): {', '.join(regressions)}")
+            return 1
+        print("\n✅ 성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인원별 예측 보고서 일괄 생성기 (Tk 없이 실행)
+
+인원 명단(CSV/XLSX)의 각 인원마다 `안전예측결과_<이름>_<시각>.xlsx` 보고서를 만듭니다.
+보고서 생성은 프로세스 풀에 나누어 실행하며, 모델은 작업자 프로세스마다 한 번만 준비합니다
+(fork 환경에서는 부모 프로세스에서 로드한 모델을 그대로 물려받음).
+결과는 출력 폴더 또는 하나의 zip 파일로 기록하고, 파일별 소요 시간과 전체 처리량을 출력합니다.
+
+보고서 내용은 GUI 엑셀 저장(main.py create_excel_report)과 같은 경로로 만듭니다.
+위험지수는 ML + DL 평균(--no-dl 이면 ML), 안전대책은 SAFETY_TIPS 템플릿, 시스템정보 시트에는 소요시간 항목을 씁니다.
+GUI 와 다른 점은 DL 위험지수 / 키워드 시드가 실행 시각이 아니라 예측 시작 정시 기준이라는 것뿐이며
+(같은 명단 / --start 면 같은 보고서), DL 처리 대기(2초) 시뮬레이션은 하지 않습니다.
+
+사용법:
+    python main.py --bulk-reports roster.csv --output-dir reports/
+    python main.py --bulk-reports roster.xlsx --zip reports.zip --hours 168 --workers 4
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from batch_runner import read_roster_chunks
+from models.profiling import stage_timer
+
+DEFAULT_MISSION = '복합적층장갑'
+
+# 파일 이름에 쓸 수 없는 문자 (Windows 기준)
+INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# 작업자 프로세스별 모델 (ml_model, dl_model) 과 로딩 소요 시간
+_models = None
+_load_timings = {}
+
+
+def _load_models(use_dl):
+    """프로세스당 한 번만 모델 로드"""
+    global _models
+    if _models is None:
+        from models.dummy_model import DummyMLModel, DummyDLModel
+
+        with stage_timer('gui.load_models', into=_load_timings):
+            _models = (DummyMLModel(), DummyDLModel() if use_dl else None)
+    return _models
+
+
+def _init_worker(use_dl):
+    """작업자 초기화 (fork 로 물려받은 모델이 있으면 재사용, spawn 이면 여기서 한 번 로드)"""
+    _load_models(use_dl)
+
+
+def report_filename(name, stamp, used):
+    """보고서 파일 이름 (이름 중복 시 _2, _3 ... 추가)"""
+    base = INVALID_FILENAME_CHARS.sub('_', str(name)).strip() or '이름없음'
+    filename = f"안전예측결과_{base}_{stamp}.xlsx"
+    count = used.get(filename, 0) + 1
+    used[filename] = count
+    if count > 1:
+        filename = f"안전예측결과_{base}_{stamp}_{count}.xlsx"
+    return filename
+
+
+def iter_people(roster_path, default_mission, chunk_size=500):
+    """명단 → 인원 정보 딕셔너리 (임무 열이 없으면 기본 임무)"""
+    for roster in read_roster_chunks(roster_path, chunk_size):
+        for record in roster.to_dict('records'):
+            mission = record.get('mission')
+            yield {
+                'name': str(record['name']),
+                'gender': record['gender'],
+                'age': int(record['age']),
+                'service_years': int(record['service_years']),
+                'mission': mission if isinstance(mission, str) and mission.strip() else default_mission
+            }
+
+
+def build_person_report(person, hours, start_time, created):
+    """인원 한 명의 예측 결과 (GUI 예측 / 엑셀 저장과 같은 구조와 값)"""
+    from models.keyword_index import keyword_seed
+    from models.prediction_cache import floor_hour
+    from models.templates import SAFETY_TIPS
+
+    ml_model, dl_model = _models
+    mission = person['mission']
+    timings = {}
+
+    with stage_timer('predict.ml', into=timings):
+        hourly = ml_model.predict_risk_series(person, mission, hours, start_time)
+        risk_score = float(hourly['risk_score'][0])
+    if dl_model is not None:
+        with stage_timer('predict.dl', into=timings):
+            # DL 위험지수 / 키워드는 실행 시각이 아니라 예측 시작 정시 기준 (같은 명단 / --start 면 같은 보고서)
+            start_hour = floor_hour(start_time)
+            dl_risk = dl_model.predict_risk_score(person, mission, start_hour)
+            keywords = dl_model.generate_risk_keywords(person, mission,
+                                                       seed=keyword_seed(person, mission, start_hour))
+            safety_tips = SAFETY_TIPS.render(name=person['name'], mission=mission)
+        risk_score = (risk_score + dl_risk) / 2
+    else:
+        keywords = ["일반적 위험요소"] * 5
+        safety_tips = "ML 기반 기본 안전수칙을 준수하세요."
+
+    return {
+        'risk_score': risk_score,
+        'keywords': keywords,
+        'safety_tips': safety_tips,
+        'hourly': hourly,
+        'timestamp': created,
+        'timings': timings,
+        'user_info': person
+    }
+
+
+def make_report(task):
+    """작업자: 보고서 한 건 생성 → (파일 이름, zip 용 바이트 또는 None, 소요 시간, 행 수)"""
+    from report_writer import build_report_sheets, timing_info, write_xlsx
+
+    person, filename, output_dir, hours, start_time, system_info = task
+    started = time.perf_counter()
+    results = build_person_report(person, hours, start_time, datetime.now())
+    # GUI 보고서와 같이 모델 로딩 / 예측 구간 / 보고서 기록 소요시간을 시스템정보 시트에 추가
+    system_info = timing_info(system_info, {**_load_timings, **results['timings']}, time.perf_counter())
+    sheets = build_report_sheets(results, system_info)
+
+    if output_dir is None:
+        buffer = io.BytesIO()
+        rows = write_xlsx(buffer, sheets)
+        payload = buffer.getvalue()
+    else:
+        rows = write_xlsx(Path(output_dir) / filename, sheets)
+        payload = None
+    return filename, payload, time.perf_counter() - started, rows
+
+
+def run_bulk_reports(roster_path, output_dir=None, zip_path=None, mission=DEFAULT_MISSION, hours=24,
+                     workers=None, start_time=None, use_dl=True, on_file=None):
+    """명단 전체 인원별 보고서 생성, 처리 통계 반환"""
+    if (output_dir is None) == (zip_path is None):
+        raise ValueError("출력 폴더 또는 zip 파일 중 하나를 지정해야 합니다")
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    start_time = start_time or datetime.now()
+    stamp = start_time.strftime('%Y%m%d_%H%M%S')
+
+    # 부모 프로세스에서 한 번 로드 → fork 작업자는 복사 없이 공유
+    _, dl_model = _load_models(use_dl)
+    system_info = {
+        '프로그램 버전': 'v1.0',
+        '예측 모드': 'ML + DL 통합' if use_dl else 'ML 모델만',
+        'GPU 사용': '미사용',
+        'DL 추론 백엔드': dl_model.backend_status() if dl_model is not None else '미로딩',
+        '예측 기간': f"{hours}시간",
+        '생성일시': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        archive = None
+    else:
+        archive = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED)  # xlsx 는 이미 압축된 형식
+
+    files = []
+    used_names = {}
+    started = time.perf_counter()
+
+    def collect(future):
+        filename, payload, seconds, rows = future.result()
+        if archive is not None:
+            archive.writestr(filename, payload)
+        files.append({'file': filename, 'seconds': seconds, 'rows': rows})
+        if on_file is not None:
+            on_file(filename, seconds, rows)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_dl,)) as pool:
+            # 진행 중 작업 수를 제한해 명단 크기와 관계없이 메모리 사용량 유지
+            in_flight = deque()
+            for person in iter_people(roster_path, mission):
+                filename = report_filename(person['name'], stamp, used_names)
+                task = (person, filename, output_dir, hours, start_time, system_info)
+                in_flight.append(pool.submit(make_report, task))
+                while len(in_flight) >= workers * 4:
+                    collect(in_flight.popleft())
+            while in_flight:
+                collect(in_flight.popleft())
+    finally:
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'files': len(files),
+        'workers': workers,
+        'hours': hours,
+        'seconds': elapsed,
+        'files_per_sec': len(files) / elapsed if elapsed > 0 else 0.0,
+        'mean_file_ms': sum(item['seconds'] for item in files) / len(files) * 1000 if files else 0.0,
+        'timings': files
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인원별 안전 예측 보고서 일괄 생성")
+    parser.add_argument('--bulk-reports', required=True, metavar='ROSTER', help="인원 명단 파일 (CSV/XLSX)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--output-dir', help="보고서를 기록할 폴더")
+    output.add_argument('--zip', help="보고서를 묶을 zip 파일")
+    parser.add_argument('--mission', default=DEFAULT_MISSION, help=f"명단에 임무 열이 없을 때 임무 (기본: {DEFAULT_MISSION})")
+    parser.add_argument('--hours', type=int, default=24, help="예측 시간 수 (기본: 24)")
+    parser.add_argument('--start', type=datetime.fromisoformat, help="예측 시작 시각 (ISO 형식, 기본: 현재)")
+    parser.add_argument('--workers', type=int, help="작업자 프로세스 수 (기본: CPU 수, 최대 4)")
+    parser.add_argument('--no-dl', action='store_true', help="DL 위험 키워드/안전대책 생략")
+    args = parser.parse_args(argv)
+
+    def on_file(filename, seconds, rows):
+        print(f"📄 {filename}: {seconds * 1000:.0f}ms ({rows:,}행)")
+
+    print(f"🚀 보고서 일괄 생성 시작: {args.bulk_reports} → {args.output_dir or args.zip}")
+    try:
+        stats = run_bulk_reports(
+            args.bulk_reports, args.output_dir, args.zip, args.mission, args.hours, args.workers,
+            args.start, not args.no_dl, on_file
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ 보고서 일괄 생성 실패: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ 보고서 일괄 생성 완료: {stats['files']:,}개 파일 (작업자 {stats['workers']}개)")
+    print(f"⏱️ {stats['seconds']:.2f}초, 처리량 {stats['files_per_sec']:.1f}개/초, "
+          f"파일당 평균 {stats['mean_file_ms']:.0f}ms")
+    print(json.dumps({key: value for key, value in stats.items() if key != 'timings'}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 HTTP/JSON 예측 서비스 (마이크로 배치)
+
+다른 정비창 시스템(근무 편성, 키오스크 등)에서 실시간으로 위험도를 조회할 수 있도록
+DummyMLModel / DummyDLModel 을 HTTP 로 제공합니다. 표준 라이브러리 asyncio 만 사용합니다.
+
+동시에 들어온 요청은 엔드포인트별 마이크로 배치(최대 배치 크기 / 최대 대기 시간)로 모아
+모델 스레드에서 한 번에 처리합니다. 위험지수는 벡터화된 predict_batch 한 번으로 계산합니다.
+
+엔드포인트:
+    POST /risk      {"gender", "age", "service_years", "mission", "hours"=24, "start"?}
+    POST /keywords  {"gender", "age", "service_years", "mission", "num_keywords"=10}
+    POST /measures  {"name", "gender", "age", "service_years", "mission", "keywords"?, "num_measures"=5}
+    GET  /health, GET /stats
+
+사용법:
+    python main.py --serve --port 8765
+    python inference_server.py --loadtest --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+ROUTES = ('/risk', '/keywords', '/measures', '/health', '/stats')
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY = 64 * 1024
+
+# 최대 예측 시간 수 (전체 기간 8-12월)
+MAX_HOURS = 3672
+
+# 요청당 최대 키워드 / 안전대책 수
+MAX_KEYWORDS = 30
+MAX_MEASURES = 20
+
+# /stats 지연 시간 집계에 사용할 최근 요청 수
+LATENCY_WINDOW = 10000
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 백분위수 (q: 0~100)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def parse_person(body):
+    """요청 본문 → 인원 정보 (필수 항목 / 숫자 검증)"""
+    missing = [field for field in ('gender', 'age', 'service_years', 'mission') if field not in body]
+    if missing:
+        raise ValueError(f"필수 항목이 없습니다: {', '.join(missing)}")
+    try:
+        return {
+            'name': str(body.get('name', '')),
+            'gender': str(body['gender']),
+            'age': int(body['age']),
+            'service_years': int(body['service_years']),
+            'mission': str(body['mission'])
+        }
+    except (TypeError, ValueError, OverflowError):  # OverflowError: 1e400 등 무한대 JSON 숫자
+        raise ValueError("나이와 근속연수는 숫자여야 합니다") from None
+
+
+def parse_count(payload, field, default, maximum):
+    """개수 항목 검증 (1~maximum 정수)"""
+    try:
+        value = int(payload.get(field, default))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{field} 는 정수여야 합니다") from None
+    if not 1 <= value <= maximum:
+        raise ValueError(f"{field} 는 1~{maximum} 사이여야 합니다")
+    return value
+
+
+def parse_start(value):
+    """ISO 시각 → 현지 시각 (시간대가 있으면 현지 시간대로 바꾼 뒤 시간대 정보 제거)"""
+    if not value:
+        return None
+    start = datetime.fromisoformat(value)
+    if start.tzinfo is not None:
+        start = start.astimezone().replace(tzinfo=None)
+    return start
+
+
+def run_groups(items, groups, process_group):
+    """그룹별 처리 → 항목별 결과 리스트 (그룹이 실패하면 항목별로 다시 처리해 실패한 항목만 예외)
+
+    groups: {그룹 키: [항목 인덱스]}, process_group(key, indexes) → 인덱스 순서의 결과 리스트
+    """
+    results = [None] * len(items)
+    for key, indexes in groups.items():
+        try:
+            group_results = process_group(key, indexes)
+        except Exception as e:
+            if len(indexes) == 1:
+                group_results = [e]
+            else:
+                group_results = []
+                for index in indexes:
+                    try:
+                        group_results.extend(process_group(key, [index]))
+                    except Exception as item_error:
+                        group_results.append(item_error)
+        for index, result in zip(indexes, group_results):
+            results[index] = result
+    return results
+
+
+class MicroBatcher:
+    """동시 요청을 모아 한 번에 처리하는 마이크로 배치 수집기
+
+    process_batch(items) 는 모델 스레드에서 실행되는 동기 함수이며,
+    입력과 같은 순서의 결과 리스트를 반환합니다 (항목별 예외 객체 허용, run_groups 참고).
+    배치 전체가 예외로 끝나도 항목을 하나씩 다시 처리해 잘못된 요청만 실패시킵니다.
+    """
+
+    def __init__(self, process_batch, executor, max_batch=64, max_wait=0.005):
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, item):
+        """항목 하나를 배치에 넣고 결과를 기다림"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """첫 항목 도착 후 max_wait 동안 또는 max_batch 개가 찰 때까지 수집"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            # 이미 대기 중인 항목은 기다리지 않고 바로 가져옴
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batches += 1
+            self.items += len(batch)
+            self.largest = max(self.largest, len(batch))
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception:
+                results = await loop.run_in_executor(self.executor, self._process_each, items)
+            for (_, future), result in zip(batch, results):
+                if future.done():  # 연결이 끊겨 취소된 요청
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _process_each(self, items):
+        """항목별 처리 (배치 처리 실패 시, 각 항목에 자기 결과 또는 예외)"""
+        results = []
+        for item in items:
+            try:
+                results.extend(self.process_batch([item]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch': self.items / self.batches if self.batches else 0.0,
+            'largest_batch': self.largest,
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000
+        }
+
+
+class InferenceService:
+    """모델 + 엔드포인트별 마이크로 배치 + HTTP 처리"""
+
+    def __init__(self, ml_model=None, dl_model=None, max_batch=64, max_wait=0.005):
+        if ml_model is None or dl_model is None:
+            from models.dummy_model import DummyMLModel, DummyDLModel
+
+            ml_model = ml_model or DummyMLModel()
+            dl_model = dl_model or DummyDLModel()
+        self.ml_model = ml_model
+        self.dl_model = dl_model
+
+        # 모델 호출은 단일 스레드에서 순서대로 (이벤트 루프는 그동안 다음 배치를 수집)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+        self.batchers = {
+            'risk': MicroBatcher(self._risk_batch, self.executor, max_batch, max_wait),
+            'keywords': MicroBatcher(self._keywords_batch, self.executor, max_batch, max_wait),
+            'measures': MicroBatcher(self._measures_batch, self.executor, max_batch, max_wait)
+        }
+        self.started = time.time()
+        self.requests = {}
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    # ------------------------------------------------------------------
+    # 배치 처리 (모델 스레드)
+
+    def _risk_batch(self, items):
+        """위험지수 배치: (예측 시간 수, 시작 시각)별로 predict_batch 한 번"""
+        import numpy as np
+
+        now = datetime.now()
+        groups = {}
+        for index, item in enumerate(items):
+            groups.setdefault((item['hours'], item['start'] or now), []).append(index)
+
+        def process_group(key, indexes):
+            hours, start = key
+            people = [items[index] for index in indexes]
+            missions = sorted({person['mission'] for person in people})
+            mission_index = {mission: column for column, mission in enumerate(missions)}
+            batch = self.ml_model.predict_batch(people, missions, hours, start, as_frame=False)
+
+            # 시각 / 시간대 열은 그룹 내 모든 요청이 공유
+            timestamps = np.datetime_as_string(batch['timestamp'], unit='s').tolist()
+            hours_of_day = batch['hour_of_day'].tolist()
+            return [
+                {
+                    'mission': person['mission'],
+                    'timestamp': timestamps,
+                    'hour_of_day': hours_of_day,
+                    'risk_score': batch['risk_score'][row, mission_index[person['mission']]].tolist(),
+                    'risk_level': batch['risk_level'][row, mission_index[person['mission']]].tolist()
+                }
+                for row, person in enumerate(people)
+            ]
+
+        return run_groups(items, groups, process_group)
+
+    def _keywords_batch(self, items):
+        """위험 키워드 배치: 키워드 수별로 키워드 인덱스 일괄 추출 한 번"""
+        groups = {}
+        for index, item in enumerate(items):
+            groups.setdefault(item['num_keywords'], []).append(index)
+
+        def process_group(num_keywords, indexes):
+            people = [items[index] for index in indexes]
+            keywords = self.dl_model.generate_risk_keywords_batch(
+                people, [person['mission'] for person in people], num_keywords)
+            return [{'keywords': row} for row in keywords]
+
+        return run_groups(items, groups, process_group)
+
+    def _measures_batch(self, items):
+        """안전대책 배치: 키워드가 없는 인원은 일괄 생성, 대책 수별로 일괄 추천 한 번"""
+        groups = {}
+        for index, item in enumerate(items):
+            groups.setdefault(item['num_measures'], []).append(index)
+
+        def process_group(num_measures, indexes):
+            people = [items[index] for index in indexes]
+            missions = [person['mission'] for person in people]
+            keywords = [person['keywords'] for person in people]
+            missing = [row for row, row_keywords in enumerate(keywords) if not row_keywords]
+            if missing:
+                generated = self.dl_model.generate_risk_keywords_batch(
+                    [people[row] for row in missing], [missions[row] for row in missing])
+                for row, row_keywords in zip(missing, generated):
+                    keywords[row] = row_keywords
+            return self.dl_model.recommend_safety_measures_batch(people, missions, keywords, num_measures)
+
+        return run_groups(items, groups, process_group)
+
+    # ------------------------------------------------------------------
+    # 엔드포인트
+
+    async def handle(self, method, path, body):
+        """요청 처리 → (상태 코드, 응답 객체)"""
+        path = path.split('?', 1)[0]
+        counted = path if path in ROUTES else 'other'  # 임의 경로로 집계 항목이 늘지 않도록
+        self.requests[counted] = self.requests.get(counted, 0) + 1
+
+        if path == '/health':
+            return 200, {'status': 'ok', 'uptime_sec': time.time() - self.started}
+        if path == '/stats':
+            return 200, self.stats()
+        endpoint = path.lstrip('/')
+        if endpoint not in self.batchers:
+            return 404, {'error': f"알 수 없는 경로입니다: {path}"}
+        if method != 'POST':
+            return 405, {'error': "POST 요청만 지원합니다"}
+
+        try:
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다")
+            item = parse_person(payload)
+            if endpoint == 'risk':
+                item['hours'] = parse_count(payload, 'hours', 24, MAX_HOURS)
+                item['start'] = parse_start(payload.get('start'))
+            elif endpoint == 'keywords':
+                item['num_keywords'] = parse_count(payload, 'num_keywords', 10, MAX_KEYWORDS)
+            else:
+                keywords = payload.get('keywords') or []
+                if not isinstance(keywords, list):
+                    raise ValueError("keywords 는 문자열 목록이어야 합니다")
+                item['keywords'] = [str(keyword) for keyword in keywords]
+                item['num_measures'] = parse_count(payload, 'num_measures', 5, MAX_MEASURES)
+        except (TypeError, ValueError) as e:  # json.JSONDecodeError 포함
+            return 400, {'error': str(e)}
+
+        try:
+            return 200, await self.batchers[endpoint].submit(item)
+        except (TypeError, ValueError, OverflowError) as e:  # 모델이 거부한 입력 (알 수 없는 성별, 기간 밖 시작 시각 등)
+            return 400, {'error': str(e)}
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            'uptime_sec': time.time() - self.started,
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {
+                'p50': percentile(latencies, 50) * 1000,
+                'p99': percentile(latencies, 99) * 1000,
+                'window': len(latencies)
+            },
+            'batching': {name: batcher.stats() for name, batcher in self.batchers.items()},
+            'cache': {'ml': self.ml_model.cache.stats(), 'dl': self.dl_model.cache.stats()}
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 (keep-alive)
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "잘못된 요청입니다"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': "Content-Length 가 올바르지 않습니다"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': "요청 본문이 너무 큽니다"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                keep_alive = (headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1')
+                started = time.perf_counter()
+                try:
+                    status, response = await self.handle(method.upper(), path, body)
+                except Exception as e:
+                    status, response = 500, {'error': str(e)}
+                if status >= 400:
+                    self.errors += 1
+                self.latencies.append(time.perf_counter() - started)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, response, keep_alive):
+        payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        for batcher in self.batchers.values():
+            batcher.start()
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    async def stop(self, server):
+        server.close()
+        await server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False)
+
+
+# ----------------------------------------------------------------------
+# 부하 생성기
+
+MISSIONS = ['복합적층장갑', '엔진정비', '전기계통', '유압시스템', '무기체계']
+
+
+def random_request(rng, endpoint):
+    """임의 인원 요청 본문"""
+    body = {
+        'name': f"정비사{rng.randrange(100000):05d}",
+        'gender': rng.choice(['남성', '여성']),
+        'age': rng.randint(20, 60),
+        'service_years': rng.randint(0, 35),
+        'mission': rng.choice(MISSIONS)
+    }
+    if endpoint == 'risk':
+        body['hours'] = 24
+    return body
+
+
+async def _client(host, port, endpoints, count, latencies, errors, seed):
+    """keep-alive 연결 하나로 count 건 순차 요청"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            endpoint = rng.choice(endpoints)
+            payload = json.dumps(random_request(rng, endpoint), ensure_ascii=False).encode('utf-8')
+            started = time.perf_counter()
+            writer.write(
+                f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n".encode('latin-1') + payload
+            )
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_loadtest(host=DEFAULT_HOST, port=DEFAULT_PORT, requests=2000, concurrency=32,
+                       endpoints=('risk',), max_batch=64, max_wait=0.005, serve=True):
+    """로컬 부하 테스트 (serve=True 면 같은 프로세스에서 서버 실행) → p50/p99 지연, 초당 요청 수"""
+    service = server = None
+    if serve:
+        service = InferenceService(max_batch=max_batch, max_wait=max_wait)
+        server = await service.start(host, port)
+
+    latencies, errors = [], []
+    per_client, extra = divmod(requests, concurrency)
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*[
+            _client(host, port, list(endpoints), per_client + (1 if i < extra else 0), latencies, errors, i)
+            for i in range(concurrency)
+        ])
+    finally:
+        elapsed = time.perf_counter() - started
+        batching = service.stats()['batching'] if service is not None else None
+        if server is not None:
+            await service.stop(server)
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'errors': len(errors),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'batching': batching
+    }
+
+
+async def _serve_forever(host, port, max_batch, max_wait):
+    service = InferenceService(max_batch=max_batch, max_wait=max_wait)
+    server = await service.start(host, port)
+    print(f"✅ 예측 서비스 시작: http://{host}:{port} (최대 배치 {max_batch}, 최대 대기 {max_wait * 1000:.1f}ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop(server)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="안전 예측 로컬 HTTP 서비스")
+    parser.add_argument('--serve', action='store_true', help="서비스 실행 (기본 동작)")
+    parser.add_argument('--loadtest', action='store_true', help="로컬 부하 테스트 실행 후 지연/처리량 출력")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"주소 (기본: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument('--max-batch', type=int, default=64, help="마이크로 배치 최대 크기 (기본: 64)")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="마이크로 배치 최대 대기 시간 (기본: 5ms)")
+    parser.add_argument('--requests', type=int, default=2000, help="부하 테스트 요청 수 (기본: 2000)")
+    parser.add_argument('--concurrency', type=int, default=32, help="부하 테스트 동시 연결 수 (기본: 32)")
+    parser.add_argument('--endpoints', nargs='+', default=['risk'], choices=['risk', 'keywords', 'measures'],
+                        help="부하 테스트 엔드포인트 (기본: risk)")
+    parser.add_argument('--external', action='store_true', help="부하 테스트 시 이미 실행 중인 서비스 사용")
+    args = parser.parse_args(argv)
+    max_wait = args.max_wait_ms / 1000
+
+    if args.loadtest:
+        stats = asyncio.run(run_loadtest(
+            args.host, args.port, args.requests, args.concurrency, args.endpoints,
+            args.max_batch, max_wait, serve=not args.external
+        ))
+        print(f"✅ 부하 테스트 완료: {stats['requests']:,}건 (동시 {stats['concurrency']}), 오류 {stats['errors']}건")
+        print(f"⏱️ p50 {stats['p50_ms']:.1f}ms, p99 {stats['p99_ms']:.1f}ms, 처리량 {stats['rps']:,.0f}건/초")
+        print(json.dumps(stats, ensure_ascii=False))
+        return 0 if stats['errors'] == 0 else 1
+
+    try:
+        asyncio.run(_serve_forever(args.host, args.port, args.max_batch, max_wait))
+    except KeyboardInterrupt:
+        print("🛑 예측 서비스 종료")
+    except OSError as e:
+        print(f"❌ 예측 서비스 시작 실패: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,8 +10,6 @@ ML/DL 모델 기반 실시간 안전 예측 및 위험도 분석
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import os
 import sys
@@ -19,10 +17,38 @@ import json
 from pathlib import Path
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from prediction_executor import PredictionExecutor, PredictionCancelled
+from models.profiling import stage_timer, format_timings
+from report_writer import STAGE_LABELS
+
+# 무거운 라이브러리(pandas, numpy, torch, sklearn)는 시작 속도를 위해 사용 시점에 임포트
+# 모델 파일별 로더: 표시 이름 → (속성 이름, models.dummy_model 클래스 이름)
+MODEL_ARTIFACTS = {
+    'ML 모델': ('ml_model', 'DummyMLModel'),
+    'DL 모델': ('dl_model', 'DummyDLModel')
+}
+
+# 예측 기간 → 예측 시간 수
+PREDICTION_PERIODS = {
+    "1시간": 1,
+    "1일": 24,
+    "1주일": 168,
+    "전체 기간(8-12월)": 3672
+}
 
 class SafetyPredictionApp:
     def __init__(self, root):
         self.root = root
+        self.ml_model = None
+        self.dl_model = None
+        self.models_loading = False
+        self.load_timings = {}  # 모델 로딩 소요 시간 (ms, 보고서 시스템정보 시트용)
+        self.dl_backend_mode = 'cpu-int8'  # DL CPU 추론 백엔드 (설정 창, models/dl_backend.py)
+        self.dl_backend_threads = None    # None = 물리 코어 수
+        self.prediction_executor = PredictionExecutor(max_workers=1)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.setup_ui()
         self.load_models()
         
@@ -103,6 +129,7 @@ class SafetyPredictionApp:
                                  values=["ML 모델만", "DL 모델만", "ML + DL 통합"],
                                  state="readonly", width=17)
         model_combo.grid(row=5, column=1, sticky=tk.W, pady=(10, 2))
+        model_combo.bind("<<ComboboxSelected>>", self.on_model_mode_changed)
         
         # GPU 사용 옵션
         self.gpu_var = tk.BooleanVar(value=False)
@@ -189,24 +216,93 @@ class SafetyPredictionApp:
                              command=self.show_help)
         help_btn.pack(side=tk.LEFT)
         
+    def required_artifacts(self):
+        """현재 예측 모드에 필요한데 아직 로드되지 않은 모델 목록"""
+        # ML 모델은 가볍기 때문에 항상 로드, DL 모델(torch)은 DL 모드 선택 시에만 로드
+        names = ['ML 모델']
+        if "DL" in self.model_var.get():
+            names.append('DL 모델')
+        return [name for name in names if getattr(self, MODEL_ARTIFACTS[name][0]) is None]
+    
     def load_models(self):
-        """모델 로딩 (더미 구현)"""
+        """모델 로딩 시작 (백그라운드)"""
+        missing = self.required_artifacts()
+        if not missing:
+            self.models_loaded = True
+            self.predict_btn.config(state="normal")
+            return
+        
+        self.models_loaded = False
+        self.models_loading = True
+        self.predict_btn.config(state="disabled")
+        self.status_var.set(f"모델 로딩 중... ({', '.join(missing)})")
+        
+        loader_thread = threading.Thread(target=self._load_models_worker, args=(missing,), daemon=True)
+        loader_thread.start()
+    
+    def on_model_mode_changed(self, event=None):
+        """예측 모드 변경 시 필요한 모델 추가 로딩"""
+        if not self.models_loading:
+            self.load_models()
+    
+    def _load_models_worker(self, names):
+        """ML/DL 모델 병렬 로딩 (백그라운드 스레드)"""
         try:
-            self.status_var.set("모델 로딩 중...")
-            self.root.update()
+            from models import dummy_model
             
             # 실제 구현에서는 여기서 ML/DL 모델을 로드
             # self.ml_model = joblib.load('models/enhanced_safety_model.pkl')
             # self.dl_model = torch.load('models/neural_safety_model.pth')
+            loaded = {}
+            with stage_timer('gui.load_models') as load_stage:
+                with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                    futures = {
+                        executor.submit(getattr(dummy_model, MODEL_ARTIFACTS[name][1])): name
+                        for name in names
+                    }
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        loaded[name] = future.result()
+                        self.root.after(0, self._on_artifact_loaded, name, len(loaded), len(names))
             
-            time.sleep(1)  # 로딩 시뮬레이션
-            self.models_loaded = True
-            self.status_var.set("모델 로딩 완료 - 시스템 준비됨")
+            self.root.after(0, self._on_models_ready, loaded, load_stage.elapsed_ms)
             
         except Exception as e:
-            messagebox.showerror("오류", f"모델 로딩 실패: {str(e)}")
-            self.models_loaded = False
-            self.status_var.set("모델 로딩 실패")
+            self.root.after(0, self._on_models_failed, e)
+    
+    def _on_artifact_loaded(self, name, done, total):
+        """모델 파일별 로딩 진행 상황 표시"""
+        self.status_var.set(f"모델 로딩 중... ({done}/{total}) {name} 완료")
+    
+    def _on_models_ready(self, loaded, elapsed_ms=0.0):
+        """모델 로딩 완료 처리"""
+        self.load_timings['gui.load_models'] = self.load_timings.get('gui.load_models', 0.0) + elapsed_ms
+        for name, model in loaded.items():
+            setattr(self, MODEL_ARTIFACTS[name][0], model)
+        self.models_loading = False
+        
+        # 로딩 중 설정 창에서 바꾼 DL 추론 백엔드 적용
+        dl_model = loaded.get('DL 모델')
+        if dl_model is not None and (dl_model.backend_mode, dl_model.backend_threads) != (
+                self.dl_backend_mode, self.dl_backend_threads):
+            threading.Thread(target=self._configure_backend_worker,
+                             args=(self.dl_backend_mode, self.dl_backend_threads), daemon=True).start()
+        
+        # 로딩 중 예측 모드가 바뀐 경우 나머지 모델 이어서 로딩
+        if self.required_artifacts():
+            self.load_models()
+            return
+        
+        self.models_loaded = True
+        self.predict_btn.config(state="normal")
+        self.status_var.set(f"모델 로딩 완료 - 시스템 준비됨 ({format_timings(self.load_timings, STAGE_LABELS)})")
+    
+    def _on_models_failed(self, error):
+        """모델 로딩 실패 처리"""
+        self.models_loaded = False
+        self.models_loading = False
+        self.status_var.set("모델 로딩 실패")
+        messagebox.showerror("오류", f"모델 로딩 실패: {str(error)}")
     
     def run_prediction(self):
         """예측 실행"""
@@ -218,18 +314,46 @@ class SafetyPredictionApp:
             # 입력값 검증
             if not self.validate_inputs():
                 return
-                
-            # 예측 실행 (별도 스레드)
-            self.predict_btn.config(state="disabled", text="예측 중...")
-            self.status_var.set("예측 중... 잠시만 기다려주세요.")
             
-            # 백그라운드에서 예측 실행
-            prediction_thread = threading.Thread(target=self.perform_prediction)
-            prediction_thread.start()
+            # 입력값 스냅샷 (작업자 스레드에서 Tk 변수를 읽지 않도록)
+            request = dict(
+                self.current_user_info(),
+                mission=self.mission_var.get(),
+                mode=self.model_var.get(),
+                period=self.period_var.get()
+            )
+            
+            # 예측 실행기에 제출 (이전 요청은 취소, 동일 요청은 병합)
+            request_id, future = self.prediction_executor.submit(
+                tuple(sorted(request.items())),
+                lambda token: self.perform_prediction(request, token)
+            )
+            self.predict_btn.config(text="예측 중... (다시 실행 가능)")
+            self.status_var.set(f"예측 중... 잠시만 기다려주세요. (요청 #{request_id})")
+            future.add_done_callback(
+                lambda f: self.root.after(0, self._on_prediction_done, request_id, request, f)
+            )
             
         except Exception as e:
             messagebox.showerror("오류", f"예측 실행 중 오류: {str(e)}")
-            self.predict_btn.config(state="normal", text="🔮 안전 예측 실행")
+            self.reset_prediction_button()
+    
+    def _on_prediction_done(self, request_id, request, future):
+        """예측 완료 처리 (가장 최근 요청의 결과만 적용)"""
+        if not self.prediction_executor.is_latest(request_id) or future.cancelled():
+            return
+        
+        error = future.exception()
+        if isinstance(error, PredictionCancelled):
+            return
+        if error is not None:
+            messagebox.showerror("예측 오류", f"예측 중 오류: {str(error)}")
+            self.reset_prediction_button()
+            self.status_var.set("예측 실패")
+            return
+        
+        final_risk, keywords, safety_tips, hourly, timings = future.result()
+        self.update_prediction_results(final_risk, keywords, safety_tips, request, hourly, timings)
     
     def validate_inputs(self):
         """입력값 검증"""
@@ -251,133 +375,120 @@ class SafetyPredictionApp:
             messagebox.showwarning("입력 오류", "나이와 근속연수는 숫자여야 합니다.")
             return False
     
-    def perform_prediction(self):
-        """실제 예측 수행 (더미 구현)"""
-        try:
-            # ML 예측 시뮬레이션
-            if "ML" in self.model_var.get():
-                time.sleep(1)  # ML 모델 처리 시간
-                ml_risk = np.random.uniform(5.0, 8.5)
-                
-            # DL 예측 시뮬레이션  
-            if "DL" in self.model_var.get():
-                time.sleep(2)  # DL 모델 처리 시간
-                dl_risk = np.random.uniform(6.0, 9.0)
-                keywords = self.generate_dummy_keywords()
-                safety_tips = self.generate_dummy_safety_tips()
-            
-            # 통합 예측
-            if "통합" in self.model_var.get():
-                final_risk = (ml_risk + dl_risk) / 2
-            elif "ML" in self.model_var.get():
-                final_risk = ml_risk
-                keywords = ["일반적 위험요소"] * 5
-                safety_tips = "ML 기반 기본 안전수칙을 준수하세요."
-            else:
-                final_risk = dl_risk
-            
-            # UI 업데이트 (메인 스레드에서)
-            self.root.after(0, self.update_prediction_results, final_risk, keywords, safety_tips)
-            
-        except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("예측 오류", f"예측 중 오류: {str(e)}"))
-            self.root.after(0, self.reset_prediction_button)
+    def current_user_info(self):
+        """입력된 사용자 정보"""
+        return {
+            'name': self.name_var.get(),
+            'gender': self.gender_var.get(),
+            'age': self.age_var.get(),
+            'service_years': self.service_var.get()
+        }
     
-    def generate_dummy_keywords(self):
-        """더미 위험 키워드 생성"""
-        base_keywords = [
-            "고온 작업환경", "중량물 취급", "전기 감전 위험", "화학물질 노출", 
-            "소음 환경", "협착 위험", "낙상 위험", "화재 위험",
-            "기계 작동 시 안전", "개인보호구 착용"
-        ]
-        
-        mission = self.mission_var.get()
-        if mission == "복합적층장갑":
-            keywords = ["적층 작업 위험", "접착제 화학 노출", "고온 경화 과정"] + base_keywords[:7]
-        elif mission == "엔진정비":
-            keywords = ["엔진 고온부", "연료 누출", "회전체 위험"] + base_keywords[:7]
+    def perform_prediction(self, request, cancel_token):
+        """실제 예측 수행 (예측 실행기 작업자 스레드)"""
+        from models.prediction_cache import floor_hour
+        
+        mode = request['mode']
+        mission = request['mission']
+        
+        timings = {}  # 구간별 소요 시간 (ms)
+        
+        # ML 예측 (동일 인원/임무/기간은 모델 캐시 재사용, 시간대별 배열은 보고서에 그대로 기록)
+        hourly = None
+        if "ML" in mode:
+            with stage_timer('predict.ml', into=timings):
+                hourly = self.ml_model.predict_risk_series(
+                    request, mission, PREDICTION_PERIODS[request['period']]
+                )
+                ml_risk = float(hourly['risk_score'][0])
+        
+        cancel_token.check()
+        
+        # DL 예측 시뮬레이션
+        if "DL" in mode:
+            with stage_timer('predict.dl', into=timings):
+                cancel_token.sleep(2)  # DL 모델 처리 시간 (새 요청이 들어오면 중단)
+                dl_risk = self.dl_model.predict_risk_score(request, mission, floor_hour(datetime.now()))
+                keywords = self.dl_model.generate_risk_keywords(request, mission)
+                safety_tips = self.generate_dummy_safety_tips(request['name'], mission)
+        
+        # 통합 예측
+        if "통합" in mode:
+            final_risk = (ml_risk + dl_risk) / 2
+        elif "ML" in mode:
+            final_risk = ml_risk
+            keywords = ["일반적 위험요소"] * 5
+            safety_tips = "ML 기반 기본 안전수칙을 준수하세요."
         else:
-            keywords = base_keywords
-            
-        return keywords[:10]
+            final_risk = dl_risk
+        
+        return final_risk, keywords, safety_tips, hourly, timings
     
-    def generate_dummy_safety_tips(self):
+    def generate_dummy_safety_tips(self, name, mission):
         """더미 안전대책 생성"""
-        mission = self.mission_var.get()
-        name = self.name_var.get()
+        from models.templates import SAFETY_TIPS
         
-        tips = f"""🛡️ {name}님을 위한 맞춤 안전대책:
-
-1. 개인보호구 완전 착용
-   - 안전모, 보호안경, 방진마스크 필수
-   - {mission} 작업 전용 장갑 착용
-
-2. 작업 환경 점검
-   - 작업 전 안전점검 체크리스트 확인
-   - 비상 대피 경로 숙지
-
-3. 동료와의 협업 강화
-   - 2인 1조 작업 시스템 운영
-   - 정기적인 안전 신호 교환
-
-4. 정기 휴식 및 컨디션 관리
-   - 1시간마다 10분 휴식
-   - 피로 누적 시 작업 중단
-
-5. 응급상황 대응 준비
-   - 응급처치 키트 위치 확인
-   - 비상연락망 숙지"""
-        
-        return tips
+        return SAFETY_TIPS.render(name=name, mission=mission)
     
-    def update_prediction_results(self, risk_score, keywords, safety_tips):
+    def update_prediction_results(self, risk_score, keywords, safety_tips, request, hourly=None, timings=None):
         """예측 결과 UI 업데이트"""
-        # 위험지수 업데이트
-        self.risk_label.config(text=f"{risk_score:.1f} / 10.0")
-        
-        # 위험도에 따른 색상 변경
-        if risk_score >= 8.0:
-            self.risk_label.config(foreground="red")
-        elif risk_score >= 6.0:
-            self.risk_label.config(foreground="orange") 
-        else:
-            self.risk_label.config(foreground="green")
-        
-        # 키워드 리스트 업데이트
-        self.keyword_listbox.delete(0, tk.END)
-        for i, keyword in enumerate(keywords, 1):
-            self.keyword_listbox.insert(tk.END, f"{i:2d}. {keyword}")
-        
-        # 안전대책 업데이트
-        self.safety_text.delete(1.0, tk.END)
-        self.safety_text.insert(1.0, safety_tips)
-        
+        timings = {} if timings is None else timings
+        with stage_timer('predict.render', into=timings):
+            # 위험지수 업데이트
+            self.risk_label.config(text=f"{risk_score:.1f} / 10.0")
+            
+            # 위험도에 따른 색상 변경
+            if risk_score >= 8.0:
+                self.risk_label.config(foreground="red")
+            elif risk_score >= 6.0:
+                self.risk_label.config(foreground="orange") 
+            else:
+                self.risk_label.config(foreground="green")
+            
+            # 키워드 리스트 업데이트 (미리 만든 줄 목록을 insert 한 번으로)
+            from models.templates import KEYWORD_LINE
+            
+            self.keyword_listbox.delete(0, tk.END)
+            lines = KEYWORD_LINE.render_many(rank=range(1, len(keywords) + 1), keyword=keywords)
+            self.keyword_listbox.insert(tk.END, *lines)
+            
+            # 안전대책 업데이트
+            self.safety_text.delete(1.0, tk.END)
+            self.safety_text.insert(1.0, safety_tips)
+            
         # 예측 결과 저장 (엑셀 저장용)
         self.prediction_results = {
             'risk_score': risk_score,
             'keywords': keywords,
             'safety_tips': safety_tips,
+            'hourly': hourly,  # ML 시간대별 예측 배열 (DL 단독 모드는 None)
             'timestamp': datetime.now(),
+            'timings': dict(timings),  # 구간별 소요 시간 (ms, 보고서 시스템정보 시트용)
             'user_info': {
-                'name': self.name_var.get(),
-                'gender': self.gender_var.get(),
-                'age': self.age_var.get(),
-                'service_years': self.service_var.get(),
-                'mission': self.mission_var.get()
+                'name': request['name'],
+                'gender': request['gender'],
+                'age': request['age'],
+                'service_years': request['service_years'],
+                'mission': request['mission']
             }
         }
         
         # 버튼 상태 복구
         self.reset_prediction_button()
         self.save_btn.config(state="normal")
-        self.status_var.set(f"예측 완료 - 위험지수: {risk_score:.1f}")
+        self.status_var.set(f"예측 완료 - 위험지수: {risk_score:.1f} ({format_timings(timings, STAGE_LABELS)})")
+    
+    def on_close(self):
+        """창 닫기 (진행 중 예측 취소)"""
+        self.prediction_executor.shutdown()
+        self.root.destroy()
     
     def reset_prediction_button(self):
         """예측 버튼 상태 복구"""
         self.predict_btn.config(state="normal", text="🔮 안전 예측 실행")
     
     def save_to_excel(self):
-        """엑셀 파일로 결과 저장"""
+        """보고서 파일로 결과 저장 (엑셀 / CSV / Parquet)"""
         try:
             if not hasattr(self, 'prediction_results'):
                 messagebox.showwarning("경고", "저장할 예측 결과가 없습니다.")
@@ -386,65 +497,85 @@ class SafetyPredictionApp:
             # 파일 저장 대화상자
             filename = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialname=f"안전예측결과_{self.name_var.get()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+                filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"),
+                           ("Parquet files", "*.parquet"), ("All files", "*.*")],
+                initialfile=f"안전예측결과_{self.name_var.get()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
             )
             
             if filename:
-                self.create_excel_report(filename)
-                messagebox.showinfo("저장 완료", f"결과가 저장되었습니다:\n{filename}")
+                # 시스템 정보 / 예측 결과는 Tk 스레드에서 고정하고, 파일 기록은 작업자 스레드에서 수행
+                # (저장 중 새 예측이 prediction_results 를 바꿔도 저장 시점의 결과를 기록)
+                system_info = self.current_system_info()
+                results = self.prediction_results
+                self.save_btn.config(state="disabled")
+                self.status_var.set("보고서 저장 중...")
+                threading.Thread(
+                    target=self._export_worker, args=(filename, system_info, results), daemon=True
+                ).start()
                 
         except Exception as e:
             messagebox.showerror("저장 오류", f"파일 저장 중 오류: {str(e)}")
     
-    def create_excel_report(self, filename):
-        """엑셀 보고서 생성"""
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            # 1. 예측 결과 시트
-            results_data = {
-                '항목': ['사용자명', '성별', '나이', '근속연수', '임무', '위험지수', '예측시간'],
-                '값': [
-                    self.prediction_results['user_info']['name'],
-                    self.prediction_results['user_info']['gender'], 
-                    self.prediction_results['user_info']['age'],
-                    self.prediction_results['user_info']['service_years'],
-                    self.prediction_results['user_info']['mission'],
-                    f"{self.prediction_results['risk_score']:.1f}",
-                    self.prediction_results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                ]
-            }
-            pd.DataFrame(results_data).to_excel(writer, sheet_name='예측결과', index=False)
-            
-            # 2. 위험 키워드 시트
-            keywords_data = {
-                '순위': list(range(1, len(self.prediction_results['keywords']) + 1)),
-                '위험 키워드': self.prediction_results['keywords']
-            }
-            pd.DataFrame(keywords_data).to_excel(writer, sheet_name='위험키워드', index=False)
-            
-            # 3. 안전대책 시트
-            safety_lines = self.prediction_results['safety_tips'].split('\n')
-            safety_data = {'안전대책': [line.strip() for line in safety_lines if line.strip()]}
-            pd.DataFrame(safety_data).to_excel(writer, sheet_name='안전대책', index=False)
-            
-            # 4. 시스템 정보 시트
-            system_data = {
-                '항목': ['프로그램 버전', '예측 모드', 'GPU 사용', '예측 기간', '생성일시'],
-                '값': [
-                    'v1.0',
-                    self.model_var.get(),
-                    '사용' if self.gpu_var.get() else '미사용',
-                    self.period_var.get(),
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ]
-            }
-            pd.DataFrame(system_data).to_excel(writer, sheet_name='시스템정보', index=False)
+    def current_system_info(self):
+        """보고서 시스템 정보 시트 내용"""
+        return {
+            '프로그램 버전': 'v1.0',
+            '예측 모드': self.model_var.get(),
+            'GPU 사용': '사용' if self.gpu_var.get() else '미사용',
+            'DL 추론 백엔드': self.dl_model.backend_status() if self.dl_model is not None else '미로딩',
+            '예측 기간': self.period_var.get(),
+            '생성일시': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def _export_worker(self, filename, system_info, results=None):
+        """보고서 기록 (백그라운드 스레드, 진행 상황은 Tk 스레드로 전달)"""
+        def progress(sheet_name, rows):
+            self.root.after(0, self.status_var.set, f"보고서 저장 중... {sheet_name} ({rows:,}행)")
+        
+        timings = {}
+        try:
+            with stage_timer('report.write', into=timings):
+                rows, paths = self.create_excel_report(filename, system_info, progress, results)
+        except Exception as e:
+            self.root.after(0, self._on_export_failed, e)
+        else:
+            self.root.after(0, self._on_export_done, paths, rows, timings)
+    
+    def _on_export_done(self, paths, rows, timings=None):
+        """보고서 저장 완료 (CSV / Parquet 은 시트별 파일 목록 표시)"""
+        self.save_btn.config(state="normal")
+        self.status_var.set(f"보고서 저장 완료 ({rows:,}행, {format_timings(timings or {}, STAGE_LABELS)})")
+        messagebox.showinfo("저장 완료", "결과가 저장되었습니다:\n" + "\n".join(str(path) for path in paths))
+    
+    def _on_export_failed(self, error):
+        """보고서 저장 실패"""
+        self.save_btn.config(state="normal")
+        self.status_var.set("보고서 저장 실패")
+        messagebox.showerror("저장 오류", f"파일 저장 중 오류: {str(error)}")
+    
+    def create_excel_report(self, filename, system_info=None, progress=None, results=None):
+        """보고서 생성 (시트 행을 생성기로 만들어 바로 기록) → (기록한 행 수, 기록한 파일 목록)
+        
+        results: 기록할 예측 결과 (생략 시 현재 prediction_results)
+        """
+        if results is None:
+            results = self.prediction_results
+        from report_writer import build_report_sheets, timing_info, write_report
+        
+        if system_info is None:
+            system_info = self.current_system_info()
+        started = time.perf_counter()
+        # 구간별 소요 시간을 시스템정보 시트에 추가
+        timings = {**getattr(self, 'load_timings', {}), **results.get('timings', {})}
+        system_info = timing_info(system_info, timings, started)
+        sheets = build_report_sheets(results, system_info)
+        return write_report(filename, sheets, progress)
     
     def open_settings(self):
         """설정 창 열기"""
         settings_window = tk.Toplevel(self.root)
         settings_window.title("⚙️ 시스템 설정")
-        settings_window.geometry("400x300")
+        settings_window.geometry("420x440")
         settings_window.resizable(False, False)
         
         # 설정 내용
@@ -467,8 +598,55 @@ class SafetyPredictionApp:
         ttk.Label(gpu_frame, text="CUDA 디바이스:").grid(row=0, column=0, sticky=tk.W)
         ttk.Combobox(gpu_frame, values=["cuda:0", "cpu"], state="readonly", width=27).grid(row=0, column=1, padx=5)
         
-        # 닫기 버튼
-        ttk.Button(settings_window, text="확인", command=settings_window.destroy).pack(pady=20)
+        # DL 추론 백엔드 (GPU 없는 워크스테이션용 CPU 최적화)
+        from models.dl_backend import BACKEND_MODES
+        
+        backend_frame = ttk.LabelFrame(settings_window, text="DL 추론 백엔드 (CPU)", padding="10")
+        backend_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        mode_labels = {label: mode for mode, label in BACKEND_MODES.items()}
+        mode_var = tk.StringVar(value=BACKEND_MODES[self.dl_backend_mode])
+        threads_var = tk.IntVar(value=self.dl_backend_threads or 0)
+        
+        ttk.Label(backend_frame, text="추론 방식:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(backend_frame, textvariable=mode_var, values=list(mode_labels),
+                     state="readonly", width=27).grid(row=0, column=1, padx=5)
+        ttk.Label(backend_frame, text="스레드 수 (0=자동):").grid(row=1, column=0, sticky=tk.W)
+        ttk.Spinbox(backend_frame, textvariable=threads_var, from_=0, to=os.cpu_count() or 1,
+                    width=25).grid(row=1, column=1, padx=5)
+        if self.dl_model is not None:
+            ttk.Label(backend_frame, text=f"현재: {self.dl_model.backend_status()}",
+                      foreground="gray").grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        def apply_settings():
+            try:
+                threads = max(0, int(threads_var.get()))
+            except (tk.TclError, ValueError):
+                threads = 0
+            self.apply_backend_settings(mode_labels[mode_var.get()], threads or None)
+            settings_window.destroy()
+        
+        # 확인 버튼
+        ttk.Button(settings_window, text="확인", command=apply_settings).pack(pady=20)
+    
+    def apply_backend_settings(self, mode, threads):
+        """DL 추론 백엔드 변경 (모델 변환은 백그라운드 스레드에서)"""
+        if (mode, threads) == (self.dl_backend_mode, self.dl_backend_threads):
+            return
+        self.dl_backend_mode, self.dl_backend_threads = mode, threads
+        if self.dl_model is None:
+            return  # 모델 로딩 후 _on_models_ready 에서 적용
+        self.status_var.set("DL 추론 백엔드 변경 중...")
+        threading.Thread(target=self._configure_backend_worker, args=(mode, threads), daemon=True).start()
+    
+    def _configure_backend_worker(self, mode, threads):
+        """백엔드 재구성 (백그라운드 스레드)"""
+        try:
+            self.dl_model.configure_backend(mode, threads)
+            message = f"✅ DL 추론 백엔드: {self.dl_model.backend_status()}"
+        except Exception as e:
+            message = f"❌ DL 추론 백엔드 변경 실패: {str(e)}"
+        self.root.after(0, self.status_var.set, message)
     
     def show_help(self):
         """도움말 표시"""
@@ -496,11 +674,44 @@ class SafetyPredictionApp:
         
         messagebox.showinfo("도움말", help_text)
 
+def report_startup_probe(root):
+    """시작 시간 측정 모드: 첫 창 표시까지 걸린 시간을 출력하고 종료"""
+    started = float(os.environ['SAFETY_STARTUP_PROBE'])
+    root.update_idletasks()
+    heavy = [name for name in ('pandas', 'numpy', 'torch', 'sklearn') if name in sys.modules]
+    print(json.dumps({
+        'first_window_ms': (time.time() - started) * 1000,
+        'heavy_modules_at_first_window': heavy
+    }), flush=True)
+    root.destroy()
+
 def main():
     """메인 함수"""
+    # 실행 파일(PyInstaller)에서 보고서 일괄 생성 작업자 프로세스 시작 지원
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    
+    # 헤드리스 일괄 예측 모드 (Tk 창 없이 실행)
+    if '--batch' in sys.argv[1:]:
+        from batch_runner import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+    
+    # 인원별 보고서 일괄 생성 모드 (Tk 창 없이 실행)
+    if '--bulk-reports' in sys.argv[1:]:
+        from bulk_reports import main as bulk_main
+        sys.exit(bulk_main(sys.argv[1:]))
+    
+    # 로컬 HTTP 예측 서비스 모드 (Tk 창 없이 실행)
+    if '--serve' in sys.argv[1:]:
+        from inference_server import main as serve_main
+        sys.exit(serve_main(sys.argv[1:]))
+    
     try:
         root = tk.Tk()
         app = SafetyPredictionApp(root)
+        if os.environ.get('SAFETY_STARTUP_PROBE'):
+            root.after_idle(report_startup_probe, root)
         root.mainloop()
     except Exception as e:
         print(f"프로그램 실행 오류: {e}")
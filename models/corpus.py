@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 말뭉치 분할 저장소 (스트리밍 변환 / 제한된 메모리 조회)
+
+integrated_safety_corpus.json (최상위 JSON 배열, 또는 배열을 값으로 가진 객체)을
+json.load 로 한 번에 올리지 않고 청크 단위로 읽으며 레코드를 하나씩 디코딩해
+JSON Lines 조각 파일로 나누어 기록합니다. 변환은 한 번만 하면 되고,
+이후에는 레코드별 위치 색인을 메모리 매핑으로 열어 순차 조회 / 번호 조회 / 임무별 조회를 합니다.
+
+폴더 구조 (safety_corpus/):
+    meta.json            레코드 수, 조각 파일 목록, 임무 이름 목록, 원본 정보
+    shard_00000.jsonl    레코드 한 줄에 하나 (UTF-8)
+    records.bin          레코드별 (바이트 오프셋 int64, 길이 int32, 조각 번호 int16, 임무 번호 int16)
+    mission_order.npy    임무 번호 순으로 정렬한 레코드 번호 (임무 안에서는 원래 순서)
+    mission_starts.npy   임무별 mission_order 시작 위치 (임무 수 + 1)
+
+사용법:
+    python models/corpus.py convert integrated_safety_corpus.json models/safety_corpus
+    python models/corpus.py bench --records 200000
+"""
+
+import codecs
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+CORPUS_FILENAME = 'integrated_safety_corpus.json'
+CORPUS_DIRNAME = 'safety_corpus'
+CORPUS_VERSION = 1
+
+RECORD_DTYPE = np.dtype([('offset', '<i8'), ('length', '<i4'), ('shard', '<i2'), ('mission', '<i2')])
+
+# 조각 파일당 최대 레코드 수 / 바이트 수
+SHARD_RECORDS = 50000
+SHARD_BYTES = 64 * 1024 ** 2
+
+# 색인 기록 단위 (레코드)
+INDEX_BATCH = 65536
+
+# 원본 읽기 단위, 레코드 하나의 최대 크기 (초과 시 형식 오류로 간주해 버퍼가 무한히 커지지 않게 함)
+READ_CHUNK = 1024 ** 2
+MAX_RECORD_BYTES = 64 * 1024 ** 2
+
+# 레코드에서 임무를 찾을 필드 이름 (앞에서부터 우선)
+MISSION_FIELDS = ['mission', 'mission_type', '임무', '임무유형', 'task']
+UNKNOWN_MISSION = -1
+
+# 같은 프로세스에서 동시에 열어 둘 조각 파일 수
+MAX_OPEN_SHARDS = 8
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_END = re.compile(r'[ \t\n\r]*[,\]}:]')
+_DECODER = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    """큰 JSON 배열의 원소를 하나씩 디코딩 (버퍼는 읽기 단위 + 레코드 하나 크기로 제한)"""
+
+    def __init__(self, f, chunk_size=READ_CHUNK, max_record_bytes=MAX_RECORD_BYTES):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.max_record_bytes = max_record_bytes
+        self.bytes_read = 0
+        self._text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buffer = ''
+        self._pos = 0
+        self._value_start = 0
+        self._eof = False
+
+    def _fill(self, size=None):
+        """원본을 더 읽어 버퍼 뒤에 붙임 (이미 처리한 앞부분은 버림), 끝이면 False"""
+        if self._eof:
+            return False
+        data = self.f.read(size or self.chunk_size)
+        self.bytes_read += len(data)
+        self._eof = not data
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(data, final=self._eof)
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self):
+        """공백을 건너뛴 다음 문자 (끝이면 빈 문자열)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 필요 (원본 {self.bytes_read:,}바이트 부근)")
+        self._pos += 1
+
+    def _value(self):
+        """현재 위치의 JSON 값 하나 디코딩 (값이 버퍼 경계에 걸리면 더 읽고 재시도)"""
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # 숫자는 버퍼 경계에서 잘렸을 수 있음 ("2.5" → "2.") → 뒤에 구분 문자가 보일 때만 확정
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or self._eof or \
+                        _NUMBER_END.match(self._buffer, end):
+                    self._value_start, self._pos = self._pos, end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            if len(self._buffer) - self._pos > self.max_record_bytes:
+                raise ValueError(f"레코드가 {self.max_record_bytes:,}바이트를 넘거나 JSON 형식이 잘못되었습니다 "
+                                 f"(원본 {self.bytes_read:,}바이트 부근)")
+            self._fill(size)
+            size *= 2
+
+    def records(self, array_key=None, with_text=False):
+        """배열 원소 생성기 (최상위가 객체면 array_key 또는 첫 배열 값을 사용)
+
+        with_text=True 면 (값, 원본 JSON 텍스트) 를 반환합니다 (재직렬화 없이 그대로 기록할 때).
+        """
+        if self._peek() == '{':
+            self._pos += 1
+            while True:
+                char = self._peek()
+                if char == ',':
+                    self._pos += 1
+                    continue
+                if char != '"':
+                    raise ValueError("JSON 객체에서 레코드 배열을 찾지 못했습니다")
+                key = self._value()
+                self._expect(':')
+                if self._peek() == '[' and (array_key is None or key == array_key):
+                    break
+                self._value()  # 다른 값은 건너뜀
+        self._expect('[')
+        while True:
+            char = self._peek()
+            if char == ']':
+                return
+            if char == ',':
+                self._pos += 1
+                continue
+            if not char:
+                raise ValueError("JSON 배열이 닫히지 않았습니다")
+            value = self._value()
+            yield (value, self._buffer[self._value_start:self._pos]) if with_text else value
+
+
+def record_mission(record, mission_field=None):
+    """레코드 → 임무 이름 (없으면 None)"""
+    if not isinstance(record, dict):
+        return None
+    fields = [mission_field] if mission_field else MISSION_FIELDS
+    for field in fields:
+        value = record.get(field)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def convert_corpus(json_path, out_dir=None, mission_field=None, array_key=None,
+                   shard_records=SHARD_RECORDS, shard_bytes=SHARD_BYTES, progress=None):
+    """JSON 말뭉치 → 분할 저장소 (임시 폴더에 기록 후 교체), 폴더 경로 반환
+
+    progress(레코드 수, 읽은 바이트 수, 전체 바이트 수) 는 조각 파일마다 호출됩니다.
+    """
+    json_path = Path(json_path)
+    out_dir = Path(out_dir) if out_dir else json_path.parent / CORPUS_DIRNAME
+    tmp_dir = out_dir.with_name(out_dir.name + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    source_size = json_path.stat().st_size
+    missions = {}
+    shards = []
+    count = 0
+    shard = None
+    shard_offset = 0
+    shard_count = 0
+
+    def open_shard():
+        name = f'shard_{len(shards):05d}.jsonl'
+        shards.append(name)
+        return open(tmp_dir / name, 'wb', buffering=READ_CHUNK)
+
+    try:
+        with open(json_path, 'rb') as source, open(tmp_dir / 'records.bin', 'wb', buffering=READ_CHUNK) as index:
+            stream = JsonArrayStream(source)
+            entries = np.zeros(INDEX_BATCH, dtype=RECORD_DTYPE)
+            pending = 0
+            for record, text in stream.records(array_key, with_text=True):
+                if shard is None or shard_count >= shard_records or shard_offset >= shard_bytes:
+                    if shard is not None:
+                        shard.close()
+                        if progress is not None:
+                            progress(count, stream.bytes_read, source_size)
+                    shard = open_shard()
+                    shard_offset = 0
+                    shard_count = 0
+
+                # 원본 텍스트를 그대로 한 줄로 기록 (JSON 문자열 안에는 줄바꿈이 없으므로 줄바꿈은 공백으로 바꿔도 같은 값)
+                if '\n' in text or '\r' in text:
+                    text = text.replace('\r', ' ').replace('\n', ' ')
+                line = text.encode('utf-8') + b'\n'
+                shard.write(line)
+                mission = record_mission(record, mission_field)
+                entries[pending] = (shard_offset, len(line), len(shards) - 1,
+                                    UNKNOWN_MISSION if mission is None else missions.setdefault(mission, len(missions)))
+                pending += 1
+                if pending == INDEX_BATCH:
+                    index.write(entries.tobytes())
+                    pending = 0
+                shard_offset += len(line)
+                shard_count += 1
+                count += 1
+            index.write(entries[:pending].tobytes())
+        if shard is not None:
+            shard.close()
+            shard = None
+        if progress is not None:
+            progress(count, source_size, source_size)
+        if len(shards) > np.iinfo(np.int16).max or len(missions) > np.iinfo(np.int16).max:
+            raise ValueError("조각 파일 또는 임무 종류가 너무 많습니다 (최대 32767)")
+
+        # 임무별 레코드 번호 (안정 정렬 → 임무 안에서는 원래 순서, 임무 없음(-1)은 맨 앞)
+        codes = (np.fromfile(tmp_dir / 'records.bin', dtype=RECORD_DTYPE)['mission'] if count
+                 else np.zeros(0, dtype=np.int16))
+        order = np.argsort(codes, kind='stable').astype(np.int64)
+        starts = np.searchsorted(codes[order], np.arange(len(missions) + 1), side='left').astype(np.int64)
+        np.save(tmp_dir / 'mission_order.npy', order)
+        np.save(tmp_dir / 'mission_starts.npy', starts)
+
+        stat = json_path.stat()
+        meta = {
+            'version': CORPUS_VERSION,
+            'records': count,
+            'shards': shards,
+            'missions': list(missions),
+            'mission_field': mission_field,
+            'source': json_path.name,
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns
+        }
+        with open(tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    except BaseException:
+        if shard is not None:
+            shard.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    return out_dir
+
+
+class CorpusReader:
+    """분할 저장소 조회 (색인만 메모리 매핑, 레코드는 요청 시 해당 위치만 읽음)"""
+
+    def __init__(self, directory, max_open_shards=MAX_OPEN_SHARDS):
+        self.directory = Path(directory)
+        with open(self.directory / 'meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != CORPUS_VERSION:
+            raise ValueError(f"지원하지 않는 말뭉치 저장소 버전: {self.meta.get('version')}")
+
+        count = self.meta['records']
+        self.records = (np.memmap(self.directory / 'records.bin', dtype=RECORD_DTYPE, mode='r', shape=(count,))
+                        if count else np.zeros(0, dtype=RECORD_DTYPE))
+        self.mission_order = np.load(self.directory / 'mission_order.npy', mmap_mode='r')
+        self.mission_starts = np.load(self.directory / 'mission_starts.npy')
+        self.missions = list(self.meta['missions'])
+        self._mission_codes = {mission: code for code, mission in enumerate(self.missions)}
+        self._shard_paths = [self.directory / name for name in self.meta['shards']]
+        self._handles = OrderedDict()
+        self._max_open_shards = max_open_shards
+        self._lock = threading.Lock()
+
+    @classmethod
+    def find(cls, search_dirs):
+        """검색 폴더에서 변환된 말뭉치 저장소를 찾아 열기 (없으면 None)"""
+        for directory in search_dirs:
+            path = Path(directory) / CORPUS_DIRNAME
+            if (path / 'meta.json').exists():
+                return cls(path)
+        return None
+
+    def __len__(self):
+        return len(self.records)
+
+    def _read(self, shard, offset, length):
+        """조각 파일의 지정 위치 읽기 (열린 파일은 최근 사용 순으로 일부만 유지)"""
+        with self._lock:
+            handle = self._handles.pop(shard, None)
+            if handle is None:
+                handle = open(self._shard_paths[shard], 'rb')
+                while len(self._handles) >= self._max_open_shards:
+                    self._handles.popitem(last=False)[1].close()
+            self._handles[shard] = handle
+            handle.seek(offset)
+            return handle.read(length)
+
+    def __getitem__(self, index):
+        """레코드 번호로 조회 (음수는 뒤에서부터)"""
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"말뭉치 레코드 번호 범위 초과: {index}")
+        entry = self.records[index]
+        return json.loads(self._read(int(entry['shard']), int(entry['offset']), int(entry['length'])))
+
+    def __iter__(self):
+        """전체 레코드 순차 조회 (조각 파일을 한 줄씩 읽음)"""
+        for path in self._shard_paths:
+            with open(path, 'rb') as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def mission_counts(self):
+        """임무별 레코드 수"""
+        return dict(zip(self.missions, np.diff(self.mission_starts).tolist()))
+
+    def mission_ids(self, mission):
+        """임무의 레코드 번호 배열 (원래 순서, 없는 임무는 빈 배열)"""
+        code = self._mission_codes.get(mission)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.mission_order[self.mission_starts[code]:self.mission_starts[code + 1]]
+
+    def filter(self, mission, limit=None):
+        """임무별 레코드 생성기"""
+        ids = self.mission_ids(mission)
+        for index in (ids if limit is None else ids[:limit]):
+            yield self[index]
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# 벤치마크
+
+def write_synthetic_corpus(path, records, missions=None):
+    """벤치마크용 합성 말뭉치 (최상위 배열, 레코드당 약 400바이트)"""
+    missions = missions or ['복합적층장갑', '엔진정비', '전기계통', '유압시스템', '무기체계']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(records):
+            record = {
+                'id': i,
+                'mission': missions[i % len(missions)],
+                'text': f"{missions[i % len(missions)]} 작업 중 안전 사고 사례 {i}: " + '보호구 착용과 작업 절차 준수가 필요합니다. ' * 4,
+                'keywords': ['개인보호구 미착용', '작업 절차 미준수', f'사례{i % 97}'],
+                'risk_score': round((i * 37 % 1000) / 10, 1)
+            }
+            f.write(('' if i == 0 else ',\n') + json.dumps(record, ensure_ascii=False))
+        f.write('\n]\n')
+
+
+def _measure(kind, path):
+    """(별도 프로세스) json.load 또는 분할 저장소 조회의 시간 / 메모리 증가량 출력"""
+    try:
+        from models.vocab import rss_mb
+    except ImportError:
+        from vocab import rss_mb
+
+    before = rss_mb()
+    started = time.perf_counter()
+    stats = {}
+    if kind == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        stats['load_ms'] = (time.perf_counter() - started) * 1000
+        stats['records'] = len(records)
+        stats['rss_mb'] = rss_mb() - before
+    elif kind == 'convert':
+        convert_corpus(path, Path(path).parent / CORPUS_DIRNAME)
+        stats['convert_sec'] = time.perf_counter() - started
+        stats['rss_mb'] = rss_mb() - before
+    else:
+        reader = CorpusReader(path)
+        stats['load_ms'] = (time.perf_counter() - started) * 1000
+        rng = np.random.default_rng(0)
+        picks = rng.integers(0, len(reader), 2000)
+        started = time.perf_counter()
+        for index in picks:
+            reader[index]
+        stats['random_us'] = (time.perf_counter() - started) / len(picks) * 1e6
+        started = time.perf_counter()
+        filtered = sum(1 for _ in reader.filter(reader.missions[0]))
+        stats['filter_per_sec'] = filtered / (time.perf_counter() - started)
+        started = time.perf_counter()
+        stats['records'] = sum(1 for _ in reader)
+        stats['scan_per_sec'] = stats['records'] / (time.perf_counter() - started)
+        stats['rss_mb'] = rss_mb() - before
+    print(json.dumps(stats))
+
+
+def bench(records=200000, workdir=None):
+    """json.load 전체 로드 vs 스트리밍 변환 + 분할 조회: 시간, 메모리(RSS)"""
+    import tempfile
+
+    workdir = Path(workdir or tempfile.mkdtemp(prefix='corpus_bench_'))
+    json_path = workdir / CORPUS_FILENAME
+    write_synthetic_corpus(json_path, records)
+
+    results = {}
+    for kind, path in (('json', json_path), ('convert', json_path), ('reader', workdir / CORPUS_DIRNAME)):
+        output = subprocess.run(
+            [sys.executable, __file__, '_measure', kind, str(path)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[kind] = json.loads(output.strip().splitlines()[-1])
+
+    size_mb = json_path.stat().st_size / 1024 ** 2
+    json_stats, convert_stats, reader_stats = results['json'], results['convert'], results['reader']
+    print(f"말뭉치 {records:,}건 ({size_mb:.1f}MB)")
+    print(f"json.load       : {json_stats['load_ms'] / 1000:.2f}초, RSS 증가 {json_stats['rss_mb']:.1f}MB")
+    print(f"스트리밍 변환   : {convert_stats['convert_sec']:.2f}초 ({size_mb / convert_stats['convert_sec']:.1f}MB/초), "
+          f"RSS 증가 {convert_stats['rss_mb']:.1f}MB")
+    print(f"저장소 열기     : {reader_stats['load_ms']:.1f}ms, 번호 조회 {reader_stats['random_us']:.1f}us/건, "
+          f"RSS 증가 {reader_stats['rss_mb']:.1f}MB")
+    print(f"순차 조회       : {reader_stats['scan_per_sec']:,.0f}건/초, 임무별 조회 {reader_stats['filter_per_sec']:,.0f}건/초")
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="학습 말뭉치 분할 변환 / 벤치마크")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="JSON 말뭉치 → 분할 저장소")
+    convert.add_argument('json_path')
+    convert.add_argument('out_dir', nargs='?')
+    convert.add_argument('--mission-field', help=f"임무 필드 이름 (기본: {', '.join(MISSION_FIELDS)} 중 첫 번째)")
+    convert.add_argument('--array-key', help="최상위가 객체일 때 레코드 배열의 키 (기본: 첫 배열)")
+    convert.add_argument('--shard-records', type=int, default=SHARD_RECORDS)
+    bench_parser = commands.add_parser('bench', help="전체 로드와 시간 / 메모리 비교")
+    bench_parser.add_argument('--records', type=int, default=200000)
+    measure = commands.add_parser('_measure')
+    measure.add_argument('kind')
+    measure.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        started = time.perf_counter()
+
+        def progress(count, done, total):
+            print(f"  {count:,}건, {done / max(total, 1) * 100:.0f}%", flush=True)
+
+        try:
+            out_dir = convert_corpus(args.json_path, args.out_dir, args.mission_field, args.array_key,
+                                     args.shard_records, progress=progress)
+        except (OSError, ValueError) as e:
+            print(f"❌ 말뭉치 변환 실패: {e}", file=sys.stderr)
+            return 1
+        with CorpusReader(out_dir) as reader:
+            print(f"✅ 말뭉치 변환 완료: {out_dir} ({len(reader):,}건, 조각 {len(reader.meta['shards'])}개, "
+                  f"{time.perf_counter() - started:.1f}초)")
+            for mission, count in reader.mission_counts().items():
+                print(f"  {mission}: {count:,}건")
+        return 0
+    if args.command == 'bench':
+        bench(args.records)
+        return 0
+    _measure(args.kind, args.path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
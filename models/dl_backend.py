@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DL 모델 CPU 추론 백엔드 (GPU 없는 정비창 워크스테이션용)
+
+학습된 DL 모델(neural_safety_model.pth)을 CPU 에서 빠르게 실행하도록 변환합니다.
+    1. 동적 int8 양자화: Linear 가중치 int8, EmbeddingBag 가중치 8비트 (활성값은 실행 시 양자화)
+    2. TorchScript 변환 (trace + freeze): 파이썬 모듈 호출 오버헤드 제거, 연산 융합
+    3. 스레드 수 조정: intra-op 스레드 = 물리 코어 수, inter-op 1 (작은 배치에서 스레드 경합 방지)
+    4. 일괄 추론: 여러 인원을 batch_size 단위로 묶어 한 번에 실행
+float 모델과의 결과 일치 검사(parity_check)와 CPU 지연 시간 벤치마크(bench)를 포함합니다.
+
+PyTorch 는 선택 의존성입니다. 설치되어 있지 않거나 모델 파일이 없으면
+DummyDLModel 은 기존 키워드 인덱스 경로를 그대로 사용합니다.
+
+입력: 인원마다 (임무, 나이 구간, 근속 구간, 성별) 토큰 4개 → EmbeddingBag → MLP → 위험 키워드 점수
+
+사용법:
+    python models/dl_backend.py bench                                  # 참조 모델(무작위 가중치)로 측정
+    python models/dl_backend.py bench --checkpoint models/neural_safety_model.pth --threads 1 2 4
+    python models/dl_backend.py export --checkpoint models/neural_safety_model.pth
+"""
+
+import copy
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from models.keyword_index import KeywordIndex, age_bands, service_bands
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from keyword_index import KeywordIndex, age_bands, service_bands
+
+DL_CHECKPOINT = 'neural_safety_model.pth'
+SCRIPTED_SUFFIX = '.cpu.pt'  # export 로 저장한 TorchScript (로딩 시 변환 생략)
+
+# 백엔드 방식 → 설정 창 표시 이름
+BACKEND_MODES = {
+    'cpu-int8': 'CPU 최적화 (TorchScript + int8)',
+    'cpu-float': 'CPU (TorchScript float)',
+    'eager': '기본 (PyTorch eager)'
+}
+DEFAULT_BACKEND = 'cpu-int8'
+
+DEFAULT_BATCH = 256
+GENDER_TOKENS = {'남성': 0, '남': 0, '여성': 1, '여': 1}
+
+# 결과 일치 기준: float 모델 대비 상위 k 키워드 평균 일치율
+PARITY_TOP_K = 10
+PARITY_MIN_OVERLAP = 0.9
+
+
+def require_torch():
+    """PyTorch 임포트 (없으면 설치 안내 오류)"""
+    try:
+        import torch
+    except ImportError:
+        raise RuntimeError("DL CPU 백엔드에는 PyTorch 가 필요합니다: pip install torch") from None
+    return torch
+
+
+def default_threads():
+    """intra-op 스레드 수 기본값 (프로세스에 허용된 CPU 수, 하이퍼스레딩이면 절반)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Windows / macOS
+        cpus = os.cpu_count() or 1
+    return max(1, cpus // 2 if cpus >= 4 else cpus)
+
+
+def configure_threads(threads=None):
+    """추론 스레드 수 설정 → 적용된 intra-op 스레드 수"""
+    torch = require_torch()
+    threads = threads or default_threads()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # 병렬 작업이 이미 시작된 뒤에는 변경 불가 (프로세스당 한 번)
+    return threads
+
+
+def token_layout(keyword_index):
+    """입력 토큰 구간 (임무, 나이 구간, 근속 구간, 성별 시작 번호), 전체 토큰 수"""
+    n_missions = len(keyword_index.missions) + 1  # + 알 수 없는 임무
+    n_age, n_service = keyword_index.candidate_counts.shape[1:]
+    starts = np.cumsum([0, n_missions, n_age, n_service])
+    return starts, int(starts[-1] + len(set(GENDER_TOKENS.values())) + 1)
+
+
+def encode_inputs(keyword_index, columns, missions):
+    """인원 열 딕셔너리 + 임무 → (인원, 4) 토큰 번호 배열 (int64)"""
+    starts, _ = token_layout(keyword_index)
+    unknown_gender = len(set(GENDER_TOKENS.values()))
+    genders = np.array([GENDER_TOKENS.get(str(gender).strip(), unknown_gender)
+                        for gender in np.asarray(columns['gender']).tolist()], dtype=np.int64)
+    return np.stack([
+        keyword_index.mission_rows(missions) + starts[0],
+        age_bands(columns['age']) + starts[1],
+        service_bands(columns['service_years']) + starts[2],
+        genders + starts[3]
+    ], axis=1).astype(np.int64)
+
+
+def build_reference_model(n_tokens, n_keywords, dim=64, hidden=256):
+    """DL 모델 구조 (체크포인트가 state_dict 이면 이 구조에 가중치를 불러옴)"""
+    torch = require_torch()
+    nn = torch.nn
+
+    class SafetyKeywordNet(nn.Module):
+        """인원/임무 토큰 → 위험 키워드 점수"""
+
+        def __init__(self):
+            super().__init__()
+            self.embedding = nn.EmbeddingBag(n_tokens, dim, mode='sum')
+            self.mlp = nn.Sequential(
+                nn.Linear(dim, hidden), nn.ReLU(),
+                nn.Linear(hidden, hidden), nn.ReLU(),
+                nn.Linear(hidden, n_keywords)
+            )
+
+        def forward(self, tokens):
+            return self.mlp(self.embedding(tokens))
+
+    return SafetyKeywordNet()
+
+
+def load_float_model(path, keyword_index):
+    """체크포인트 → 평가 모드 float 모델 (전체 모듈 또는 state_dict 모두 지원)"""
+    torch = require_torch()
+    checkpoint = torch.load(path, map_location='cpu', weights_only=False)
+    if isinstance(checkpoint, torch.nn.Module):
+        return checkpoint.eval()
+    state_dict = checkpoint.get('state_dict', checkpoint)
+    _, n_tokens = token_layout(keyword_index)
+    model = build_reference_model(n_tokens, len(keyword_index.vocab))
+    model.load_state_dict(state_dict)
+    return model.eval()
+
+
+def quantize_model(model):
+    """동적 int8 양자화 (Linear: int8 가중치, EmbeddingBag: 8비트 가중치) — 원본은 그대로 둠"""
+    torch = require_torch()
+    from torch.ao.quantization import default_dynamic_qconfig, float_qparams_weight_only_qconfig
+
+    return torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model),
+        {torch.nn.Linear: default_dynamic_qconfig, torch.nn.EmbeddingBag: float_qparams_weight_only_qconfig},
+        dtype=torch.qint8
+    )
+
+
+def script_model(model, example_tokens):
+    """trace + freeze 로 TorchScript 변환 (freeze 를 지원하지 않는 연산이면 trace 결과 사용)"""
+    torch = require_torch()
+    with torch.inference_mode():
+        traced = torch.jit.trace(model, example_tokens)
+    try:
+        return torch.jit.freeze(traced)
+    except (RuntimeError, AttributeError):
+        return traced
+
+
+class CPUInferenceBackend:
+    """DL 모델 CPU 추론기 (양자화 / TorchScript / 스레드 설정 / 일괄 추론)"""
+
+    def __init__(self, float_model, keyword_index, mode=DEFAULT_BACKEND, threads=None, batch_size=DEFAULT_BATCH,
+                 module=None):
+        if mode not in BACKEND_MODES:
+            raise ValueError(f"지원하지 않는 DL 추론 백엔드입니다: {mode}")
+        self.torch = require_torch()
+        self.keyword_index = keyword_index
+        self.mode = mode
+        self.batch_size = batch_size
+        self.threads = configure_threads(threads)
+        self.float_model = float_model.eval() if float_model is not None else None
+
+        if module is not None:  # export 로 저장한 TorchScript
+            self.module = module
+        elif mode == 'eager':
+            self.module = self.float_model
+        else:
+            model = quantize_model(self.float_model) if mode == 'cpu-int8' else self.float_model
+            example = self.torch.from_numpy(np.zeros((min(batch_size, 8), 4), dtype=np.int64))
+            self.module = script_model(model, example)
+
+    @classmethod
+    def from_checkpoint(cls, path, keyword_index, mode=DEFAULT_BACKEND, threads=None, batch_size=DEFAULT_BATCH):
+        """모델 파일 → 백엔드 (같은 이름의 .cpu.pt 가 있으면 변환 없이 TorchScript 로드)"""
+        torch = require_torch()
+        path = Path(path)
+        scripted = path.with_suffix(SCRIPTED_SUFFIX)
+        if mode == 'cpu-int8' and scripted.exists() and scripted.stat().st_mtime >= path.stat().st_mtime:
+            return cls(None, keyword_index, mode, threads, batch_size,
+                       module=torch.jit.load(str(scripted), map_location='cpu'))
+        return cls(load_float_model(path, keyword_index), keyword_index, mode, threads, batch_size)
+
+    def save(self, path):
+        """TorchScript 모듈 저장 (다음 로딩 시 양자화 / 변환 생략)"""
+        if self.mode == 'eager':
+            raise ValueError("eager 백엔드는 TorchScript 로 저장할 수 없습니다")
+        self.torch.jit.save(self.module, str(path))
+        return Path(path)
+
+    def _run(self, module, tokens):
+        """(인원, 4) 토큰 → (인원, 키워드 수) 점수 (batch_size 씩 나누어 실행)"""
+        outputs = []
+        with self.torch.inference_mode():
+            for start in range(0, len(tokens), self.batch_size):
+                batch = self.torch.from_numpy(np.ascontiguousarray(tokens[start:start + self.batch_size]))
+                outputs.append(module(batch).float().numpy())
+        if not outputs:
+            return np.zeros((0, len(self.keyword_index.vocab)), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def scores(self, tokens):
+        return self._run(self.module, tokens)
+
+    def generate_keywords(self, columns, missions, num_keywords=10):
+        """인원 열 딕셔너리 + 인원별 임무 → 인원별 상위 num_keywords 위험 키워드"""
+        scores = self.scores(encode_inputs(self.keyword_index, columns, missions))
+        k = min(num_keywords, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        return [self.keyword_index.vocab[row].tolist() for row in top]
+
+    def parity_check(self, tokens, top_k=PARITY_TOP_K, min_overlap=PARITY_MIN_OVERLAP):
+        """float 모델 대비 결과 일치 검사 → 점수 오차, 상위 1 / 상위 k 일치율, 통과 여부"""
+        if self.float_model is None:
+            raise ValueError("float 모델 없이 불러온 백엔드는 일치 검사를 할 수 없습니다")
+        expected = self._run(self.float_model, tokens)
+        actual = self.scores(tokens)
+        k = min(top_k, expected.shape[1])
+        expected_top = np.argpartition(-expected, k - 1, axis=1)[:, :k]
+        actual_top = np.argpartition(-actual, k - 1, axis=1)[:, :k]
+        overlap = np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(expected_top, actual_top)])
+        report = {
+            'max_abs_diff': float(np.abs(expected - actual).max()),
+            'mean_abs_diff': float(np.abs(expected - actual).mean()),
+            'top1_agreement': float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))),
+            'topk_overlap': float(overlap)
+        }
+        report['passed'] = report['topk_overlap'] >= min_overlap
+        return report
+
+
+def load_backend(path, keyword_index, mode=DEFAULT_BACKEND, threads=None):
+    """모델 파일이 있고 PyTorch 가 설치된 경우에만 백엔드 생성 (아니면 None, 오류는 출력만)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        backend = CPUInferenceBackend.from_checkpoint(path, keyword_index, mode, threads)
+    except Exception as e:
+        print(f"❌ DL CPU 백엔드 준비 실패 (키워드 인덱스 사용): {e}")
+        return None
+    print(f"✅ DL CPU 백엔드 준비 완료 ({BACKEND_MODES[mode]}, 스레드 {backend.threads}개)")
+    return backend
+
+
+# ----------------------------------------------------------------------
+# 벤치마크
+
+def synthetic_tokens(keyword_index, count, seed=2025):
+    """벤치마크용 합성 인원 토큰"""
+    rng = np.random.default_rng(seed)
+    missions = list(keyword_index.missions)
+    columns = {
+        'gender': rng.choice(['남성', '여성'], count),
+        'age': rng.integers(20, 60, count),
+        'service_years': rng.integers(0, 35, count)
+    }
+    return encode_inputs(keyword_index, columns, [missions[i % len(missions)] for i in range(count)])
+
+
+def bench(checkpoint=None, batch_sizes=(1, 32, 256), thread_counts=None, repeat=50):
+    """float eager / TorchScript float / TorchScript int8 의 배치 크기 × 스레드 수별 지연 시간"""
+    torch = require_torch()
+    keyword_index = KeywordIndex()
+    if checkpoint:
+        float_model = load_float_model(checkpoint, keyword_index)
+    else:
+        torch.manual_seed(0)
+        _, n_tokens = token_layout(keyword_index)
+        float_model = build_reference_model(n_tokens, len(keyword_index.vocab)).eval()
+
+    thread_counts = thread_counts or sorted({1, default_threads()})
+    tokens = synthetic_tokens(keyword_index, max(batch_sizes))
+    results = []
+    print(f"{'방식':<34} {'스레드':>6} {'배치':>6} {'p50(ms)':>10} {'p99(ms)':>10} {'인원/초':>12}")
+    for threads in thread_counts:
+        for mode in BACKEND_MODES:
+            backend = CPUInferenceBackend(float_model, keyword_index, mode, threads, max(batch_sizes))
+            for batch_size in batch_sizes:
+                batch = tokens[:batch_size]
+                backend.scores(batch)  # 예열
+                latencies = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    backend.scores(batch)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                p50, p99 = np.percentile(latencies, [50, 99])
+                results.append({'mode': mode, 'threads': threads, 'batch': batch_size,
+                                'p50_ms': float(p50), 'p99_ms': float(p99)})
+                print(f"{BACKEND_MODES[mode]:<34} {threads:>6} {batch_size:>6} {p50:>10.3f} {p99:>10.3f} "
+                      f"{batch_size / p50 * 1000:>12,.0f}")
+
+    backend = CPUInferenceBackend(float_model, keyword_index, 'cpu-int8')
+    parity = backend.parity_check(synthetic_tokens(keyword_index, 2048))
+    print(f"\nint8 결과 일치: 상위 {PARITY_TOP_K}개 일치율 {parity['topk_overlap']:.1%}, "
+          f"상위 1개 {parity['top1_agreement']:.1%}, 최대 오차 {parity['max_abs_diff']:.4f} "
+          f"{'✅' if parity['passed'] else '❌'}")
+    return {'latency': results, 'parity': parity}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DL 모델 CPU 추론 백엔드 벤치마크 / 변환")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench_parser = commands.add_parser('bench', help="CPU 지연 시간 + int8 결과 일치 검사")
+    bench_parser.add_argument('--checkpoint', help="모델 파일 (생략 시 무작위 가중치 참조 모델)")
+    bench_parser.add_argument('--batch', type=int, nargs='+', default=[1, 32, 256])
+    bench_parser.add_argument('--threads', type=int, nargs='+')
+    bench_parser.add_argument('--repeat', type=int, default=50)
+    export_parser = commands.add_parser('export', help="int8 TorchScript 로 변환해 저장 (.cpu.pt)")
+    export_parser.add_argument('--checkpoint', default=str(Path(__file__).resolve().parent / DL_CHECKPOINT))
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.checkpoint, args.batch, args.threads, args.repeat)
+        return 0
+
+    keyword_index = KeywordIndex()
+    backend = CPUInferenceBackend(load_float_model(args.checkpoint, keyword_index), keyword_index)
+    parity = backend.parity_check(synthetic_tokens(keyword_index, 2048))
+    if not parity['passed']:
+        print(f"❌ int8 결과 일치율 부족 ({parity['topk_overlap']:.1%} < {PARITY_MIN_OVERLAP:.0%}), 저장하지 않음")
+        return 1
+    output = backend.save(Path(args.checkpoint).with_suffix(SCRIPTED_SUFFIX))
+    print(f"✅ TorchScript int8 저장 완료: {output} (상위 {PARITY_TOP_K}개 일치율 {parity['topk_overlap']:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
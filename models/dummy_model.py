@@ -8,16 +8,94 @@
 """
 
 import numpy as np
-import pandas as pd
 import json
 import pickle
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 from pathlib import Path
 
+try:
+    from models.feature_tables import FeatureTables, DEFAULT_ENCODERS, DEFAULT_SCALER, hour_offsets
+    from models.weather_store import WeatherStore
+    from models.prediction_cache import PredictionCache, prediction_key, floor_hour
+    from models.keyword_index import KeywordIndex, keyword_seed, keyword_seeds, check_num_keywords
+    from models.vocab import load_vocab, write_vocab, VOCAB_FILENAME
+    from models.retrieval import MeasureIndex, MEASURE_INDEX_DIRNAME, personal_terms
+    from models.templates import RISK_ANALYSIS
+    from models.incremental_forecast import IncrementalForecast
+    from models.random_streams import (hourly_uniform, hourly_uniforms, hour_numbers, request_rng,
+                                       STREAM_RISK_SERIES, STREAM_DL_RISK)
+    from models.profiling import timed, count
+    from models.dl_backend import load_backend, BACKEND_MODES, DEFAULT_BACKEND, DL_CHECKPOINT
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from feature_tables import FeatureTables, DEFAULT_ENCODERS, DEFAULT_SCALER, hour_offsets
+    from weather_store import WeatherStore
+    from prediction_cache import PredictionCache, prediction_key, floor_hour
+    from keyword_index import KeywordIndex, keyword_seed, keyword_seeds, check_num_keywords
+    from vocab import load_vocab, write_vocab, VOCAB_FILENAME
+    from retrieval import MeasureIndex, MEASURE_INDEX_DIRNAME, personal_terms
+    from templates import RISK_ANALYSIS
+    from incremental_forecast import IncrementalForecast
+    from random_streams import (hourly_uniform, hourly_uniforms, hour_numbers, request_rng,
+                                STREAM_RISK_SERIES, STREAM_DL_RISK)
+    from profiling import timed, count
+    from dl_backend import load_backend, BACKEND_MODES, DEFAULT_BACKEND, DL_CHECKPOINT
+
+MODELS_DIR = Path(__file__).resolve().parent
+
+PERSONNEL_FIELDS = ('gender', 'age', 'service_years')
+
+def normalize_personnel(personnel):
+    """인원 명단을 열(column) 단위 배열 딕셔너리로 변환
+    
+    DataFrame, 구조화 배열, 딕셔너리 리스트, 열 딕셔너리를 모두 지원합니다.
+    """
+    if hasattr(personnel, 'columns') and hasattr(personnel, 'to_numpy'):  # pandas DataFrame
+        source = {col: personnel[col].to_numpy() for col in personnel.columns}
+    elif isinstance(personnel, np.ndarray) and personnel.dtype.names:
+        source = {col: personnel[col] for col in personnel.dtype.names}
+    elif isinstance(personnel, dict):
+        source = {col: np.asarray(values) for col, values in personnel.items()}
+    else:
+        records = list(personnel)
+        source = {col: np.array([record.get(col) for record in records], dtype=object)
+                  for col in ('name',) + PERSONNEL_FIELDS if records and col in records[0]}
+    
+    missing = [col for col in PERSONNEL_FIELDS if col not in source]
+    if missing:
+        raise ValueError(f"인원 명단에 필수 항목이 없습니다: {', '.join(missing)}")
+    
+    columns = {
+        'gender': np.asarray(source['gender'], dtype=object),
+        'age': np.asarray(source['age']).astype(np.int64),
+        'service_years': np.asarray(source['service_years']).astype(np.int64)
+    }
+    if 'name' in source:
+        columns['name'] = np.asarray(source['name'], dtype=object)
+    return columns
+
+def check_missions(missions):
+    """임무 목록 검증 (중복 임무는 결과 열이 겹치므로 거부) → 임무 리스트"""
+    missions = list(missions)
+    seen = set()
+    duplicates = [mission for mission in missions if mission in seen or seen.add(mission)]
+    if duplicates:
+        raise ValueError(f"임무 목록에 중복된 임무가 있습니다: {', '.join(map(str, dict.fromkeys(duplicates)))}")
+    return missions
+
 class DummyMLModel:
     """머신러닝 모델 더미 구현"""
     
+    # 임무 유형별 위험도
+    MISSION_RISKS = {
+        '복합적층장갑': 7.2,
+        '엔진정비': 6.8,
+        '전기계통': 7.5,
+        '유압시스템': 8.1,
+        '무기체계': 8.5
+    }
+    DEFAULT_MISSION_RISK = 7.0
+    DEFAULT_AVAILABLE_MISSIONS = ['복합적층장갑', '엔진정비', '전기계통', '유압시스템']
+    
     def __init__(self):
         self.model_loaded = False
         self.feature_names = [
@@ -25,8 +103,11 @@ class DummyMLModel:
             'weather_temp', 'weather_humidity', 'weather_condition',
             'month', 'weekday', 'hour'
         ]
+        self.version = '1.0'
+        self.cache = PredictionCache(maxsize=256)
         self.load_model()
     
+    @timed('ml.load_model')
     def load_model(self):
         """모델 로딩 시뮬레이션"""
         try:
@@ -35,6 +116,15 @@ class DummyMLModel:
             # self.encoders = joblib.load('enhanced_encoders.pkl')
             # self.scaler = joblib.load('enhanced_scaler.pkl')
             
+            # 인코더/스케일러 → 특징 룩업 테이블 (로딩 시 1회)
+            self.features = FeatureTables.load(MODELS_DIR)
+            
+            # 기상 데이터 캐시 (weather_data_2025.xlsx 가 있는 경우만)
+            self.weather = WeatherStore.find([MODELS_DIR, MODELS_DIR.parent / 'data'],
+                                             self.features.weather_codes)
+            if self.weather is not None:
+                self.weather = self.weather.open()  # 손상된 파일이면 None (기상 정보 없이 예측)
+            
             print("✅ ML 모델 로딩 완료 (더미)")
             self.model_loaded = True
             
@@ -42,65 +132,122 @@ class DummyMLModel:
             print(f"❌ ML 모델 로딩 실패: {e}")
             self.model_loaded = False
     
-    def predict_risk_score(self, user_info, mission_type, prediction_hours=24):
-        """위험지수 예측"""
+    @timed('ml.build_feature_matrix')
+    def build_feature_matrix(self, personnel, start_time, prediction_hours=24, weather=None):
+        """ML 모델 입력 설계 행렬 생성 ((인원 × 시간, len(feature_names)))
+        
+        실제 모델 통합 시: self.model.predict(self.build_feature_matrix(...))
+        """
         if not self.model_loaded:
             raise RuntimeError("모델이 로드되지 않았습니다")
         
-        # 사용자 정보 기반 기본 위험도 계산
-        base_risk = 5.0
-        
+        if isinstance(personnel, dict) and not np.ndim(personnel.get('age')):
+            personnel = [personnel]
+        if weather is None and self.weather is not None:
+            weather = self.weather.columns
+        offsets = hour_offsets(start_time, prediction_hours)
+        return self.features.build_design_matrix(normalize_personnel(personnel), offsets, weather)
+    
+    def _base_risk(self, age, service_years):
+        """사용자 정보 기반 기본 위험도 (스칼라/배열 모두 지원)"""
         # 나이 요인 (30세 기준)
-        age_factor = abs(int(user_info['age']) - 30) * 0.05
-        base_risk += min(age_factor, 2.0)
+        age_factor = np.minimum(np.abs(np.asarray(age, dtype=np.int64) - 30) * 0.05, 2.0)
         
         # 경험 요인 (경험이 많을수록 위험 감소)
-        experience_factor = max(0, 3 - int(user_info['service_years'])) * 0.3
-        base_risk += experience_factor
-        
-        # 임무 유형별 위험도
-        mission_risks = {
-            '복합적층장갑': 7.2,
-            '엔진정비': 6.8,
-            '전기계통': 7.5,
-            '유압시스템': 8.1,
-            '무기체계': 8.5
-        }
-        mission_risk = mission_risks.get(mission_type, 7.0)
+        experience_factor = np.maximum(0, 3 - np.asarray(service_years, dtype=np.int64)) * 0.3
         
-        # 시간대별 예측 생성
-        predictions = []
-        current_time = datetime.now()
+        return 5.0 + age_factor + experience_factor
+    
+    def _mission_risk(self, mission_type):
+        """임무 유형별 위험도"""
+        return self.MISSION_RISKS.get(mission_type, self.DEFAULT_MISSION_RISK)
+    
+    @staticmethod
+    def _time_factors(hours_of_day):
+        """시간대별 변동 요인 (배열 연산)"""
+        # 야간/새벽 22~06시 1.2, 정규 근무시간 08~17시 0.9, 그 외 1.0
+        return np.where(
+            (hours_of_day >= 22) | (hours_of_day <= 6), 1.2,
+            np.where((hours_of_day >= 8) & (hours_of_day <= 17), 0.9, 1.0)
+        )
+    
+    @timed('ml.predict_risk_series')
+    def predict_risk_series(self, user_info, mission_type, prediction_hours=24, start_time=None):
+        """위험지수 예측 (벡터화 경로)
         
-        for hour in range(prediction_hours):
-            # 시간대별 변동 요인
-            hour_of_day = (current_time.hour + hour) % 24
-            
-            # 야간/새벽 시간대 위험도 증가
-            if 22 <= hour_of_day or hour_of_day <= 6:
-                time_factor = 1.2
-            elif 8 <= hour_of_day <= 17:  # 정규 근무시간
-                time_factor = 0.9
-            else:
-                time_factor = 1.0
-            
-            # 최종 위험지수 계산
-            final_risk = (base_risk + mission_risk) / 2 * time_factor
-            
-            # 랜덤 변동 추가 (±0.5)
-            final_risk += np.random.uniform(-0.5, 0.5)
-            
-            # 범위 제한 (0~10)
-            final_risk = np.clip(final_risk, 0.0, 10.0)
-            
-            predictions.append({
-                'timestamp': current_time + timedelta(hours=hour),
-                'risk_score': round(final_risk, 1),
-                'hour_of_day': hour_of_day,
-                'risk_level': self.get_risk_level(final_risk)
-            })
+        시간 루프 없이 전체 예측 구간을 배열 단위로 한 번에 계산합니다.
+        반환값은 열(column) 단위 딕셔너리입니다.
+        현재 시각 기준 예측(start_time=None)은 인원/임무/기간별 증분 예측(IncrementalForecast)을 재사용해
+        정시가 바뀌면 새로 드러난 시간만 계산합니다.
+        """
+        if not self.model_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다")
+        
+        if start_time is not None:
+            return self._compute_risk_series(user_info, mission_type, prediction_hours, start_time)
+        
+        return self.incremental_forecast(user_info, mission_type, prediction_hours).series()
+    
+    def incremental_forecast(self, user_info, mission_type, prediction_hours=24):
+        """현재 시각 기준 이동 구간 예측 객체 (같은 인원/임무/기간이면 같은 객체, 최근 사용 순 캐시)"""
+        key = prediction_key('rolling', user_info, mission_type, None, prediction_hours, self.version)
+        return self.cache.get_or_compute(
+            key,
+            lambda: IncrementalForecast(self, user_info, mission_type, prediction_hours),
+            datetime.max
+        )
+    
+    def risk_for_hours(self, user_info, mission_type, hours):
+        """시간 번호(1970-01-01 기준 정시) 배열 → 위험지수 배열 (0~10, 반올림 전)"""
+        count('ml.risk_hours_computed', len(hours))
+        base_risk = self._base_risk(user_info['age'], user_info['service_years'])
+        mission_risk = self._mission_risk(mission_type)
         
-        return predictions
+        # 시간대별 변동 요인
+        time_factors = self._time_factors(np.asarray(hours) % 24)
+        
+        # 최종 위험지수 계산 + 랜덤 변동 (±0.5, 인원/임무/시각별 난수) + 범위 제한 (0~10)
+        final_risk = (base_risk + mission_risk) / 2 * time_factors
+        final_risk += hourly_uniform(STREAM_RISK_SERIES, user_info, mission_type, hours, -0.5, 0.5)
+        np.clip(final_risk, 0.0, 10.0, out=final_risk)
+        return final_risk
+    
+    def _compute_risk_series(self, user_info, mission_type, prediction_hours, current_time):
+        """위험지수 배열 계산 (캐시 미사용)"""
+        count('ml.risk_series_computed')
+        offsets = np.arange(prediction_hours)
+        hours_of_day = (current_time.hour + offsets) % 24
+        final_risk = self.risk_for_hours(user_info, mission_type, hour_numbers(current_time, prediction_hours))
+        
+        series = {
+            'timestamp': np.datetime64(current_time, 'us') + offsets.astype('timedelta64[h]'),
+            'risk_score': np.round(final_risk, 1),
+            'hour_of_day': hours_of_day,
+            'risk_level': self.get_risk_levels(final_risk)
+        }
+        # 캐시된 배열이 호출자에 의해 변경되지 않도록 읽기 전용 처리
+        for values in series.values():
+            values.flags.writeable = False
+        return series
+    
+    def predict_risk_score(self, user_info, mission_type, prediction_hours=24):
+        """위험지수 예측"""
+        series = self.predict_risk_series(user_info, mission_type, prediction_hours)
+        
+        return [
+            {
+                'timestamp': timestamp,
+                'risk_score': risk_score,
+                'hour_of_day': hour_of_day,
+                'risk_level': risk_level
+            }
+            for timestamp, risk_score, hour_of_day, risk_level in zip(
+                series['timestamp'].astype(object),
+                series['risk_score'].tolist(),
+                series['hour_of_day'].tolist(),
+                series['risk_level'].tolist()
+            )
+        ]
     
     def get_risk_level(self, risk_score):
         """위험지수를 등급으로 변환"""
@@ -111,27 +258,190 @@ class DummyMLModel:
         else:
             return '낮음'
     
-    def recommend_safe_missions(self, user_info, available_missions=None):
+    def get_risk_levels(self, risk_scores):
+        """위험지수 배열을 등급 배열로 변환"""
+        return np.select(
+            [risk_scores >= 8.0, risk_scores >= 6.0],
+            ['높음', '보통'],
+            default='낮음'
+        )
+    
+    @timed('ml.predict_batch')
+    def predict_batch(self, personnel, missions, prediction_hours=24, start_time=None, as_frame=True):
+        """인원 × 임무 × 시간 일괄 위험지수 예측
+        
+        personnel: DataFrame, 구조화 배열, 딕셔너리 리스트 또는 열 딕셔너리
+                   (gender, age, service_years 필수 / name 선택)
+        missions: 임무 이름 리스트 (중복 불가)
+        
+        중첩 루프 없이 브로드캐스팅으로 (인원, 임무, 시간) 배열을 한 번에 계산합니다.
+        as_frame=True 이면 long 형식 DataFrame, False 이면 3차원 배열 딕셔너리를 반환합니다.
+        """
+        if not self.model_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다")
+        
+        columns = normalize_personnel(personnel)
+        missions = check_missions(missions)
+        current_time = datetime.now() if start_time is None else start_time
+        n_people, n_missions = len(columns['age']), len(missions)
+        count('ml.batch_rows', n_people * n_missions * prediction_hours)
+        
+        # (인원,) / (임무,) / (시간,) 축별 요인
+        base_risk = self._base_risk(columns['age'], columns['service_years'])
+        mission_risk = np.array([self._mission_risk(m) for m in missions])
+        offsets = np.arange(prediction_hours)
+        hours_of_day = (current_time.hour + offsets) % 24
+        time_factors = self._time_factors(hours_of_day)
+        
+        # (인원, 임무, 시간) 브로드캐스팅 계산
+        final_risk = (base_risk[:, None, None] + mission_risk[None, :, None]) / 2 * time_factors[None, None, :]
+        # 변동은 (인원, 임무, 시각)별 카운터 난수 → 함께 묶인 인원과 관계없이 predict_risk_series 와 같은 값
+        final_risk += hourly_uniforms(STREAM_RISK_SERIES, columns, missions,
+                                      hour_numbers(current_time, prediction_hours), -0.5, 0.5)
+        np.clip(final_risk, 0.0, 10.0, out=final_risk)
+        
+        result = {
+            'timestamp': np.datetime64(current_time, 'us') + offsets.astype('timedelta64[h]'),
+            'hour_of_day': hours_of_day,
+            'missions': missions,
+            'risk_score': np.round(final_risk, 1),
+            'risk_level': self.get_risk_levels(final_risk)
+        }
+        if not as_frame:
+            return result
+        
+        import pandas as pd
+        
+        # long 형식 (인원 → 임무 → 시간 순) 열 구성
+        shape = final_risk.shape
+        person_idx = np.repeat(np.arange(n_people), n_missions * prediction_hours)
+        frame = {'person': person_idx}
+        if 'name' in columns:
+            frame['name'] = columns['name'][person_idx]
+        frame.update({
+            'gender': columns['gender'][person_idx],
+            'age': columns['age'][person_idx],
+            'service_years': columns['service_years'][person_idx],
+            'mission': pd.Categorical.from_codes(
+                np.broadcast_to(np.arange(n_missions)[None, :, None], shape).ravel(),
+                categories=missions),
+            'timestamp': np.tile(result['timestamp'], n_people * n_missions),
+            'hour_of_day': np.tile(hours_of_day, n_people * n_missions),
+            'risk_score': result['risk_score'].ravel(),
+            'risk_level': pd.Categorical.from_codes(
+                (final_risk >= 6.0).ravel().astype(np.int8) + (final_risk >= 8.0).ravel(),
+                categories=['낮음', '보통', '높음'])
+        })
+        return pd.DataFrame(frame)
+    
+    @timed('ml.score_missions')
+    def score_missions(self, personnel, missions, horizon=1, aggregate='mean', start_time=None):
+        """인원 × 임무 위험지수 행렬 계산
+        
+        horizon 시간 동안의 시간대 요인을 먼저 평균/최대로 집계(O(시간))한 뒤
+        (인원, 임무) 행렬 한 번으로 점수를 계산하므로 비용이 임무 × 시간으로 늘어나지 않습니다.
+        horizon=1 이면 1시간 예측(predict_risk_score(..., 1))과 같은 값입니다.
+        """
+        if not self.model_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다")
+        if aggregate not in ('mean', 'max'):
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {aggregate}")
+        if horizon < 1:
+            raise ValueError(f"집계 구간은 1시간 이상이어야 합니다: {horizon}")
+        
+        columns = normalize_personnel(personnel)
+        missions = check_missions(missions)
+        current_time = datetime.now() if start_time is None else start_time
+        
+        # 근무 구간 시간대 요인 집계
+        hours_of_day = (current_time.hour + np.arange(horizon)) % 24
+        time_factors = self._time_factors(hours_of_day)
+        time_factor = time_factors.mean() if aggregate == 'mean' else time_factors.max()
+        
+        base_risk = self._base_risk(columns['age'], columns['service_years'])
+        mission_risk = np.array([self._mission_risk(m) for m in missions])
+        
+        scores = (base_risk[:, None] + mission_risk[None, :]) / 2 * time_factor
+        # 시작 시각의 (인원, 임무)별 변동 (predict_risk_series 첫 시간과 같은 난수)
+        scores += hourly_uniforms(STREAM_RISK_SERIES, columns, missions,
+                                  hour_numbers(current_time, 1), -0.5, 0.5)[:, :, 0]
+        np.clip(scores, 0.0, 10.0, out=scores)
+        return np.round(scores, 1)
+    
+    @staticmethod
+    def top_k_missions(scores, top_k=None):
+        """위험지수 낮은 순 상위 k개 임무 인덱스 (부분 정렬)"""
+        n_missions = scores.shape[1]
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"추천 개수는 0 이상이어야 합니다: {top_k}")
+        if top_k is None or top_k >= n_missions:
+            return np.argsort(scores, axis=1, kind='stable')
+        if top_k == 0:
+            return np.empty((scores.shape[0], 0), dtype=np.intp)
+        
+        # argpartition으로 k개만 골라낸 뒤 그 안에서만 정렬
+        candidates = np.argpartition(scores, top_k - 1, axis=1)[:, :top_k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(candidate_scores, axis=1, kind='stable')
+        return np.take_along_axis(candidates, order, axis=1)
+    
+    @timed('ml.recommend_safe_missions')
+    def recommend_safe_missions(self, user_info, available_missions=None, top_k=None,
+                                horizon=1, aggregate='mean'):
         """안전한 임무 추천"""
         if available_missions is None:
-            available_missions = ['복합적층장갑', '엔진정비', '전기계통', '유압시스템']
+            available_missions = self.DEFAULT_AVAILABLE_MISSIONS
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"추천 개수는 0 이상이어야 합니다: {top_k}")
+        if horizon < 1:
+            raise ValueError(f"집계 구간은 1시간 이상이어야 합니다: {horizon}")
+        available_missions = check_missions(available_missions)
         
-        mission_scores = {}
-        for mission in available_missions:
-            predictions = self.predict_risk_score(user_info, mission, 1)
-            mission_scores[mission] = predictions[0]['risk_score']
+        start_hour = floor_hour(datetime.now())
+        key = prediction_key('recommend', user_info, tuple(available_missions), start_hour, horizon,
+                             self.version, top_k, aggregate)
         
-        # 위험지수 낮은 순으로 정렬
-        recommended = sorted(mission_scores.items(), key=lambda x: x[1])
+        def compute():
+            scores = self.score_missions([user_info], available_missions, horizon, aggregate)
+            ranked = self.top_k_missions(scores, top_k)[0]
+            return [
+                {
+                    'mission': available_missions[idx],
+                    'risk_score': float(scores[0, idx]),
+                    'recommendation': f'위험지수 {scores[0, idx]} - {self.get_risk_level(scores[0, idx])}'
+                }
+                for idx in ranked
+            ]
         
-        return [
-            {
-                'mission': mission,
-                'risk_score': score,
-                'recommendation': f'위험지수 {score} - {self.get_risk_level(score)}'
-            }
-            for mission, score in recommended
-        ]
+        recommended = self.cache.get_or_compute(key, compute, self.cache.expiry_for(start_hour))
+        return [dict(item) for item in recommended]
+    
+    @timed('ml.recommend_safe_missions_batch')
+    def recommend_safe_missions_batch(self, personnel, available_missions=None, top_k=None,
+                                      horizon=1, aggregate='mean'):
+        """여러 인원의 안전한 임무 일괄 추천 (long 형식 DataFrame)"""
+        import pandas as pd
+        
+        if available_missions is None:
+            available_missions = self.DEFAULT_AVAILABLE_MISSIONS
+        available_missions = check_missions(available_missions)
+        
+        columns = normalize_personnel(personnel)
+        scores = self.score_missions(columns, available_missions, horizon, aggregate)
+        ranked = self.top_k_missions(scores, top_k)
+        ranked_scores = np.take_along_axis(scores, ranked, axis=1)
+        n_people, k = ranked.shape
+        
+        frame = {'person': np.repeat(np.arange(n_people), k)}
+        if 'name' in columns:
+            frame['name'] = np.repeat(columns['name'], k)
+        frame.update({
+            'rank': np.tile(np.arange(1, k + 1), n_people),
+            'mission': pd.Categorical.from_codes(ranked.ravel(), categories=available_missions),
+            'risk_score': ranked_scores.ravel(),
+            'risk_level': self.get_risk_levels(ranked_scores.ravel())
+        })
+        return pd.DataFrame(frame)
 
 class DummyDLModel:
     """딥러닝 모델 더미 구현"""
@@ -139,15 +449,36 @@ class DummyDLModel:
     def __init__(self):
         self.model_loaded = False
         self.vocab_size = 5000
+        self.version = '1.0'
+        self.cache = PredictionCache(maxsize=256)
+        # CPU 추론 백엔드 설정 (설정 창에서 변경, 학습된 모델 파일이 있을 때만 사용)
+        self.backend = None
+        self.backend_mode = DEFAULT_BACKEND
+        self.backend_threads = None
         self.load_model()
     
+    @timed('dl.load_model')
     def load_model(self):
         """모델 로딩 시뮬레이션"""
         try:
             # 실제 구현에서는 다음과 같이 로드:
-            # import torch
+            # import torch  # DL 모드 선택 시에만 로드되므로 여기서 지연 임포트
             # self.model = torch.load('neural_safety_model.pth')
-            # self.vocab = pickle.load(open('neural_vocab.pkl', 'rb'))
+            
+            # 어휘 사전: 압축 파일(neural_vocab.vocab)이 있고 pickle 보다 새로우면 메모리 매핑, 아니면 pickle
+            self.vocab = load_vocab(MODELS_DIR)
+            if self.vocab is not None:
+                self.vocab_size = self.vocab['vocab_size']
+            
+            # 위험 키워드 후보 인덱스 (로딩 시 한 번만 생성)
+            self.keyword_index = KeywordIndex()
+            
+            # 학습된 DL 모델 파일이 있으면 CPU 추론 백엔드 (PyTorch 가 없거나 파일이 없으면 키워드 인덱스 사용)
+            self.backend = load_backend(MODELS_DIR / DL_CHECKPOINT, self.keyword_index,
+                                        self.backend_mode, self.backend_threads)
+            
+            # 안전대책 검색 색인 (저장된 색인이 있으면 메모리 매핑, 없으면 내장 대책으로 생성 후 저장)
+            self.measure_index = MeasureIndex.load_or_build(MODELS_DIR / MEASURE_INDEX_DIRNAME)
             
             print("✅ DL 모델 로딩 완료 (더미)")
             self.model_loaded = True
@@ -156,144 +487,163 @@ class DummyDLModel:
             print(f"❌ DL 모델 로딩 실패: {e}")
             self.model_loaded = False
     
-    def generate_risk_keywords(self, user_info, mission_type, num_keywords=10):
-        """위험 키워드 생성"""
+    def predict_risk_score(self, user_info, mission_type, start_hour):
+        """DL 위험지수 (인원/임무/시작 정시별 고정값, GUI 와 일괄 보고서 공통)"""
         if not self.model_loaded:
             raise RuntimeError("DL 모델이 로드되지 않았습니다")
+        rng = request_rng(STREAM_DL_RISK, user_info, mission_type, start_hour)
+        return float(rng.uniform(6.0, 9.0))
+    
+    @timed('dl.generate_risk_keywords')
+    def generate_risk_keywords(self, user_info, mission_type, num_keywords=10, seed=None):
+        """위험 키워드 생성 (시작 정시가 지날 때까지 캐시)
         
-        # 임무별 기본 키워드
-        base_keywords = {
-            '복합적층장갑': [
-                '적층 작업 위험', '접착제 화학 노출', '고온 경화 과정',
-                '압력기 사용 주의', '환기 불량', '화재 위험'
-            ],
-            '엔진정비': [
-                '엔진 고온부 접촉', '연료 누출', '회전체 끼임',
-                '오일 미끄러짐', '배기가스 흡입', '전기 쇼트'
-            ],
-            '전기계통': [
-                '감전 위험', '누전 화재', '고압 전류',
-                '절연 불량', '접지 미흡', '전선 손상'
-            ],
-            '유압시스템': [
-                '고압 유체 분사', '유압 호스 파열', '오일 누출',
-                '압력 용기 폭발', '미끄러짐 사고', '화상 위험'
-            ],
-            '무기체계': [
-                '폭발물 취급', '화약 화재', '기계적 충격',
-                '금속 파편', '소음 피해', '독성 가스'
-            ]
-        }
+        seed 를 생략하면 인원/임무/시작 정시로 시드를 만들므로 같은 시간대에는 같은 결과입니다.
+        """
+        if not self.model_loaded:
+            raise RuntimeError("DL 모델이 로드되지 않았습니다")
         
-        # 공통 안전 키워드
-        common_keywords = [
-            '개인보호구 미착용', '작업 절차 미준수', '안전교육 부족',
-            '피로 누적', '주의력 분산', '응급상황 대응',
-            '동료와의 소통 부족', '장비 점검 미흡', '환경 요인'
-        ]
+        num_keywords = check_num_keywords(num_keywords)
+        if seed is not None:
+            return self._generate_risk_keywords(user_info, mission_type, num_keywords, seed)
         
-        # 개인 특성 기반 키워드 추가
-        personal_keywords = []
-        age = int(user_info['age'])
-        service_years = int(user_info['service_years'])
+        start_hour = floor_hour(datetime.now())
+        key = prediction_key('keywords', user_info, mission_type, start_hour, num_keywords, self.version)
+        keywords = self.cache.get_or_compute(
+            key,
+            lambda: self._generate_risk_keywords(
+                user_info, mission_type, num_keywords, keyword_seed(user_info, mission_type, start_hour)),
+            self.cache.expiry_for(start_hour)
+        )
+        return list(keywords)
+    
+    def _generate_risk_keywords(self, user_info, mission_type, num_keywords, seed):
+        """위험 키워드 생성 (캐시 미사용)"""
+        if num_keywords == 0:
+            return []
+        if self.backend is not None:
+            return self.backend.generate_keywords(normalize_personnel([user_info]), [mission_type], num_keywords)[0]
+        return self.keyword_index.select(
+            self.keyword_index.mission_rows([mission_type]),
+            [int(user_info['age'])], [int(user_info['service_years'])], [seed], num_keywords
+        )[0]
+    
+    @timed('dl.generate_risk_keywords_batch')
+    def generate_risk_keywords_batch(self, personnel, missions, num_keywords=10, start_time=None):
+        """여러 인원 위험 키워드 일괄 생성
         
-        if age >= 50:
-            personal_keywords.extend(['신체 기능 저하', '반응속도 지연'])
-        elif age <= 25:
-            personal_keywords.extend(['경험 부족', '과신 위험'])
-            
-        if service_years <= 2:
-            personal_keywords.extend(['숙련도 부족', '절차 미숙지'])
-        elif service_years >= 15:
-            personal_keywords.extend(['관습적 작업', '안전 불감증'])
+        personnel: DataFrame, 딕셔너리 리스트 등 (gender, age, service_years 필수)
+        missions: 모든 인원에 같은 임무 이름, 또는 인원별 임무 리스트
+        반환: 인원 순서대로 키워드 리스트의 리스트 (generate_risk_keywords 와 같은 결과)
+        """
+        if not self.model_loaded:
+            raise RuntimeError("DL 모델이 로드되지 않았습니다")
         
-        # 키워드 조합 및 순위 부여
-        mission_keywords = base_keywords.get(mission_type, common_keywords[:6])
-        all_keywords = mission_keywords + common_keywords + personal_keywords
+        columns = normalize_personnel(personnel)
+        n_people = len(columns['age'])
+        if isinstance(missions, str):
+            missions = [missions] * n_people
+        missions = list(missions)
+        if len(missions) != n_people:
+            raise ValueError(f"임무 수({len(missions)})와 인원 수({n_people})가 다릅니다")
         
-        # 중복 제거 및 랜덤 셔플
-        unique_keywords = list(set(all_keywords))
-        random.shuffle(unique_keywords)
+        count('dl.keyword_rows', n_people)
+        num_keywords = check_num_keywords(num_keywords)
+        if num_keywords == 0:
+            return [[] for _ in range(n_people)]
+        if self.backend is not None:
+            return self.backend.generate_keywords(columns, missions, num_keywords)
         
-        return unique_keywords[:num_keywords]
+        start_hour = floor_hour(start_time or datetime.now())
+        seeds = keyword_seeds(columns['gender'], columns['age'], columns['service_years'], missions, start_hour)
+        return self.keyword_index.select(
+            self.keyword_index.mission_rows(missions), columns['age'], columns['service_years'], seeds, num_keywords
+        )
+    
+    def configure_backend(self, mode=DEFAULT_BACKEND, threads=None):
+        """CPU 추론 백엔드 변경 (양자화 / 스레드 수), 백엔드 사용 여부 반환"""
+        if mode not in BACKEND_MODES:
+            raise ValueError(f"지원하지 않는 DL 추론 백엔드입니다: {mode}")
+        self.backend_mode = mode
+        self.backend_threads = threads or None
+        if self.model_loaded:
+            self.backend = load_backend(MODELS_DIR / DL_CHECKPOINT, self.keyword_index, mode, self.backend_threads)
+            self.cache.clear()  # 이전 백엔드로 만든 키워드 캐시 무효화
+        return self.backend is not None
+    
+    def backend_status(self):
+        """현재 키워드 생성 방식 (설정 창 / 보고서 표시용)"""
+        if self.backend is None:
+            return '키워드 인덱스 (DL 모델 파일 없음)'
+        return f"{BACKEND_MODES[self.backend.mode]}, 스레드 {self.backend.threads}개"
     
     def generate_risk_analysis(self, user_info, mission_type, keywords):
         """위험요인 자연어 분석"""
-        name = user_info['name']
-        age = user_info['age']
-        mission = mission_type
+        return self.generate_risk_analysis_batch([user_info], [mission_type], [keywords])[0]
+    
+    @timed('dl.generate_risk_analysis_batch')
+    def generate_risk_analysis_batch(self, personnel, missions, keywords_list):
+        """여러 인원 위험 분석 텍스트 일괄 생성 (컴파일된 템플릿에 열 단위로 채움)
         
-        analysis = f"""🔍 {name}님의 {mission} 임무 위험 분석:
-
-현재 {age}세 {name}님이 {mission} 작업을 수행할 때 예상되는 주요 위험요인들을 AI가 분석한 결과입니다.
-
-주요 위험 포인트:
-• {keywords[0]}: 가장 높은 주의가 필요한 영역
-• {keywords[1]}: 작업 중 지속적인 모니터링 필요  
-• {keywords[2]}: 사전 준비 및 점검 강화 필요
-
-개인 맞춤 주의사항:
-작업 경험과 개인 특성을 고려할 때, 특히 안전 절차 준수와 개인보호구 착용이 중요합니다. 
-동료와의 원활한 소통을 통해 위험 상황을 사전에 예방하시기 바랍니다."""
-
-        return analysis
+        personnel: DataFrame, 딕셔너리 리스트 등 (name, gender, age, service_years)
+        missions: 모든 인원에 같은 임무 이름, 또는 인원별 임무 리스트
+        keywords_list: 인원별 위험 키워드 리스트 (상위 3개 사용)
+        """
+        columns = normalize_personnel(personnel)
+        keywords_list = list(keywords_list)
+        return RISK_ANALYSIS.render_many(
+            name=columns['name'].tolist(),
+            age=columns['age'].tolist(),
+            mission=missions if isinstance(missions, str) else list(missions),
+            keyword1=[keywords[0] for keywords in keywords_list],
+            keyword2=[keywords[1] for keywords in keywords_list],
+            keyword3=[keywords[2] for keywords in keywords_list]
+        )
     
     def recommend_safety_measures(self, user_info, mission_type, keywords, num_measures=5):
-        """AI 안전대책 추천"""
-        name = user_info['name']
-        mission = mission_type
-        
-        # 기본 안전대책 템플릿
-        base_measures = [
-            "개인보호구 완전 착용 (안전모, 보호안경, 작업복, 안전화)",
-            "작업 전 안전점검 체크리스트 100% 준수",
-            "2인 1조 작업 시스템으로 상호 안전 확인",
-            "1시간마다 10분 휴식으로 피로도 관리",
-            "응급상황 대응 절차 숙지 및 비상연락망 확인"
-        ]
-        
-        # 임무별 특화 안전대책
-        mission_measures = {
-            '복합적층장갑': [
-                "작업장 환기 시설 가동 및 공기 질 모니터링",
-                "접착제 사용 시 방독마스크 착용 필수",
-                "고온 장비 주변 화상 방지 조치"
-            ],
-            '엔진정비': [
-                "연료 누출 감지 장비 점검 후 작업 시작",
-                "회전 부품 작업 시 느슨한 의복 착용 금지", 
-                "엔진 냉각 후 정비 작업 실시"
-            ],
-            '전기계통': [
-                "전원 차단 후 검전기로 무전압 확인",
-                "절연 장갑 및 절연 공구 사용",
-                "습도가 높은 날 작업 시 특별 주의"
-            ]
-        }
-        
-        # 개인 맞춤 안전대책
-        personal_measures = []
-        age = int(user_info['age'])
-        
-        if age >= 45:
-            personal_measures.append("작업 중 충분한 조명 확보로 시야 확보")
-        if int(user_info['service_years']) <= 3:
-            personal_measures.append("숙련자의 지도 하에 작업 수행")
+        """AI 안전대책 추천 (위험 키워드 + 임무로 안전대책 색인 BM25 검색)"""
+        return self.recommend_safety_measures_batch([user_info], [mission_type], [keywords], num_measures)[0]
+    
+    @timed('dl.recommend_safety_measures_batch')
+    def recommend_safety_measures_batch(self, personnel, missions, keywords_list, num_measures=5):
+        """여러 인원 안전대책 일괄 추천
         
-        # 조합 및 선별
-        all_measures = base_measures.copy()
-        if mission in mission_measures:
-            all_measures.extend(mission_measures[mission])
-        all_measures.extend(personal_measures)
+        personnel: DataFrame, 딕셔너리 리스트 등 (name, age, service_years)
+        missions: 모든 인원에 같은 임무 이름, 또는 인원별 임무 리스트
+        keywords_list: 인원별 위험 키워드 리스트
+        반환: 인원 순서대로 recommend_safety_measures 결과 딕셔너리 리스트
+        """
+        columns = normalize_personnel(personnel)
+        n_people = len(columns['age'])
+        if isinstance(missions, str):
+            missions = [missions] * n_people
+        missions = list(missions)
+        keywords_list = [list(keywords) for keywords in keywords_list]
+        if not len(missions) == len(keywords_list) == n_people:
+            raise ValueError(f"임무 수({len(missions)}), 키워드 목록 수({len(keywords_list)})와 "
+                             f"인원 수({n_people})가 다릅니다")
         
-        # 상위 N개 선택
-        selected_measures = all_measures[:num_measures]
+        # 위험 유형 사전으로 키워드 → 위험 유형 행렬 (우선순위 판정과 대책 순위에 함께 사용)
+        hazards = self.measure_index.lexicon.vectors(keywords_list)
+        priorities = self.measure_index.lexicon.priorities(hazards)
+        # 개인 특성(고령, 저근속)은 추가 질의어로 반영, 결과가 부족하면 기본 안전대책으로 채움
+        extra_terms = [
+            personal_terms({'age': age, 'service_years': service_years})
+            for age, service_years in zip(columns['age'].tolist(), columns['service_years'].tolist())
+        ]
+        results = self.measure_index.search_batch(keywords_list, missions, num_measures, extra_terms, hazards)
+        count('dl.measure_rows', n_people)
         
-        return {
-            'measures': selected_measures,
-            'summary': f"{name}님의 {mission} 작업을 위한 맞춤형 안전대책 {len(selected_measures)}가지",
-            'priority_level': '높음' if any(keyword in ['폭발', '화재', '감전'] for keyword in keywords) else '보통'
-        }
+        names = columns['name'].tolist()
+        recommendations = []
+        for name, mission, found, priority in zip(names, missions, results, priorities):
+            selected_measures = [self.measure_index.text(doc_id) for doc_id, _ in found]
+            recommendations.append({
+                'measures': selected_measures,
+                'summary': f"{name}님의 {mission} 작업을 위한 맞춤형 안전대책 {len(selected_measures)}가지",
+                'priority_level': priority
+            })
+        return recommendations
 
 def create_dummy_model_files():
     """더미 모델 파일들 생성 (테스트용)"""
@@ -312,19 +662,13 @@ def create_dummy_model_files():
         pickle.dump(dummy_ml_model, f)
     
     # 더미 인코더
-    dummy_encoders = {
-        'gender_encoder': {'남성': 0, '여성': 1},
-        'weather_encoder': {'맑음': 0, '흐림': 1, '비': 2, '눈': 3}
-    }
+    dummy_encoders = DEFAULT_ENCODERS
     
     with open(models_dir / 'enhanced_encoders.pkl', 'wb') as f:
         pickle.dump(dummy_encoders, f)
     
     # 더미 스케일러
-    dummy_scaler = {
-        'mean': [0.5, 35.0, 8.5, 20.0, 6.5, 3.2, 12.0],
-        'std': [0.5, 12.0, 5.2, 8.0, 3.5, 1.8, 6.5]
-    }
+    dummy_scaler = DEFAULT_SCALER
     
     with open(models_dir / 'enhanced_scaler.pkl', 'wb') as f:
         pickle.dump(dummy_scaler, f)
@@ -339,9 +683,12 @@ def create_dummy_model_files():
     with open(models_dir / 'neural_vocab.pkl', 'wb') as f:
         pickle.dump(dummy_vocab, f)
     
+    # 메모리 매핑 압축 어휘 (모델 로딩 시 pickle 대신 사용)
+    write_vocab(models_dir / VOCAB_FILENAME, dummy_vocab['word_to_idx'])
+    
     print("✅ 더미 모델 파일들이 models/ 폴더에 생성되었습니다.")
     print("📁 생성된 파일들:")
-    for file_path in models_dir.glob("*.pkl"):
+    for file_path in sorted(models_dir.glob("*.pkl")) + [models_dir / VOCAB_FILENAME]:
         print(f"   - {file_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ML 특징 벡터 룩업 테이블
+
+enhanced_encoders.pkl / enhanced_scaler.pkl 을 로딩 시 한 번만 NumPy 룩업 배열로 변환합니다.
+2025년 8월~12월 전체 기간(3,672시간)의 월/요일/시간 특징을 미리 스케일링해 두므로
+설계 행렬(design matrix) 생성은 행 단위 딕셔너리 조회 없이 인덱스 gather 로 끝납니다.
+"""
+
+import pickle
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# 예측 대상 기간 (2025-08-01 00시 ~ 2025-12-31 23시)
+PERIOD_START = datetime(2025, 8, 1)
+PERIOD_HOURS = 3672
+
+# 설계 행렬 열 순서 (DummyMLModel.feature_names 와 동일)
+FEATURE_NAMES = [
+    'gender_encoded', 'age', 'service_years',
+    'weather_temp', 'weather_humidity', 'weather_condition',
+    'month', 'weekday', 'hour'
+]
+
+# 스케일러 통계 순서 (enhanced_safety_model.pkl 의 features)
+SCALER_FEATURES = ['gender', 'age', 'service_years', 'weather', 'month', 'weekday', 'hour']
+
+DEFAULT_ENCODERS = {
+    'gender_encoder': {'남성': 0, '여성': 1},
+    'weather_encoder': {'맑음': 0, '흐림': 1, '비': 2, '눈': 3}
+}
+
+DEFAULT_SCALER = {
+    'mean': [0.5, 35.0, 8.5, 20.0, 6.5, 3.2, 12.0],
+    'std': [0.5, 12.0, 5.2, 8.0, 3.5, 1.8, 6.5]
+}
+
+# 정수 특징 룩업 범위
+MAX_AGE = 100
+MAX_SERVICE_YEARS = 60
+
+
+def hour_offsets(start_time, prediction_hours):
+    """예측 시작 시각 기준 기간 내 시간 오프셋 배열 (2025-08-01 00시 = 0)"""
+    start = int((start_time - PERIOD_START) // timedelta(hours=1))
+    if start < 0 or start + prediction_hours > PERIOD_HOURS:
+        raise ValueError(
+            f"예측 구간이 기간(2025-08-01 ~ 2025-12-31)을 벗어났습니다: {start_time}, {prediction_hours}시간")
+    return np.arange(start, start + prediction_hours)
+
+
+class FeatureTables:
+    """인코더/스케일러 기반 특징 룩업 테이블"""
+
+    def __init__(self, encoders=None, scaler=None):
+        encoders = encoders or DEFAULT_ENCODERS
+        scaler = scaler or DEFAULT_SCALER
+        mean = np.asarray(scaler['mean'], dtype=np.float64)
+        std = np.asarray(scaler['std'], dtype=np.float64)
+        self.mean = dict(zip(SCALER_FEATURES, mean))
+        self.std = dict(zip(SCALER_FEATURES, std))
+
+        # 범주형 인코더: 문자열 → 코드 (스케일 적용 값은 코드 인덱스 룩업)
+        self.gender_codes = dict(encoders['gender_encoder'])
+        self.weather_codes = dict(encoders['weather_encoder'])
+        gender_values = np.zeros(max(self.gender_codes.values()) + 1)
+        for code in self.gender_codes.values():
+            gender_values[code] = code
+        self.gender_table = self._scale('gender', gender_values)
+
+        # 정수 특징 룩업 (나이, 근속연수)
+        self.age_table = self._scale('age', np.arange(MAX_AGE + 1, dtype=np.float64))
+        self.service_table = self._scale('service_years', np.arange(MAX_SERVICE_YEARS + 1, dtype=np.float64))
+
+        # 전체 기간 달력 특징 (PERIOD_HOURS × 3: month, weekday, hour)
+        timestamps = np.datetime64(PERIOD_START, 'h') + np.arange(PERIOD_HOURS)
+        days = timestamps.astype('datetime64[D]')
+        months = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 = 목요일(3)
+        hours = np.arange(PERIOD_HOURS) % 24
+        self.calendar = np.column_stack([
+            self._scale('month', months),
+            self._scale('weekday', weekdays),
+            self._scale('hour', hours)
+        ])
+
+    @classmethod
+    def load(cls, models_dir):
+        """models/ 폴더의 인코더/스케일러 파일로 테이블 생성 (없으면 기본값)"""
+        models_dir = Path(models_dir)
+        encoders = scaler = None
+        encoders_path = models_dir / 'enhanced_encoders.pkl'
+        scaler_path = models_dir / 'enhanced_scaler.pkl'
+        if encoders_path.exists():
+            with open(encoders_path, 'rb') as f:
+                encoders = pickle.load(f)
+        if scaler_path.exists():
+            with open(scaler_path, 'rb') as f:
+                scaler = pickle.load(f)
+        return cls(encoders, scaler)
+
+    def _scale(self, feature, values):
+        """표준화 (값 - 평균) / 표준편차"""
+        return (np.asarray(values, dtype=np.float64) - self.mean[feature]) / self.std[feature]
+
+    def encode_gender(self, genders):
+        """성별 문자열 배열 → 코드 배열"""
+        try:
+            return np.array([self.gender_codes[g] for g in np.atleast_1d(genders)], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"알 수 없는 성별 값입니다: {e.args[0]}") from None
+
+    @staticmethod
+    def _lookup(table, values, label):
+        """정수 특징 룩업 (표 범위 0 ~ len(table)-1 밖의 값은 음수 인덱스로 감기지 않도록 거부)"""
+        values = np.asarray(values, dtype=np.int64)
+        invalid = (values < 0) | (values >= len(table))
+        if invalid.any():
+            raise ValueError(f"{label} 값이 범위(0~{len(table) - 1})를 벗어났습니다: {values[invalid][0]}")
+        return table[values]
+
+    def encode_weather(self, conditions):
+        """날씨 문자열 배열 → 코드 배열 (알 수 없는 값은 -1)"""
+        lookup = np.vectorize(lambda c: self.weather_codes.get(c, -1), otypes=[np.int64])
+        return lookup(np.atleast_1d(conditions))
+
+    def build_design_matrix(self, columns, offsets, weather=None):
+        """(인원 × 시간, 9) 설계 행렬 생성
+
+        columns: normalize_personnel() 결과 (gender, age, service_years 배열)
+        offsets: 기간 내 시간 오프셋 배열 (hour_offsets() 결과)
+        weather: 기간 전체 길이의 'weather_temp' / 'weather_humidity' / 'weather_condition' 배열
+                 딕셔너리 (WeatherStore.columns, 없으면 평균값 0, 습도 0, 맑음으로 채움)
+        """
+        gender = self.gender_table[self.encode_gender(columns['gender'])]
+        age = self._lookup(self.age_table, columns['age'], '나이')
+        service = self._lookup(self.service_table, columns['service_years'], '근속연수')
+        n_people, n_hours = len(gender), len(offsets)
+
+        matrix = np.zeros((n_people, n_hours, len(FEATURE_NAMES)))
+        matrix[:, :, 0] = gender[:, None]
+        matrix[:, :, 1] = age[:, None]
+        matrix[:, :, 2] = service[:, None]
+        if weather is not None:
+            # 결측 시간은 평균 기온(스케일 0), 습도 0, 맑음(0) 처리
+            matrix[:, :, 3] = np.nan_to_num(self._scale('weather', weather['weather_temp'][offsets]))
+            matrix[:, :, 4] = np.nan_to_num(weather['weather_humidity'][offsets])
+            matrix[:, :, 5] = np.maximum(weather['weather_condition'][offsets], 0)
+        matrix[:, :, 6:] = self.calendar[offsets]
+
+        return matrix.reshape(n_people * n_hours, len(FEATURE_NAMES))
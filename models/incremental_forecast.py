@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+이동 구간 증분 예측 (링 버퍼)
+
+현재 시각 기준 예측은 정시가 바뀔 때마다 구간이 한 시간씩 밀립니다.
+전체 구간(168 / 3,672시간)을 다시 계산하지 않고, 계산한 시간대별 값을 링 버퍼에 보관해 두었다가
+지난 시간은 버리고 새로 드러난 시간(과 invalidate 로 표시한 입력이 바뀐 시간)만 계산합니다.
+갱신 비용은 예측 기간이 아니라 새 시간 수에 비례합니다.
+
+시간별 위험지수는 절대 시각만으로 정해지므로(random_streams.hourly_uniform) 증분 결과는 전체 재계산과 같습니다.
+
+사용법:
+    forecast = IncrementalForecast(ml_model, user_info, '엔진정비', prediction_hours=168)
+    series = forecast.series()          # 첫 호출은 168시간 계산, 이후 정시가 지날 때마다 새 시간만 계산
+    forecast.invalidate(start, end)     # 해당 시간대 입력(기상 등)이 바뀐 경우 다음 갱신 때 다시 계산
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from models.prediction_cache import floor_hour, prediction_key
+    from models.random_streams import hour_numbers
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from prediction_cache import floor_hour, prediction_key
+    from random_streams import hour_numbers
+
+
+class IncrementalForecast:
+    """인원 한 명 × 임무의 이동 구간 위험지수 예측 (스레드 안전)
+
+    model: risk_for_hours(user_info, mission_type, hours) 와 get_risk_levels 를 제공하는 ML 모델
+    """
+
+    def __init__(self, model, user_info, mission_type, prediction_hours=24, clock=datetime.now):
+        if prediction_hours < 1:
+            raise ValueError(f"예측 기간은 1시간 이상이어야 합니다: {prediction_hours}")
+        self.model = model
+        self.prediction_hours = prediction_hours
+        self.clock = clock
+        self.user_info = dict(user_info)
+        self.mission_type = mission_type
+        self._lock = threading.Lock()
+
+        # 링 버퍼 (슬롯 = 시간 번호 % 예측 기간, 구간 첫 시간은 _head 슬롯)
+        self._score = np.zeros(prediction_hours)
+        self._level = np.empty(prediction_hours, dtype='<U2')
+        self._valid = np.zeros(prediction_hours, dtype=bool)
+        self._start = None      # 구간 첫 시간 번호
+        self._head = 0
+        self._offsets = np.arange(prediction_hours)
+        self._inputs = self._input_key()
+        self._series = None     # 마지막 series() 결과 (갱신할 시간이 없으면 시각 열만 바꿔 재사용)
+        self._series_time = None
+
+        self.refreshes = 0
+        self.computed_hours = 0
+
+    def _input_key(self):
+        """전체 재계산이 필요한 입력 (인원 정보, 임무, 모델 버전)"""
+        return prediction_key('rolling', self.user_info, self.mission_type, None, self.prediction_hours,
+                              getattr(self.model, 'version', None))
+
+    def update_inputs(self, user_info=None, mission_type=None):
+        """인원 정보 / 임무 변경 (값이 실제로 바뀐 경우에만 다음 갱신 때 전체 재계산)"""
+        with self._lock:
+            if user_info is not None:
+                self.user_info = dict(user_info)
+            if mission_type is not None:
+                self.mission_type = mission_type
+            inputs = self._input_key()
+            if inputs != self._inputs:
+                self._inputs = inputs
+                self._valid[:] = False
+
+    def invalidate(self, start=None, end=None):
+        """[start, end) 시간대를 다시 계산하도록 표시 (생략 시 구간 전체)"""
+        with self._lock:
+            if self._start is None:
+                return
+            first = self._start if start is None else max(int(hour_numbers(start)), self._start)
+            last = self._start + self.prediction_hours if end is None else min(
+                int(hour_numbers(end)), self._start + self.prediction_hours)
+            if first < last:
+                self._valid[np.arange(first, last) % self.prediction_hours] = False
+
+    def refresh(self, now=None):
+        """현재 정시로 구간을 옮기고 필요한 시간만 계산 → 계산한 시간 수"""
+        with self._lock:
+            return self._refresh(hour_numbers(floor_hour(now or self.clock())))
+
+    def _refresh(self, start):
+        start = int(start)
+        hours = self.prediction_hours
+        if self._start is None or not 0 <= start - self._start < hours:
+            # 첫 계산, 구간 전체가 지났거나 시계가 거꾸로 간 경우
+            self._valid[:] = False
+        elif start != self._start:
+            # 지난 시간 슬롯을 새로 드러난 시간 슬롯으로 재사용
+            self._valid[np.arange(self._start, start) % hours] = False
+        self._start = start
+        self._head = start % hours
+
+        slots = np.flatnonzero(~self._valid)
+        self.refreshes += 1
+        if len(slots) == 0:
+            return 0
+
+        # 슬롯 → 시간 번호 (구간 [start, start + hours) 안에서 슬롯이 가리키는 시간)
+        targets = start + (slots - self._head) % hours
+        risk = self.model.risk_for_hours(self.user_info, self.mission_type, targets)
+        self._score[slots] = np.round(risk, 1)
+        self._level[slots] = self.model.get_risk_levels(risk)
+        self._valid[slots] = True
+        self._series = None
+        self.computed_hours += len(slots)
+        return len(slots)
+
+    def series(self, now=None):
+        """현재 시각 기준 예측 (predict_risk_series 와 같은 열 딕셔너리, 읽기 전용)"""
+        now = now or self.clock()
+        with self._lock:
+            start = self._start
+            self._refresh(hour_numbers(floor_hour(now)))
+            if self._series is not None and start == self._start:
+                if now == self._series_time:
+                    return self._series
+                # 같은 정시 안에서 시각만 바뀐 경우 시각 열만 다시 만듦 (위험지수 / 등급 / 시간대 배열은 공유)
+                series = dict(self._series, timestamp=self._timestamps(now))
+            else:
+                # 링 버퍼 → 시간 순서 (구간 첫 시간부터), 새 배열이므로 이후 갱신이 반환한 결과를 바꾸지 않음
+                head = self._head
+                series = {
+                    'timestamp': self._timestamps(now),
+                    'risk_score': np.concatenate((self._score[head:], self._score[:head])),
+                    'hour_of_day': (now.hour + self._offsets) % 24,
+                    'risk_level': np.concatenate((self._level[head:], self._level[:head]))
+                }
+            for values in series.values():
+                values.flags.writeable = False
+            self._series = series
+            self._series_time = now
+            return series
+
+    def _timestamps(self, now):
+        """예측 시각 열 (_compute_risk_series 와 같이 현재 시각부터 1시간 간격)"""
+        return np.datetime64(now, 'us') + self._offsets.astype('timedelta64[h]')
+
+    def stats(self):
+        """갱신 통계 (갱신 횟수, 누적 계산 시간 수)"""
+        with self._lock:
+            return {'refreshes': self.refreshes, 'computed_hours': self.computed_hours,
+                    'prediction_hours': self.prediction_hours}
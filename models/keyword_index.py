@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DL 위험 키워드 인덱스
+
+키워드 목록을 로딩 시 한 번만 정수 ID 배열로 변환하고,
+(임무, 나이 구간, 근속 구간) 조합별 후보 ID / 가중치 표를 미리 만들어 둡니다.
+키워드 생성은 문자열 리스트 조합·중복 제거·전역 셔플 없이
+시드 기반 가중 top-k 추출(Efraimidis-Spirakis)로 끝나며, 여러 인원을 한 번에 처리할 수 있습니다.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# 임무별 기본 키워드
+MISSION_KEYWORDS = {
+    '복합적층장갑': [
+        '적층 작업 위험', '접착제 화학 노출', '고온 경화 과정',
+        '압력기 사용 주의', '환기 불량', '화재 위험'
+    ],
+    '엔진정비': [
+        '엔진 고온부 접촉', '연료 누출', '회전체 끼임',
+        '오일 미끄러짐', '배기가스 흡입', '전기 쇼트'
+    ],
+    '전기계통': [
+        '감전 위험', '누전 화재', '고압 전류',
+        '절연 불량', '접지 미흡', '전선 손상'
+    ],
+    '유압시스템': [
+        '고압 유체 분사', '유압 호스 파열', '오일 누출',
+        '압력 용기 폭발', '미끄러짐 사고', '화상 위험'
+    ],
+    '무기체계': [
+        '폭발물 취급', '화약 화재', '기계적 충격',
+        '금속 파편', '소음 피해', '독성 가스'
+    ]
+}
+
+# 공통 안전 키워드
+COMMON_KEYWORDS = [
+    '개인보호구 미착용', '작업 절차 미준수', '안전교육 부족',
+    '피로 누적', '주의력 분산', '응급상황 대응',
+    '동료와의 소통 부족', '장비 점검 미흡', '환경 요인'
+]
+
+# 개인 특성 구간별 키워드 (나이: ≤25 / 26~49 / ≥50, 근속: ≤2 / 3~14 / ≥15)
+AGE_BAND_KEYWORDS = [['경험 부족', '과신 위험'], [], ['신체 기능 저하', '반응속도 지연']]
+SERVICE_BAND_KEYWORDS = [['숙련도 부족', '절차 미숙지'], [], ['관습적 작업', '안전 불감증']]
+
+# 후보 가중치 (임무 특화 > 개인 특성 > 공통)
+MISSION_WEIGHT = 3.0
+PERSONAL_WEIGHT = 2.0
+COMMON_WEIGHT = 1.0
+
+
+def age_bands(ages):
+    """나이 → 구간 번호 (0: ≤25, 1: 26~49, 2: ≥50)"""
+    ages = np.asarray(ages)
+    return np.where(ages >= 50, 2, np.where(ages <= 25, 0, 1))
+
+
+def service_bands(service_years):
+    """근속연수 → 구간 번호 (0: ≤2, 1: 3~14, 2: ≥15)"""
+    service_years = np.asarray(service_years)
+    return np.where(service_years >= 15, 2, np.where(service_years <= 2, 0, 1))
+
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_EPOCH_HOUR = datetime(1970, 1, 1)
+
+
+def _mix64(x):
+    """splitmix64 최종 혼합 (uint64 배열, 오버플로는 모듈러 연산)"""
+    return _mix64_inplace(np.array(x, dtype=np.uint64))
+
+
+def _mix64_inplace(x):
+    """_mix64 (x 를 덮어써서 큰 배열의 임시 배열 할당을 줄임)"""
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _string_codes(values):
+    """문자열 배열 → 64비트 해시 (고유 값마다 한 번만 blake2b)"""
+    uniques, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    codes = np.array([
+        int.from_bytes(hashlib.blake2b(value.strip().encode('utf-8'), digest_size=8).digest(), 'little')
+        for value in uniques.tolist()
+    ], dtype=np.uint64)
+    return codes[inverse.reshape(-1)]
+
+
+def keyword_seeds(genders, ages, service_years, missions, start_hour):
+    """인원/임무/시작 정시 → 행별 64비트 시드 배열 (같은 입력이면 프로세스와 관계없이 동일)"""
+    hour = (start_hour - _EPOCH_HOUR) // timedelta(hours=1)
+    seeds = _string_codes(genders)
+    for part in (np.asarray(ages, dtype=np.int64), np.asarray(service_years, dtype=np.int64),
+                 _string_codes(missions), np.int64(hour)):
+        seeds = _mix64((seeds + _GOLDEN) ^ np.asarray(part).astype(np.uint64))
+    return seeds
+
+
+def keyword_seed(user_info, mission_type, start_hour):
+    """인원 한 명 시드 (keyword_seeds 와 같은 값)"""
+    return int(keyword_seeds([user_info.get('gender', '')], [int(user_info['age'])],
+                             [int(user_info['service_years'])], [mission_type], start_hour)[0])
+
+
+def counter_uniforms(seeds, counters, low=0.0, high=1.0):
+    """시드 × 카운터 → (low, high) 균등 난수 (splitmix64 카운터 방식, 브로드캐스팅 / 카운터마다 독립·재현 가능)"""
+    x = _mix64_inplace(np.add(np.asarray(seeds, dtype=np.uint64), np.asarray(counters).astype(np.uint64) * _GOLDEN))
+    x >>= np.uint64(11)
+    values = x.astype(np.float64)
+    values += 0.5
+    values *= (high - low) * 2.0 ** -53  # 2의 거듭제곱 배율이라 ((v + 0.5) * 2^-53) * (high - low) 와 같은 값
+    values += low
+    return values
+
+
+def _uniforms(seeds, width):
+    """행별 시드 × 열 번호 → (0, 1) 균등 난수 (행마다 독립·재현 가능)"""
+    return counter_uniforms(seeds[:, None], np.arange(1, width + 1, dtype=np.uint64)[None, :])
+
+
+def check_num_keywords(num_keywords):
+    """키워드 수 검증 (0 이상 정수)"""
+    num_keywords = int(num_keywords)
+    if num_keywords < 0:
+        raise ValueError(f"키워드 수는 0 이상이어야 합니다: {num_keywords}")
+    return num_keywords
+
+
+class KeywordIndex:
+    """(임무, 나이 구간, 근속 구간)별 후보 키워드 ID / 가중치 표"""
+
+    def __init__(self, mission_keywords=None, common_keywords=None):
+        mission_keywords = mission_keywords or MISSION_KEYWORDS
+        common_keywords = common_keywords or COMMON_KEYWORDS
+
+        # 어휘 (문자열 ↔ 정수 ID)
+        vocab = {}
+        for words in [*mission_keywords.values(), common_keywords, *AGE_BAND_KEYWORDS, *SERVICE_BAND_KEYWORDS]:
+            for word in words:
+                vocab.setdefault(word, len(vocab))
+        self.vocab = np.array(list(vocab), dtype=object)
+        self.missions = {mission: row for row, mission in enumerate(mission_keywords)}
+        self.default_mission = len(self.missions)  # 알 수 없는 임무 → 공통 키워드만
+
+        # 조합별 후보 (같은 키워드가 여러 그룹에 있으면 가장 큰 가중치 사용)
+        candidates = {}
+        groups = [list(mission_keywords.values()) + [[]], AGE_BAND_KEYWORDS, SERVICE_BAND_KEYWORDS]
+        for mission_row, mission_words in enumerate(groups[0]):
+            for age_band, age_words in enumerate(groups[1]):
+                for service_band, service_words in enumerate(groups[2]):
+                    weights = {}
+                    for words, weight in ((common_keywords, COMMON_WEIGHT),
+                                          (age_words + service_words, PERSONAL_WEIGHT),
+                                          (mission_words, MISSION_WEIGHT)):
+                        for word in words:
+                            weights[vocab[word]] = max(weight, weights.get(vocab[word], 0.0))
+                    candidates[mission_row, age_band, service_band] = weights
+
+        # (임무, 나이 구간, 근속 구간, 후보) 고정 폭 표 — 빈 칸은 가중치 0
+        width = max(len(weights) for weights in candidates.values())
+        shape = (len(groups[0]), len(AGE_BAND_KEYWORDS), len(SERVICE_BAND_KEYWORDS))
+        self.candidate_ids = np.zeros(shape + (width,), dtype=np.int32)
+        self.candidate_weights = np.zeros(shape + (width,), dtype=np.float64)
+        self.candidate_counts = np.zeros(shape, dtype=np.int32)
+        for combo, weights in candidates.items():
+            ids = sorted(weights)
+            self.candidate_ids[combo][:len(ids)] = ids
+            self.candidate_weights[combo][:len(ids)] = [weights[i] for i in ids]
+            self.candidate_counts[combo] = len(ids)
+
+    def mission_rows(self, missions):
+        """임무 이름 → 표 행 번호"""
+        return np.array([self.missions.get(mission, self.default_mission) for mission in missions], dtype=np.intp)
+
+    def select(self, mission_rows, ages, service_years, seeds, num_keywords):
+        """행별 가중 top-k 키워드 (가중치가 클수록 앞 순위에 뽑힐 확률이 높음)
+
+        Efraimidis-Spirakis: 키 = log(u) / w 가 큰 순서로 k 개 → 가중치 비례 비복원 추출
+        num_keywords 가 0 이면 빈 리스트, 음수면 ValueError
+        """
+        num_keywords = check_num_keywords(num_keywords)
+        if num_keywords == 0:
+            return [[] for _ in range(len(np.atleast_1d(mission_rows)))]
+        combo = (np.asarray(mission_rows), age_bands(ages), service_bands(service_years))
+        ids = self.candidate_ids[combo]
+        weights = self.candidate_weights[combo]
+        counts = np.minimum(self.candidate_counts[combo], num_keywords)
+
+        uniforms = _uniforms(np.asarray(seeds, dtype=np.uint64), ids.shape[1])
+        with np.errstate(divide='ignore'):
+            keys = np.where(weights > 0, np.log(uniforms) / np.where(weights > 0, weights, 1.0), -np.inf)
+
+        k = min(num_keywords, ids.shape[1])
+        if k < ids.shape[1]:
+            top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(ids.shape[1]), ids.shape)
+        order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1, kind='stable')
+        chosen = self.vocab[np.take_along_axis(ids, np.take_along_axis(top, order, axis=1), axis=1)]
+        return [row[:count] for row, count in zip(chosen.tolist(), counts.tolist())]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예측 결과 캐시 (LRU + TTL)
+
+동일 인원/임무/기간 예측을 다시 계산하지 않도록 정규화된 입력 튜플을 키로 결과를 보관합니다.
+항목은 예측 시작 시각(정시)이 지나면 만료되고, 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 제거됩니다.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+def floor_hour(moment):
+    """정시 단위로 내림"""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def prediction_key(kind, user_info, mission_type, start_hour, horizon, model_version, *extra):
+    """정규화된 캐시 키 (성별, 나이, 근속연수, 임무, 시작 시각, 기간, 모델 버전)"""
+    return (
+        kind,
+        str(user_info.get('gender', '')).strip(),
+        int(user_info['age']),
+        int(user_info['service_years']),
+        mission_type,
+        start_hour,
+        horizon,
+        model_version
+    ) + extra
+
+
+class PredictionCache:
+    """스레드 안전 LRU + TTL 캐시"""
+
+    def __init__(self, maxsize=256, clock=datetime.now):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """캐시 조회 (만료 항목은 제거 후 미스 처리)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value, expires_at):
+        """캐시 저장 (최대 개수 초과 시 LRU 제거)"""
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, expires_at):
+        """캐시에 없으면 계산 후 저장"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, expires_at)
+        return value
+
+    @staticmethod
+    def expiry_for(start_hour):
+        """예측 시작 시각(정시)이 지나면 만료"""
+        return start_hour + timedelta(hours=1)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """캐시 적중 통계 (크기 조정용)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
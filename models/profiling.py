@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 소요 시간 / 카운터 계측
+
+    with stage_timer('predict.ml', into=timings):   # 구간 시간 (into 딕셔너리에도 ms 기록)
+        ...
+    @timed('ml.predict_batch')                      # 함수 전체 구간
+    count('report.rows', rows)                      # 카운터
+
+모든 스레드의 구간을 (호출 수, 누적 / 최근 / 최대 시간)으로 집계하며, 측정 비용은 호출당 수 µs 입니다.
+환경 변수 SAFETY_PROFILE 을 지정하면 종료 시 추적 파일을 기록합니다 (SAFETY_PROFILE_DIR, 기본 현재 폴더).
+    SAFETY_PROFILE=json       구간별 이벤트 (Chrome trace 형식, chrome://tracing / Perfetto) + 집계
+    SAFETY_PROFILE=cprofile   계측 구간 안의 함수별 cProfile 통계 (.prof, 스레드별 프로파일 병합)
+    SAFETY_PROFILE=all        둘 다
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+PROFILE_ENV = 'SAFETY_PROFILE'
+PROFILE_DIR_ENV = 'SAFETY_PROFILE_DIR'
+PROFILE_MODES = {'1': ('json',), 'json': ('json',), 'cprofile': ('cprofile',), 'all': ('json', 'cprofile')}
+
+# 추적 이벤트 최대 보관 수 (오래된 것부터 버림)
+MAX_TRACE_EVENTS = 100000
+
+
+class _Stage:
+    """stage_timer 가 반환하는 구간 (with 문 / 경과 시간 ms)"""
+
+    __slots__ = ('profiler', 'name', 'into', 'started', 'elapsed_ms')
+
+    def __init__(self, profiler, name, into):
+        self.profiler = profiler
+        self.name = name
+        self.into = into
+        self.started = None
+        self.elapsed_ms = None
+
+    def __enter__(self):
+        self.profiler._enter()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ended = time.perf_counter()
+        self.elapsed_ms = (ended - self.started) * 1000
+        self.profiler._record(self.name, self.started, self.elapsed_ms)
+        if self.into is not None:
+            self.into[self.name] = self.into.get(self.name, 0.0) + self.elapsed_ms
+        return False
+
+
+class Profiler:
+    """구간 시간 / 카운터 집계기 (스레드 안전)"""
+
+    def __init__(self, modes=()):
+        self.modes = tuple(modes)
+        self._lock = threading.Lock()
+        self._stages = {}  # 이름 → [호출 수, 누적 ms, 최근 ms, 최대 ms]
+        self._counters = {}
+        self._events = deque(maxlen=MAX_TRACE_EVENTS) if 'json' in self.modes else None
+        self._local = threading.local()
+        self._profiles = []
+        self._origin = time.perf_counter()
+
+    def stage(self, name, into=None):
+        """구간 시간 측정 컨텍스트 매니저 (into: 경과 ms 를 더할 딕셔너리)"""
+        return _Stage(self, name, into)
+
+    def timed(self, name=None):
+        """함수 전체를 구간으로 측정하는 데코레이터 (이름 생략 시 함수 이름)"""
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Stage(self, stage_name, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, amount=1):
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def last_ms(self, name):
+        """구간의 최근 소요 시간 (ms, 기록 없으면 None)"""
+        stats = self._stages.get(name)
+        return stats[2] if stats else None
+
+    def snapshot(self):
+        """집계 결과 {'stages': {이름: 통계}, 'counters': {이름: 값}}"""
+        with self._lock:
+            stages = {
+                name: {'count': count, 'total_ms': total, 'mean_ms': total / count, 'last_ms': last, 'max_ms': peak}
+                for name, (count, total, last, peak) in self._stages.items()
+            }
+            return {'stages': stages, 'counters': dict(self._counters)}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            if self._events is not None:
+                self._events.clear()
+
+    def _enter(self):
+        # cProfile 은 스레드별로 동작하므로 스레드마다 프로파일을 두고 가장 바깥 구간에서만 켜고 끔
+        if 'cprofile' not in self.modes:
+            return
+        local = self._local
+        if getattr(local, 'depth', 0) == 0:
+            import cProfile
+
+            if getattr(local, 'profile', None) is None:
+                local.profile = cProfile.Profile()
+                with self._lock:
+                    self._profiles.append(local.profile)
+            local.profile.enable()
+        local.depth = getattr(local, 'depth', 0) + 1
+
+    def _record(self, name, started, elapsed_ms):
+        if 'cprofile' in self.modes:
+            local = self._local
+            local.depth -= 1
+            if local.depth == 0:
+                local.profile.disable()
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                self._stages[name] = [1, elapsed_ms, elapsed_ms, elapsed_ms]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed_ms
+                stats[2] = elapsed_ms
+                stats[3] = max(stats[3], elapsed_ms)
+            if self._events is not None:
+                self._events.append((name, started, elapsed_ms, threading.get_ident()))
+
+    def dump(self, directory=None):
+        """추적 파일 기록 → 기록한 파일 경로 리스트"""
+        directory = Path(directory or os.environ.get(PROFILE_DIR_ENV) or '.')
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"safety_profile_{os.getpid()}"
+        written = []
+        if 'json' in self.modes:
+            with self._lock:
+                events = list(self._events)
+            trace = {
+                'traceEvents': [
+                    {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': thread,
+                     'ts': (started - self._origin) * 1e6, 'dur': elapsed_ms * 1000}
+                    for name, started, elapsed_ms, thread in events
+                ],
+                **self.snapshot()
+            }
+            path = directory / f"{stem}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False)
+            written.append(path)
+        if 'cprofile' in self.modes and self._profiles:
+            import pstats
+
+            path = directory / f"{stem}.prof"
+            with self._lock:
+                profiles = list(self._profiles)
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(path)
+            written.append(path)
+        return written
+
+
+def format_timings(timings, labels=None):
+    """{구간: ms} → 'ML 추론 2.9ms · DL 생성 2.0초' (상태 표시줄용)"""
+    labels = labels or {}
+    parts = []
+    for name, elapsed_ms in timings.items():
+        value = f"{elapsed_ms / 1000:.1f}초" if elapsed_ms >= 1000 else f"{elapsed_ms:.1f}ms"
+        parts.append(f"{labels.get(name, name)} {value}")
+    return ' · '.join(parts)
+
+
+PROFILER = Profiler(PROFILE_MODES.get(os.environ.get(PROFILE_ENV, '').strip().lower(), ()))
+stage_timer = PROFILER.stage
+timed = PROFILER.timed
+count = PROFILER.count
+
+if PROFILER.modes:
+    atexit.register(PROFILER.dump)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청별 난수 스트림
+
+위험지수 변동(노이즈)을 전역 np.random 상태 대신 요청마다 독립된 numpy.random.Generator 로 뽑습니다.
+시드는 인원/임무/시작 정시 해시(keyword_seeds)이고, 용도별 스트림은 SeedSequence 의 spawn_key 로 나눕니다.
+같은 입력이면 실행 순서, 스레드 수, 프로세스 수와 관계없이 같은 난수이며 스레드 간 전역 상태 경합도 없습니다.
+시간대별 위험지수 변동(hourly_uniform)은 시작 시각이 아니라 각 절대 시각을 카운터로 쓰므로,
+예측 구간을 옮겨도 겹치는 시간은 같은 값이고 새로 드러난 시간만 따로 뽑을 수 있습니다 (IncrementalForecast).
+일괄 예측(hourly_uniforms)도 (인원, 임무, 시각)마다 같은 카운터 난수를 쓰므로 함께 묶인 인원이나
+묶음 크기와 관계없이 단건 예측과 같은 값입니다.
+"""
+
+import functools
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from models.keyword_index import keyword_seed, keyword_seeds, counter_uniforms
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from keyword_index import keyword_seed, keyword_seeds, counter_uniforms
+
+# 용도별 스트림 번호 (SeedSequence spawn_key / 시간별 카운터 오프셋)
+STREAM_RISK_SERIES = 1     # DummyMLModel 시간대별 변동 (predict_risk_series / predict_batch / score_missions 공통)
+STREAM_DL_RISK = 4         # GUI DL 위험지수
+STREAM_COUNT = 8           # 시간별 카운터 스트림 간격 (hourly_uniform)
+
+# 시간별 난수의 인원/임무 시드 기준 시각 (시작 시각과 무관한 고정값)
+HOURLY_ANCHOR = datetime(1970, 1, 1)
+
+
+def seed_sequence(stream, seed):
+    """64비트 시드 → 스트림별 SeedSequence"""
+    return np.random.SeedSequence(int(seed), spawn_key=(stream,))
+
+
+def request_rng(stream, user_info, mission_type, start_hour):
+    """인원 한 명 / 임무 / 시작 정시 → 요청 전용 Generator"""
+    seed = keyword_seed(user_info, mission_type, start_hour)
+    return np.random.Generator(np.random.PCG64(seed_sequence(stream, seed)))
+
+
+def hour_numbers(moment, count=None):
+    """시각 → 1970-01-01 기준 시간 번호 (count 지정 시 그 시간부터 연속 count 개 배열)"""
+    start = np.datetime64(moment, 'h').astype(np.int64)
+    return start if count is None else start + np.arange(count, dtype=np.int64)
+
+
+@functools.lru_cache(maxsize=1024)
+def hourly_seed(gender, age, service_years, mission_type):
+    """시간별 난수의 인원/임무 시드 (증분 갱신마다 해시를 다시 계산하지 않도록 캐시)"""
+    return keyword_seed({'gender': gender, 'age': age, 'service_years': service_years}, mission_type, HOURLY_ANCHOR)
+
+
+def hourly_uniform(stream, user_info, mission_type, hours, low=0.0, high=1.0):
+    """인원 한 명 / 임무 / 시간 번호 배열 → 시간별 균등 난수 [low, high)
+
+    값은 각 시간 번호에만 의존하므로 어느 구간을 어떤 순서로 뽑아도 같은 시간은 같은 값입니다.
+    """
+    seed = hourly_seed(str(user_info.get('gender', '')).strip(), int(user_info['age']),
+                       int(user_info['service_years']), mission_type)
+    counters = np.asarray(hours, dtype=np.int64) * STREAM_COUNT + stream
+    return counter_uniforms(seed, counters, low, high)
+
+
+def hourly_uniforms(stream, columns, missions, hours, low=0.0, high=1.0):
+    """인원 열 딕셔너리 × 임무 목록 × 시간 번호 배열 → (인원, 임무, 시간) 균등 난수
+
+    (인원, 임무, 시간)마다 hourly_uniform 과 같은 값이므로 묶음 구성과 관계없이 단건 예측과 일치합니다.
+    """
+    n_people, n_missions = len(columns['age']), len(missions)
+    seeds = keyword_seeds(
+        np.repeat(columns['gender'], n_missions), np.repeat(columns['age'], n_missions),
+        np.repeat(columns['service_years'], n_missions), np.tile(np.asarray(missions, dtype=object), n_people),
+        HOURLY_ANCHOR
+    ).reshape(n_people, n_missions)
+    counters = np.asarray(hours, dtype=np.int64) * STREAM_COUNT + stream
+    return counter_uniforms(seeds[:, :, None], counters[None, None, :], low, high)
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+안전대책 검색 엔진 (역색인 + BM25)
+
+안전대책 문서마다 단어와 글자 바이그램(조사가 붙은 한국어 단어도 부분 일치)을 색인어로 뽑아
+색인어 → (문서 번호, BM25 가중치) 목록을 CSR 배열로 만들어 둡니다.
+안전대책 × 위험 유형(폭발/화재/감전 등) 관련도 행렬도 색인 생성 시 함께 계산해 둡니다.
+검색은 같은 임무 질의들을 묶어 (질의 × 문서) 점수 행렬에 색인어 / 위험 유형 열을 한 번씩 더하고
+(희소 행렬 × 질의 벡터), 임무가 다른 문서는 제외, 같은 임무 문서는 가산한 뒤
+질의별 상위 k 개를 argpartition 으로 고릅니다.
+문서 번호가 임무별 연속 구간이므로 다른 임무 문서의 목록 항목은 읽지 않습니다.
+
+색인 폴더 구조 (measure_index/):
+    meta.json            버전, 문서 수, 임무 이름 목록, BM25 매개변수, 내장 대책 해시
+    terms.vocab          색인어 → 번호 (압축 어휘 파일, models/vocab.py)
+    term_ptr.npy         색인어별 목록 시작 위치 (색인어 수 + 1)
+    post_docs.npy        목록의 문서 번호 (int32)
+    post_weights.npy     목록의 BM25 가중치 (float32, idf 포함)
+    hazard_*.npy         안전대책 × 위험 유형 관련도 행렬 (유형별 CSC: hazard_ptr / hazard_docs / hazard_weights)
+    doc_mission.npy      문서별 임무 번호 (-1: 공통, 오름차순 — 문서 번호는 임무별 연속 구간)
+    doc_offsets.npy      문서별 본문 시작 위치 (문서 수 + 1)
+    documents.bin        안전대책 본문 (UTF-8)
+    defaults.npy         검색 결과가 부족할 때 채울 기본 대책 문서 번호
+
+사용법:
+    python models/retrieval.py build                          # 내장 안전대책만
+    python models/retrieval.py build --corpus models/safety_corpus
+    python models/retrieval.py bench --docs 300000
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import shutil
+import sys
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from models.vocab import CompactVocab, write_vocab
+    from models.corpus import CorpusReader, record_mission
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from vocab import CompactVocab, write_vocab
+    from corpus import CorpusReader, record_mission
+
+MEASURE_INDEX_DIRNAME = 'measure_index'
+INDEX_VERSION = 2
+
+# BM25 매개변수, 같은 임무 문서 가산점, 위험 유형 일치 가중치
+BM25_K1 = 1.2
+BM25_B = 0.75
+MISSION_BOOST = 5.0
+HAZARD_WEIGHT = 2.0
+
+# 여러 인원 일괄 점수 계산 시 (인원 × 문서) 점수 행렬 최대 칸 수 (float32 64MB)
+BATCH_SCORE_CELLS = 16 * 1024 ** 2
+
+# 위험 유형 사전 (유형 → (우선순위 높음 여부, 부분 문자열)) — '화재 위험', '누전 화재' 처럼 다른 말이 붙어도 일치
+HAZARD_LEXICON = {
+    '폭발': (True, ['폭발', '화약', '압력 용기']),
+    '화재': (True, ['화재', '발화', '화상', '고온', '연료 누출']),
+    '감전': (True, ['감전', '누전', '고압 전류', '전기 쇼트', '절연 불량', '접지 미흡']),
+    '화학': (False, ['화학', '독성', '가스', '흡입', '접착제', '환기']),
+    '기계': (False, ['끼임', '회전', '충격', '파편', '파열', '분사']),
+    '미끄러짐': (False, ['미끄러', '오일 누출']),
+    '인적요인': (False, ['피로', '주의력', '경험 부족', '숙련도', '절차', '불감증', '과신', '교육', '소통']),
+    '환경': (False, ['환경', '소음', '습도', '조명', '기상'])
+}
+
+# 말뭉치 레코드에서 안전대책을 찾을 필드 이름 (앞에서부터 우선, 값은 문자열 또는 문자열 리스트)
+MEASURE_FIELDS = ['safety_measures', 'measures', '안전대책', 'measure', 'safety_tips']
+
+# 내장 안전대책 (안전대책, 검색 태그) — 태그는 위험 키워드와 맞추기 위한 색인 전용 문구
+BASE_MEASURES = [
+    ("개인보호구 완전 착용 (안전모, 보호안경, 작업복, 안전화)", "개인보호구 미착용 금속 파편 화상 위험"),
+    ("작업 전 안전점검 체크리스트 100% 준수", "작업 절차 미준수 장비 점검 미흡"),
+    ("2인 1조 작업 시스템으로 상호 안전 확인", "동료와의 소통 부족 주의력 분산"),
+    ("1시간마다 10분 휴식으로 피로도 관리", "피로 누적 반응속도 지연"),
+    ("응급상황 대응 절차 숙지 및 비상연락망 확인", "응급상황 대응 안전교육 부족")
+]
+
+MISSION_MEASURES = {
+    '복합적층장갑': [
+        ("작업장 환기 시설 가동 및 공기 질 모니터링", "환기 불량 접착제 화학 노출"),
+        ("접착제 사용 시 방독마스크 착용 필수", "접착제 화학 노출 독성"),
+        ("고온 장비 주변 화상 방지 조치", "고온 경화 과정 화재 위험 압력기 사용 주의")
+    ],
+    '엔진정비': [
+        ("연료 누출 감지 장비 점검 후 작업 시작", "연료 누출 화재"),
+        ("회전 부품 작업 시 느슨한 의복 착용 금지", "회전체 끼임"),
+        ("엔진 냉각 후 정비 작업 실시", "엔진 고온부 접촉 배기가스 흡입")
+    ],
+    '전기계통': [
+        ("전원 차단 후 검전기로 무전압 확인", "감전 위험 고압 전류"),
+        ("절연 장갑 및 절연 공구 사용", "절연 불량 전선 손상 감전"),
+        ("습도가 높은 날 작업 시 특별 주의", "누전 화재 접지 미흡 환경 요인")
+    ],
+    '유압시스템': [
+        ("작업 전 유압 잔압 완전 제거 확인", "고압 유체 분사 압력 용기 폭발"),
+        ("유압 호스 및 연결부 손상 여부 점검", "유압 호스 파열 오일 누출"),
+        ("바닥 오일 즉시 제거 및 미끄럼 방지 조치", "미끄러짐 사고 오일 누출")
+    ],
+    '무기체계': [
+        ("폭발물 취급 인가자 외 출입 통제", "폭발물 취급 화약 화재"),
+        ("정전기 제거 후 화약류 취급", "화약 화재 폭발"),
+        ("청력 보호구 및 방탄 보호구 착용", "소음 피해 금속 파편 기계적 충격")
+    ]
+}
+
+COMMON_MEASURES = [
+    ("작업 중 충분한 조명 확보로 시야 확보", "신체 기능 저하 반응속도 지연 시야"),
+    ("숙련자의 지도 하에 작업 수행", "숙련도 부족 절차 미숙지 경험 부족"),
+    ("작업 전 위험성 평가 재확인 및 관습적 절차 점검", "관습적 작업 안전 불감증 과신 위험"),
+    ("작업 전 장비 및 공구 상태 점검", "장비 점검 미흡 전기 쇼트"),
+    ("작업 구역 정리정돈 및 기상 상황 확인", "환경 요인 미끄러짐")
+]
+
+# 색인 폴더의 .npy 배열
+ARRAY_NAMES = ('term_ptr', 'post_docs', 'post_weights', 'hazard_ptr', 'hazard_docs', 'hazard_weights',
+               'doc_mission', 'doc_offsets', 'defaults')
+
+_WORD = re.compile(r'\w+')
+
+
+class HazardLexicon:
+    """위험 유형 사전 (모든 부분 문자열을 정규식 하나로 컴파일)"""
+
+    def __init__(self, lexicon=None):
+        lexicon = lexicon or HAZARD_LEXICON
+        self.classes = list(lexicon)
+        self.critical = np.array([critical for critical, _ in lexicon.values()], dtype=bool)
+        self._classes_of = {}
+        for class_id, (_, patterns) in enumerate(lexicon.values()):
+            for pattern in patterns:
+                self._classes_of.setdefault(pattern, []).append(class_id)
+        # 긴 문자열 우선 ('압력 용기' 가 '압력' 보다 먼저)
+        self._pattern = re.compile('|'.join(map(re.escape, sorted(self._classes_of, key=len, reverse=True))))
+
+    def match(self, text):
+        """텍스트 → 일치한 위험 유형 번호 집합"""
+        return {class_id for found in self._pattern.findall(text) for class_id in self._classes_of[found]}
+
+    def vectors(self, keyword_lists):
+        """인원별 키워드 목록 → (인원 × 위험 유형) 키워드 수 행렬"""
+        vectors = np.zeros((len(keyword_lists), len(self.classes)), dtype=np.float32)
+        for row, keywords in enumerate(keyword_lists):
+            for keyword in keywords:
+                for class_id in self.match(keyword):
+                    vectors[row, class_id] += 1.0
+        return vectors
+
+    def priorities(self, vectors):
+        """위험 유형 행렬 → 인원별 우선순위 ('높음': 폭발/화재/감전 유형 포함)"""
+        critical = (np.asarray(vectors)[:, self.critical] > 0).any(axis=1)
+        return ['높음' if value else '보통' for value in critical.tolist()]
+
+
+HAZARDS = HazardLexicon()
+
+
+def tokenize(text):
+    """텍스트 → 색인어 (단어 + 3글자 이상 단어의 글자 바이그램)"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        terms.append(word)
+        if len(word) > 2:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def query_weights(texts):
+    """질의 텍스트 → {색인어: 가중치} (긴 단어가 바이그램 수만큼 과대 반영되지 않도록 단어당 바이그램 합계 1)"""
+    weights = Counter()
+    for text in texts:
+        for word in _WORD.findall(text.lower()):
+            weights[word] += 1.0
+            if len(word) > 2:
+                for i in range(len(word) - 1):
+                    weights[word[i:i + 2]] += 1.0 / (len(word) - 1)
+    return weights
+
+
+def personal_terms(user_info):
+    """개인 특성 → 추가 질의어 (고령 / 저근속 인원용 대책이 검색되도록)"""
+    terms = []
+    if int(user_info['age']) >= 45:
+        terms.append('신체 기능 저하 시야')
+    if int(user_info['service_years']) <= 3:
+        terms.append('숙련도 부족')
+    return terms
+
+
+def builtin_documents():
+    """내장 안전대책 → (본문, 임무, 검색 태그), 기본 대책 수"""
+    documents = [(measure, None, tags) for measure, tags in BASE_MEASURES]
+    for mission, measures in MISSION_MEASURES.items():
+        documents.extend((measure, mission, tags) for measure, tags in measures)
+    documents.extend((measure, None, tags) for measure, tags in COMMON_MEASURES)
+    return documents, len(BASE_MEASURES)
+
+
+def builtin_hash():
+    """내장 안전대책 / 위험 유형 사전 해시 (바뀌면 내장 색인 재생성)"""
+    documents, _ = builtin_documents()
+    content = json.dumps([documents, HAZARD_LEXICON], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def corpus_documents(reader, fields=None):
+    """말뭉치 저장소 레코드 → (본문, 임무, 검색 태그) (키워드 필드가 있으면 태그로 사용)"""
+    fields = fields or MEASURE_FIELDS
+    for record in reader:
+        if not isinstance(record, dict):
+            continue
+        mission = record_mission(record)
+        keywords = record.get('keywords')
+        tags = ' '.join(keywords) if isinstance(keywords, list) else ''
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, str):
+                value = [value]
+            if isinstance(value, list):
+                for measure in value:
+                    if isinstance(measure, str) and measure.strip():
+                        yield measure.strip(), mission, tags
+                break
+
+
+class MeasureIndex:
+    """안전대책 역색인 (메모리 또는 메모리 매핑 배열)"""
+
+    def __init__(self, term_ids, term_ptr, post_docs, post_weights, hazard_ptr, hazard_docs, hazard_weights,
+                 doc_mission, doc_offsets, documents, defaults, meta):
+        self.term_ids = term_ids  # 색인어 → 번호 (dict 또는 압축 어휘 Mapping)
+        self.term_ptr = term_ptr
+        self.post_docs = post_docs
+        self.post_weights = post_weights
+        # 안전대책 × 위험 유형 관련도 행렬 (유형별 열, CSC)
+        self.hazard_ptr = hazard_ptr
+        self.hazard_docs = hazard_docs
+        self.hazard_weights = hazard_weights
+        self.doc_mission = doc_mission
+        self.doc_offsets = doc_offsets
+        self.documents = documents
+        self.defaults = defaults
+        self.meta = meta
+        self.missions = {mission: code for code, mission in enumerate(meta['missions'])}
+        self.lexicon = HAZARDS
+        # 현재 사전의 유형 → 색인의 관련도 행렬 열 (색인 생성 후 사전에 추가된 유형은 없음)
+        hazard_columns = {hazard: column for column, hazard in enumerate(meta['hazard_classes'])}
+        self.hazard_columns = [hazard_columns.get(hazard) for hazard in self.lexicon.classes]
+
+    def __len__(self):
+        return len(self.doc_mission)
+
+    @classmethod
+    def build(cls, documents, default_count=0, k1=BM25_K1, b=BM25_B, source='builtin'):
+        """(본문, 임무, 검색 태그) 문서 → 색인 (같은 본문은 처음 것만 사용)"""
+        term_ids = {}
+        missions = {}
+        seen = set()
+        flat_terms = array('q')
+        doc_lengths = []
+        doc_mission = []
+        texts = []
+        defaults = []
+        hazard_pairs = array('q')
+        for position, (text, mission, tags) in enumerate(documents):
+            if text in seen:
+                continue
+            seen.add(text)
+            if position < default_count:
+                defaults.append(len(texts))
+            terms = tokenize(text) + tokenize(tags or '')
+            flat_terms.extend(term_ids.setdefault(term, len(term_ids)) for term in terms)
+            doc_lengths.append(len(terms))
+            doc_mission.append(-1 if mission is None else missions.setdefault(mission, len(missions)))
+            for class_id in HAZARDS.match(f"{text} {tags or ''}"):
+                hazard_pairs.extend((class_id, len(texts)))
+            texts.append(text.encode('utf-8'))
+
+        n_docs, n_terms = len(texts), len(term_ids)
+        # 문서 번호를 임무 순(공통 -1 먼저, 임무 안에서는 입력 순서)으로 다시 매김
+        # → 색인어 목록마다 임무별 문서가 연속 구간이 되어, 질의 시 다른 임무 구간은 이진 탐색으로 건너뜀
+        doc_mission = np.array(doc_mission, dtype=np.int16)
+        order = np.argsort(doc_mission, kind='stable')
+        new_ids = np.empty(n_docs, dtype=np.int64)
+        new_ids[order] = np.arange(n_docs)
+        doc_mission = doc_mission[order]
+        doc_lengths = np.array(doc_lengths, dtype=np.int64)
+        texts = [texts[i] for i in order.tolist()]
+
+        # (색인어, 문서) 쌍별 빈도 → 색인어 순 CSR (목록 안에서는 문서 번호 순)
+        keys = np.frombuffer(flat_terms, dtype=np.int64) * max(n_docs, 1) + new_ids[np.repeat(np.arange(n_docs), doc_lengths)]
+        keys, tfs = np.unique(keys, return_counts=True)
+        post_terms, post_docs = np.divmod(keys, max(n_docs, 1))
+        term_ptr = np.searchsorted(post_terms, np.arange(n_terms + 1)).astype(np.int64)
+
+        # BM25 가중치 미리 계산 (질의 시에는 합산만)
+        df = np.diff(term_ptr)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        doc_lengths = doc_lengths[order]
+        avg_length = doc_lengths.mean() if n_docs else 1.0
+        norm = k1 * (1 - b + b * doc_lengths[post_docs] / avg_length)
+        post_weights = (idf[post_terms] * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+
+        # 위험 유형 관련도 (유형 순, 유형 안에서는 문서 번호 순)
+        hazard_pairs = np.frombuffer(hazard_pairs, dtype=np.int64).reshape(-1, 2)
+        hazard_keys = np.sort(hazard_pairs[:, 0] * max(n_docs, 1) + new_ids[hazard_pairs[:, 1]])
+        hazard_classes, hazard_docs = np.divmod(hazard_keys, max(n_docs, 1))
+        hazard_ptr = np.searchsorted(hazard_classes, np.arange(len(HAZARDS.classes) + 1)).astype(np.int64)
+        hazard_weights = np.ones(len(hazard_docs), dtype=np.float32)
+
+        doc_offsets = np.zeros(n_docs + 1, dtype=np.int64)
+        doc_offsets[1:] = np.cumsum([len(text) for text in texts])
+        meta = {
+            'version': INDEX_VERSION,
+            'documents': n_docs,
+            'terms': n_terms,
+            'missions': list(missions),
+            'hazard_classes': HAZARDS.classes,
+            'k1': k1,
+            'b': b,
+            'source': source,
+            'builtin_hash': builtin_hash()
+        }
+        return cls(term_ids, term_ptr, post_docs.astype(np.int32), post_weights,
+                   hazard_ptr, hazard_docs.astype(np.int32), hazard_weights, doc_mission, doc_offsets,
+                   np.frombuffer(b''.join(texts), dtype=np.uint8), new_ids[defaults].astype(np.int32), meta)
+
+    @classmethod
+    def build_builtin(cls):
+        documents, default_count = builtin_documents()
+        return cls.build(documents, default_count)
+
+    def save(self, directory):
+        """색인 폴더에 기록 (임시 폴더에 쓴 뒤 교체)"""
+        directory = Path(directory)
+        tmp_dir = directory.with_name(directory.name + '.tmp')
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        write_vocab(tmp_dir / 'terms.vocab', self.term_ids)
+        for name in ARRAY_NAMES:
+            np.save(tmp_dir / f'{name}.npy', np.asarray(getattr(self, name)))
+        np.asarray(self.documents).tofile(tmp_dir / 'documents.bin')
+        with open(tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        if directory.exists():
+            shutil.rmtree(directory)
+        tmp_dir.rename(directory)
+        return directory
+
+    @classmethod
+    def load(cls, directory):
+        """색인 폴더를 메모리 매핑으로 열기"""
+        directory = Path(directory)
+        with open(directory / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"지원하지 않는 검색 색인 버전: {meta.get('version')}")
+        # memmap 하위 클래스 대신 일반 ndarray 뷰로 (조각 슬라이싱 오버헤드 감소)
+        arrays = {name: np.asarray(np.load(directory / f'{name}.npy', mmap_mode='r'))
+                  for name in ARRAY_NAMES}
+        documents = (np.memmap(directory / 'documents.bin', dtype=np.uint8, mode='r')
+                     if (directory / 'documents.bin').stat().st_size else np.zeros(0, dtype=np.uint8))
+        return cls(CompactVocab(directory / 'terms.vocab').word_to_idx, documents=documents, meta=meta, **arrays)
+
+    @classmethod
+    def load_or_build(cls, directory):
+        """저장된 색인을 열고, 없거나 내장 대책이 바뀌었으면 내장 대책으로 다시 만들어 저장"""
+        directory = Path(directory)
+        try:
+            index = cls.load(directory)
+            if index.meta['source'] != 'builtin' or index.meta['builtin_hash'] == builtin_hash():
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build_builtin()
+        try:
+            index.save(directory)
+        except OSError:
+            pass  # 읽기 전용 위치 (실행 파일 등) → 메모리 색인만 사용
+        return index
+
+    def text(self, doc_id):
+        """문서 번호 → 안전대책 본문"""
+        return bytes(self.documents[self.doc_offsets[doc_id]:self.doc_offsets[doc_id + 1]]).decode('utf-8')
+
+    def mission_ranges(self, mission=None):
+        """질의 임무에 해당하는 문서 번호 구간 [(시작, 끝), ...] (공통 구간, 같은 임무 구간)"""
+        code = self.missions.get(mission)
+        codes = [-1] if code is None else [-1, code]
+        values = np.array([value for code in codes for value in (code, code + 1)], dtype=self.doc_mission.dtype)
+        bounds = np.searchsorted(self.doc_mission, values)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[::2], bounds[1::2]) if stop > start]
+
+    @staticmethod
+    def _add_columns(matrix, rows, row_weights, ptr, docs, weights, column_id, ranges):
+        """관련도 열 하나 (색인어 목록 / 위험 유형 열) 를 한 번만 잘라 점수 행렬의 여러 행에 가산
+
+        ranges: (구간 시작, 경계 배열, 행렬 열 시작) 목록
+        """
+        col_start, col_stop = ptr[column_id], ptr[column_id + 1]
+        col_docs = docs[col_start:col_stop]
+        for start, bounds, offset in ranges:
+            # 목록은 문서 번호 순 → 임무 구간에 해당하는 부분만
+            lo, hi = np.searchsorted(col_docs, bounds)
+            if hi <= lo:
+                continue
+            columns = col_docs[lo:hi] - (start - offset)
+            values = weights[col_start + lo:col_start + hi]
+            # 행별 add.at 이 2차원 팬시 인덱싱 (matrix[np.ix_(rows, columns)] +=) 보다 빠름
+            for row, row_weight in zip(rows, row_weights):
+                np.add.at(matrix[row], columns, values if row_weight == 1.0 else values * row_weight)
+
+    def score_matrix(self, queries, hazards, mission=None):
+        """같은 임무 질의 여러 개 → (질의 × 허용 문서) 점수 행렬, 열별 문서 번호
+
+        queries: 질의별 {색인어: 가중치}, hazards: (질의 × 위험 유형) 키워드 수 행렬.
+        색인어 / 위험 유형별로 관련도 열을 한 번만 잘라 그 열을 쓰는 모든 질의 행에 더합니다.
+        """
+        ranges = self.mission_ranges(mission)
+        widths = [stop - start for start, stop in ranges]
+        offsets = np.concatenate([[0], np.cumsum(widths)[:-1]]).astype(np.int64).tolist() if ranges else []
+        matrix = np.zeros((len(queries), sum(widths)), dtype=np.float32)
+        for (start, stop), offset in zip(ranges, offsets):
+            if self.doc_mission[start] >= 0:
+                matrix[:, offset:offset + stop - start] = MISSION_BOOST
+        # 목록과 같은 int32 로 경계를 만들어야 searchsorted 가 목록 전체를 형 변환하지 않음
+        range_bounds = [(start, np.array((start, stop), dtype=self.post_docs.dtype), offset)
+                        for (start, stop), offset in zip(ranges, offsets)]
+
+        # 색인어 → (행 목록, 행별 가중치)
+        term_rows = {}
+        for row, query in enumerate(queries):
+            for term, weight in query.items():
+                term_rows.setdefault(term, ([], []))
+                term_rows[term][0].append(row)
+                term_rows[term][1].append(weight)
+        # 색인어 순서를 고정해야 묶음 크기와 관계없이 행별 float32 합산 순서가 같음
+        for term, (rows, row_weights) in sorted(term_rows.items()):
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                self._add_columns(matrix, rows, np.float32(row_weights).tolist(), self.term_ptr,
+                                  self.post_docs, self.post_weights, term_id, range_bounds)
+
+        # 위험 유형 관련도: 질의의 유형별 키워드 수 × HAZARD_WEIGHT
+        hazards = np.asarray(hazards, dtype=np.float32)
+        for class_id, column in enumerate(self.hazard_columns):
+            rows = np.flatnonzero(hazards[:, class_id]) if column is not None else ()
+            if len(rows):
+                row_weights = (hazards[rows, class_id] * np.float32(HAZARD_WEIGHT)).tolist()
+                self._add_columns(matrix, rows, row_weights, self.hazard_ptr,
+                                  self.hazard_docs, self.hazard_weights, column, range_bounds)
+
+        doc_ids = (np.concatenate([np.arange(start, stop) for start, stop in ranges])
+                   if ranges else np.zeros(0, dtype=np.int64))
+        return matrix, doc_ids
+
+    def _top_k(self, scores, doc_ids, k):
+        """점수 한 행 → 상위 k 개 (문서 번호, 점수), 부족하면 기본 대책으로 채움"""
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # 점수 내림차순, 같은 점수는 문서 순서
+        candidates = candidates[np.lexsort((doc_ids[candidates], -scores[candidates]))]
+        results = [(int(doc_ids[column]), float(scores[column])) for column in candidates]
+
+        chosen = {doc_id for doc_id, _ in results}
+        for doc_id in np.asarray(self.defaults).tolist():
+            if len(results) >= k:
+                break
+            if doc_id not in chosen:
+                results.append((doc_id, 0.0))
+        return results
+
+    def search_batch(self, keyword_lists, missions, k=5, extra_terms_lists=None, hazards=None):
+        """여러 인원의 위험 키워드를 임무별로 묶어 한 번에 검색 → 인원별 상위 k 개 (문서 번호, 점수)
+
+        hazards 를 생략하면 키워드로 위험 유형 행렬을 만듭니다 (HazardLexicon.vectors).
+        k 가 0 이면 빈 결과, 음수면 ValueError
+        """
+        k = int(k)
+        if k < 0:
+            raise ValueError(f"검색 개수는 0 이상이어야 합니다: {k}")
+        if k == 0:
+            return [[] for _ in keyword_lists]
+        if extra_terms_lists is None:
+            extra_terms_lists = [()] * len(keyword_lists)
+        hazards = self.lexicon.vectors(keyword_lists) if hazards is None else np.asarray(hazards, dtype=np.float32)
+        queries = [query_weights([*keywords, *extra_terms])
+                   for keywords, extra_terms in zip(keyword_lists, extra_terms_lists)]
+
+        groups = {}
+        for row, mission in enumerate(missions):
+            groups.setdefault(mission, []).append(row)
+        results = [None] * len(queries)
+        for mission, rows in groups.items():
+            width = sum(stop - start for start, stop in self.mission_ranges(mission))
+            # 점수 행렬이 BATCH_SCORE_CELLS 를 넘지 않도록 행을 나눔
+            step = max(1, BATCH_SCORE_CELLS // max(width, 1))
+            for chunk_start in range(0, len(rows), step):
+                chunk = rows[chunk_start:chunk_start + step]
+                matrix, doc_ids = self.score_matrix([queries[row] for row in chunk], hazards[chunk], mission)
+                for position, row in enumerate(chunk):
+                    results[row] = self._top_k(matrix[position], doc_ids, k)
+        return results
+
+    def search(self, keywords, mission=None, k=5, extra_terms=()):
+        """위험 키워드로 검색 (임무는 필터 + 가산점) → 상위 k 개 (문서 번호, 점수), 부족하면 기본 대책으로 채움"""
+        return self.search_batch([keywords], [mission], k, [extra_terms])[0]
+
+    def search_texts(self, keywords, mission=None, k=5, extra_terms=()):
+        """search 결과의 안전대책 본문"""
+        return [self.text(doc_id) for doc_id, _ in self.search(keywords, mission, k, extra_terms)]
+
+
+# ----------------------------------------------------------------------
+# 벤치마크
+
+def synthetic_documents(count, seed=0):
+    """벤치마크용 합성 안전대책 (내장 키워드/대책 문구 조합)"""
+    try:
+        from models.keyword_index import MISSION_KEYWORDS, COMMON_KEYWORDS
+    except ImportError:
+        from keyword_index import MISSION_KEYWORDS, COMMON_KEYWORDS
+
+    rng = np.random.default_rng(seed)
+    missions = list(MISSION_KEYWORDS)
+    phrases = [measure for measure, _ in BASE_MEASURES + COMMON_MEASURES]
+    phrases += [measure for measures in MISSION_MEASURES.values() for measure, _ in measures]
+    words = sorted({word for text in phrases + COMMON_KEYWORDS for word in text.split()})
+    for i in range(count):
+        mission = missions[i % len(missions)] if i % 3 else None
+        keywords = MISSION_KEYWORDS[mission] if mission else COMMON_KEYWORDS
+        body = ' '.join(rng.choice(words, 6).tolist())
+        text = f"{phrases[i % len(phrases)]} - {body} ({i})"
+        yield text, mission, ' '.join(rng.choice(keywords, 2).tolist())
+
+
+def bench(docs=300000, queries=1000, workdir=None):
+    """대량 문서 색인 생성 / 저장 / 로드 / 질의 지연 시간"""
+    import tempfile
+
+    try:
+        from models.keyword_index import KeywordIndex
+    except ImportError:
+        from keyword_index import KeywordIndex
+
+    workdir = Path(workdir or tempfile.mkdtemp(prefix='retrieval_bench_'))
+    started = time.perf_counter()
+    index = MeasureIndex.build(synthetic_documents(docs), source='bench')
+    build_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    index.save(workdir / MEASURE_INDEX_DIRNAME)
+    save_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    index = MeasureIndex.load(workdir / MEASURE_INDEX_DIRNAME)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    keyword_index = KeywordIndex()
+    missions = list(keyword_index.missions)
+    rng = np.random.default_rng(1)
+    query_missions = [missions[i % len(missions)] for i in range(queries)]
+    query_keywords = [
+        keyword_index.select(keyword_index.mission_rows([mission]), [30], [5], [int(rng.integers(2 ** 63))], 10)[0]
+        for mission in query_missions
+    ]
+    latencies = []
+    for keywords, mission in zip(query_keywords, query_missions):
+        started = time.perf_counter()
+        index.search_texts(keywords, mission, 5)
+        latencies.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    index.search_batch(query_keywords, query_missions, 5)
+    batch_ms = (time.perf_counter() - started) * 1000 / queries
+
+    latencies = np.array(latencies) * 1000
+    print(f"안전대책 {len(index):,}건, 색인어 {index.meta['terms']:,}개, 목록 {len(index.post_docs):,}개")
+    print(f"색인 생성 {build_sec:.1f}초, 저장 {save_sec:.1f}초, 로드 {load_ms:.1f}ms")
+    print(f"질의 {queries:,}회: p50 {np.percentile(latencies, 50):.2f}ms, p99 {np.percentile(latencies, 99):.2f}ms")
+    print(f"일괄 질의 (search_batch): 질의당 {batch_ms:.2f}ms")
+    return {'build_sec': build_sec, 'load_ms': load_ms, 'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)), 'batch_ms': batch_ms}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="안전대책 검색 색인 생성 / 벤치마크")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="내장 안전대책 (+ 말뭉치 저장소) → 색인")
+    build.add_argument('--corpus', help="models/corpus.py 로 변환한 말뭉치 저장소 폴더")
+    build.add_argument('--output', default=str(Path(__file__).resolve().parent / MEASURE_INDEX_DIRNAME))
+    bench_parser = commands.add_parser('bench', help="대량 문서 질의 지연 시간")
+    bench_parser.add_argument('--docs', type=int, default=300000)
+    bench_parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.docs, args.queries)
+        return 0
+
+    started = time.perf_counter()
+    documents, default_count = builtin_documents()
+    source = 'builtin'
+    try:
+        if args.corpus:
+            reader = CorpusReader(args.corpus)
+            documents = itertools.chain(documents, corpus_documents(reader))
+            source = f'corpus:{Path(args.corpus).name}'
+        index = MeasureIndex.build(documents, default_count, source=source)
+        index.save(args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ 검색 색인 생성 실패: {e}", file=sys.stderr)
+        return 1
+    print(f"✅ 검색 색인 생성 완료: {args.output} (안전대책 {len(index):,}건, 색인어 {index.meta['terms']:,}개, "
+          f"{time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+보고서 / 화면 문구 템플릿
+
+{이름} 자리표시자 템플릿을 모듈 로드 시 한 번 f-string 함수로 컴파일해 두고,
+여러 인원의 문구는 열(column) 단위 값으로 map 한 번에 채웁니다 (매 호출 서식 해석 없음).
+화면에는 join 으로 미리 이어 붙인 버퍼 하나를 넘깁니다.
+
+사용법:
+    RISK_ANALYSIS.render(name='홍길동', age=30, mission='엔진정비', keyword1=..., ...)
+    RISK_ANALYSIS.render_many(name=names, age=ages, mission='엔진정비', ...)   # 인원별 리스트
+    KEYWORD_LINE.join(rank=range(1, 11), keyword=keywords)                      # 줄 단위 버퍼
+"""
+
+import itertools
+import keyword
+import string
+
+# 열(column)로 취급하는 값 형식 (numpy 배열 등 tolist() 가 있는 값 포함, 나머지는 모든 행에 같은 값)
+COLUMN_TYPES = (list, tuple, range)
+
+
+class TextTemplate:
+    """한 번 컴파일해 두는 문구 템플릿 ({이름}, {이름:서식}, {이름!r} 지원)"""
+
+    def __init__(self, source):
+        self.source = source
+        self.fields = []
+        parts = []
+        constants = {}
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if literal:
+                name = f'_l{len(constants)}'
+                constants[name] = literal
+                parts.append(f'{{{name}}}')
+            if field is None:
+                continue
+            if not field.isidentifier() or keyword.iskeyword(field) or field.startswith('_'):
+                raise ValueError(f"템플릿 자리표시자는 이름만 사용할 수 있습니다: {{{field}}}")
+            if field not in self.fields:
+                self.fields.append(field)
+            expression = field + (f'!{conversion}' if conversion else '')
+            if spec:
+                name = f'_l{len(constants)}'
+                constants[name] = spec
+                expression += f':{{{name}}}'
+            parts.append(f'{{{expression}}}')
+
+        # 문구 조각은 전역 상수로 두고 f-string 한 줄로 컴파일 (BUILD_STRING 한 번)
+        code = f"def render({', '.join(self.fields)}):\n    return f'{''.join(parts)}'\n"
+        namespace = dict(constants)
+        exec(compile(code, '<template>', 'exec'), namespace)
+        self._render = namespace['render']
+
+    def render(self, values=None, **fields):
+        """값 하나씩 → 문구"""
+        values = {**(values or {}), **fields}
+        return self._render(*[values[field] for field in self.fields])
+
+    def render_many(self, records=None, **columns):
+        """여러 행 → 문구 리스트
+
+        records: 행별 딕셔너리 리스트, 또는 columns: 이름=열 (리스트 / 배열, 그 밖의 값은 모든 행에 공통)
+        """
+        if records is not None:
+            records = list(records)
+            columns = {field: [record[field] for record in records] for field in self.fields}
+        arguments = []
+        rows = None
+        for field in self.fields:
+            value = columns[field]
+            if hasattr(value, 'tolist') and getattr(value, 'ndim', 1):
+                value = value.tolist()
+            if isinstance(value, COLUMN_TYPES):
+                if rows is not None and len(value) != rows:
+                    raise ValueError(f"템플릿 열 길이가 다릅니다: {field} ({len(value)}), {rows}")
+                rows = len(value)
+                arguments.append(value)
+            else:
+                arguments.append(itertools.repeat(value))
+        if rows is None:
+            return [self._render(*[columns[field] for field in self.fields])]
+        return list(map(self._render, *arguments))
+
+    def join(self, records=None, separator='\n', **columns):
+        """render_many 결과를 하나의 버퍼로 (화면 위젯에 한 번에 넣을 때)"""
+        return separator.join(self.render_many(records, **columns))
+
+
+# DL 위험 분석 (DummyDLModel.generate_risk_analysis)
+RISK_ANALYSIS = TextTemplate("""🔍 {name}님의 {mission} 임무 위험 분석:
+
+현재 {age}세 {name}님이 {mission} 작업을 수행할 때 예상되는 주요 위험요인들을 AI가 분석한 결과입니다.
+
+주요 위험 포인트:
+• {keyword1}: 가장 높은 주의가 필요한 영역
+• {keyword2}: 작업 중 지속적인 모니터링 필요
+• {keyword3}: 사전 준비 및 점검 강화 필요
+
+개인 맞춤 주의사항:
+작업 경험과 개인 특성을 고려할 때, 특히 안전 절차 준수와 개인보호구 착용이 중요합니다.
+동료와의 원활한 소통을 통해 위험 상황을 사전에 예방하시기 바랍니다.""")
+
+# GUI 기본 안전대책 (SafetyPredictionApp.generate_dummy_safety_tips)
+SAFETY_TIPS = TextTemplate("""🛡️ {name}님을 위한 맞춤 안전대책:
+
+1. 개인보호구 완전 착용
+   - 안전모, 보호안경, 방진마스크 필수
+   - {mission} 작업 전용 장갑 착용
+
+2. 작업 환경 점검
+   - 작업 전 안전점검 체크리스트 확인
+   - 비상 대피 경로 숙지
+
+3. 동료와의 협업 강화
+   - 2인 1조 작업 시스템 운영
+   - 정기적인 안전 신호 교환
+
+4. 정기 휴식 및 컨디션 관리
+   - 1시간마다 10분 휴식
+   - 피로 누적 시 작업 중단
+
+5. 응급상황 대응 준비
+   - 응급처치 키트 위치 확인
+   - 비상연락망 숙지""")
+
+# 위험 키워드 목록 한 줄 (GUI 키워드 목록)
+KEYWORD_LINE = TextTemplate("{rank:2d}. {keyword}")
+
+# 추천 안전대책 (요약 + 번호 목록, 일괄 보고서)
+MEASURES_HEADER = TextTemplate("🛡️ {summary}")
+MEASURE_LINE = TextTemplate("{rank}. {measure}")
+
+
+def measures_text(recommendation):
+    """recommend_safety_measures 결과 → 안전대책 문구"""
+    measures = recommendation['measures']
+    return '\n'.join([MEASURES_HEADER.render(summary=recommendation['summary']),
+                      *MEASURE_LINE.render_many(rank=range(1, len(measures) + 1), measure=measures)])
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+압축 어휘 사전 (메모리 매핑)
+
+neural_vocab.pkl 의 word_to_idx / idx_to_word 딕셔너리 대신
+UTF-8 바이트 기준으로 정렬한 문자열 테이블 + 오프셋 배열 + 해시 인덱스를 한 파일에 담습니다.
+파일은 메모리 매핑으로 열리므로 로딩 시 언피클링이 없고, 항목당 수백 바이트의 파이썬 객체도 만들지 않습니다.
+조회 결과는 원래 딕셔너리와 같습니다.
+
+파일 구조 (리틀 엔디언, 각 구역 8바이트 정렬):
+    헤더      magic(8) 단어 수 / 문자열 바이트 수 / 해시 버킷 수 / ID 범위 / 정수 크기 (uint64 × 5)
+    offsets   uint[단어 수 + 1]  정렬 위치 → 문자열 시작 오프셋
+    ids       int[단어 수]       정렬 위치 → 단어 ID
+    by_id     int[ID 범위]       단어 ID → 정렬 위치 (없으면 -1)
+    buckets   int[버킷 수]       해시 버킷 → 정렬 위치 (빈 칸 -1, 선형 탐사)
+    strings   uint8[문자열 바이트 수]
+    (정수 크기는 모든 값이 32비트에 들어가면 4바이트, 아니면 8바이트)
+
+사용법:
+    python models/vocab.py convert neural_vocab.pkl neural_vocab.vocab
+    python models/vocab.py bench --size 500000
+"""
+
+import os
+import pickle
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+VOCAB_MAGIC = b'SVOCAB1\x00'
+HEADER = struct.Struct('<8sQQQQQ')
+VOCAB_FILENAME = 'neural_vocab.vocab'
+PICKLE_FILENAME = 'neural_vocab.pkl'
+
+
+def _hash(word_bytes):
+    """문자열 바이트 → 32비트 해시 (프로세스와 관계없이 동일, 버킷 선택용)"""
+    return zlib.crc32(word_bytes)
+
+
+def _aligned(size):
+    return (size + 7) & ~7
+
+
+def write_vocab(path, word_to_idx):
+    """word_to_idx 딕셔너리 → 압축 어휘 파일"""
+    entries = sorted((word.encode('utf-8'), int(idx)) for word, idx in word_to_idx.items())
+    count = len(entries)
+
+    blob = b''.join(word for word, _ in entries)
+    ids = np.array([idx for _, idx in entries], dtype=np.int64)
+    id_range = int(ids.max()) + 1 if count else 0
+    if count and ids.min() < 0:
+        raise ValueError("단어 ID 는 0 이상이어야 합니다")
+    itemsize = 4 if max(len(blob), id_range, count * 2) < 2 ** 31 else 8
+
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(word) for word, _ in entries])
+    by_id = np.full(id_range, -1, dtype=np.int64)
+    by_id[ids] = np.arange(count)
+
+    # 해시 버킷 (적재율 50% 이하, 2의 거듭제곱)
+    n_buckets = 1
+    while n_buckets < count * 2:
+        n_buckets <<= 1
+    mask = n_buckets - 1
+    table = [-1] * n_buckets
+    for position, (word, _) in enumerate(entries):
+        slot = _hash(word) & mask
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = position
+    buckets = np.array(table, dtype=np.int64)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(VOCAB_MAGIC, count, len(blob), n_buckets, id_range, itemsize))
+        for array in (offsets, ids, by_id, buckets):
+            data = array.astype(f'<i{itemsize}').tobytes()
+            f.write(data + b'\x00' * (_aligned(len(data)) - len(data)))
+        f.write(blob)
+    os.replace(tmp_path, path)  # 쓰는 도중 실패해도 기존 파일 유지
+    return path
+
+
+def convert_pickle(pickle_path, vocab_path=None):
+    """기존 neural_vocab.pkl → 압축 어휘 파일"""
+    pickle_path = Path(pickle_path)
+    with open(pickle_path, 'rb') as f:
+        vocab = pickle.load(f)
+    return write_vocab(vocab_path or pickle_path.with_suffix('.vocab'), vocab['word_to_idx'])
+
+
+class CompactVocab:
+    """메모리 매핑 어휘 사전"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = np.memmap(self.path, dtype=np.uint8, mode='r')
+        magic, count, blob_size, n_buckets, id_range, itemsize = HEADER.unpack_from(self._data, 0)
+        if magic != VOCAB_MAGIC:
+            raise ValueError(f"어휘 파일 형식이 아닙니다: {self.path}")
+
+        offset = HEADER.size
+
+        def section(length):
+            nonlocal offset
+            array = np.frombuffer(self._data, dtype=f'<i{itemsize}', count=length, offset=offset)
+            offset = _aligned(offset + array.nbytes)
+            return array
+
+        self.offsets = section(count + 1)
+        self.ids = section(count)
+        self.by_id = section(id_range)
+        self.buckets = section(n_buckets)
+        self.strings = np.frombuffer(self._data, dtype=np.uint8, count=blob_size, offset=offset)
+        self._mask = n_buckets - 1
+
+        # 단건 조회용 memoryview (NumPy 스칼라 변환 없이 파이썬 int / bytes 비교)
+        code = 'i' if itemsize == 4 else 'q'
+        self._offsets = memoryview(self.offsets).cast('B').cast(code)
+        self._ids = memoryview(self.ids).cast('B').cast(code)
+        self._by_id = memoryview(self.by_id).cast('B').cast(code)
+        self._buckets = memoryview(self.buckets).cast('B').cast(code)
+        self._strings = memoryview(self.strings)
+        self.vocab_size = count
+        self.word_to_idx = _WordToIdx(self)
+        self.idx_to_word = _IdxToWord(self)
+
+    def __len__(self):
+        return self.vocab_size
+
+    def _word_at(self, position):
+        """정렬 위치 → 문자열"""
+        return str(self._strings[self._offsets[position]:self._offsets[position + 1]], 'utf-8')
+
+    def _position(self, word):
+        """문자열 → 정렬 위치 (없으면 -1)"""
+        if not isinstance(word, str) or not self.vocab_size:
+            return -1
+        word_bytes = word.encode('utf-8')
+        slot = _hash(word_bytes) & self._mask
+        offsets, strings, buckets = self._offsets, self._strings, self._buckets
+        while True:
+            position = buckets[slot]
+            if position < 0:
+                return -1
+            start, stop = offsets[position], offsets[position + 1]
+            if stop - start == len(word_bytes) and strings[start:stop] == word_bytes:
+                return position
+            slot = (slot + 1) & self._mask
+
+    def index(self, word, default=None):
+        """단어 → ID"""
+        position = self._position(word)
+        return default if position < 0 else self._ids[position]
+
+    def word(self, idx, default=None):
+        """ID → 단어"""
+        if not isinstance(idx, (int, np.integer)) or not 0 <= idx < len(self._by_id):
+            return default
+        position = self._by_id[idx]
+        return default if position < 0 else self._word_at(position)
+
+    def encode(self, words, unknown=-1):
+        """단어 리스트 → ID 배열 (없는 단어는 unknown)"""
+        return np.array([self.index(word, unknown) for word in words], dtype=np.int64)
+
+    def decode(self, ids):
+        """ID 배열 → 단어 리스트"""
+        return [self.word(int(idx)) for idx in ids]
+
+    def words_with_prefix(self, prefix):
+        """접두어로 시작하는 단어 (정렬 순서, 이진 탐색)"""
+        prefix_bytes = prefix.encode('utf-8')
+        key = lambda position: self._strings[self._offsets[position]:self._offsets[position + 1]].tobytes()
+        low, high = 0, self.vocab_size
+        while low < high:
+            middle = (low + high) // 2
+            if key(middle) < prefix_bytes:
+                low = middle + 1
+            else:
+                high = middle
+        for position in range(low, self.vocab_size):
+            if not key(position).startswith(prefix_bytes):
+                break
+            yield self._word_at(position)
+
+
+class _WordToIdx(Mapping):
+    """word_to_idx 딕셔너리와 같은 조회 인터페이스"""
+
+    def __init__(self, vocab):
+        self._vocab = vocab
+
+    def __getitem__(self, word):
+        idx = self._vocab.index(word)
+        if idx is None:
+            raise KeyError(word)
+        return idx
+
+    def __contains__(self, word):
+        return self._vocab._position(word) >= 0
+
+    def __iter__(self):
+        return (self._vocab._word_at(position) for position in range(self._vocab.vocab_size))
+
+    def __len__(self):
+        return self._vocab.vocab_size
+
+
+class _IdxToWord(Mapping):
+    """idx_to_word 딕셔너리와 같은 조회 인터페이스"""
+
+    def __init__(self, vocab):
+        self._vocab = vocab
+
+    def __getitem__(self, idx):
+        word = self._vocab.word(idx)
+        if word is None:
+            raise KeyError(idx)
+        return word
+
+    def __contains__(self, idx):
+        return self._vocab.word(idx) is not None
+
+    def __iter__(self):
+        return (int(idx) for idx in np.sort(self._vocab.ids))
+
+    def __len__(self):
+        return self._vocab.vocab_size
+
+
+def load_vocab(models_dir):
+    """어휘 사전 로드 (압축 파일 우선, 없거나 pickle 보다 오래됐으면 pickle) → word_to_idx / idx_to_word / vocab_size"""
+    models_dir = Path(models_dir)
+    compact_path = models_dir / VOCAB_FILENAME
+    pickle_path = models_dir / PICKLE_FILENAME
+    if compact_path.exists():
+        # pickle 만 새로 교체된 경우 예전 어휘로 조회하지 않도록 수정 시각 비교
+        if not pickle_path.exists() or pickle_path.stat().st_mtime <= compact_path.stat().st_mtime:
+            vocab = CompactVocab(compact_path)
+            return {'word_to_idx': vocab.word_to_idx, 'idx_to_word': vocab.idx_to_word,
+                    'vocab_size': vocab.vocab_size}
+        print(f"⚠️ {VOCAB_FILENAME} 이 {PICKLE_FILENAME} 보다 오래되어 pickle 을 사용합니다 "
+              f"(재변환: python models/vocab.py convert {pickle_path} {compact_path})")
+    if pickle_path.exists():
+        with open(pickle_path, 'rb') as f:
+            return pickle.load(f)
+    return None
+
+
+def verify(pickle_path, vocab_path):
+    """pickle 딕셔너리와 압축 파일의 조회 결과가 같은지 확인"""
+    with open(pickle_path, 'rb') as f:
+        original = pickle.load(f)
+    vocab = CompactVocab(vocab_path)
+    word_to_idx, idx_to_word = original['word_to_idx'], original['idx_to_word']
+    return (
+        len(vocab) == len(word_to_idx)
+        and all(vocab.word_to_idx.get(word) == idx for word, idx in word_to_idx.items())
+        and all(vocab.idx_to_word.get(idx) == word for idx, word in idx_to_word.items())
+        and '\x00없는 단어' not in vocab.word_to_idx
+        and vocab.idx_to_word.get(len(vocab.by_id)) is None
+    )
+
+
+# ----------------------------------------------------------------------
+# 벤치마크
+
+def rss_mb():
+    """현재 프로세스 상주 메모리 (MB)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        return float('nan')
+
+
+def _measure_load(kind, path, lookups):
+    """(별도 프로세스) 로드 시간 / 메모리 증가량 / 조회 시간 측정 결과 출력"""
+    import json
+
+    words = [f'word_{i}' for i in range(0, lookups * 7, 7)]
+    before = rss_mb()
+    started = time.perf_counter()
+    if kind == 'pickle':
+        with open(path, 'rb') as f:
+            word_to_idx = pickle.load(f)['word_to_idx']
+    else:
+        word_to_idx = CompactVocab(path).word_to_idx
+    load_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    found = sum(1 for word in words if word in word_to_idx)
+    lookup_sec = time.perf_counter() - started
+    print(json.dumps({'load_ms': load_sec * 1000, 'rss_mb': rss_mb() - before,
+                      'lookup_us': lookup_sec / len(words) * 1e6, 'found': found}))
+
+
+def bench(size=500000, lookups=10000, workdir=None):
+    """pickle 딕셔너리 vs 압축 어휘: 로드 시간, 메모리(RSS), 조회 시간"""
+    import json
+    import tempfile
+
+    workdir = Path(workdir or tempfile.mkdtemp(prefix='vocab_bench_'))
+    pickle_path = workdir / PICKLE_FILENAME
+    vocab_path = workdir / VOCAB_FILENAME
+    with open(pickle_path, 'wb') as f:
+        pickle.dump({
+            'word_to_idx': {f'word_{i}': i for i in range(size)},
+            'idx_to_word': {i: f'word_{i}' for i in range(size)},
+            'vocab_size': size
+        }, f)
+    started = time.perf_counter()
+    convert_pickle(pickle_path, vocab_path)
+    convert_sec = time.perf_counter() - started
+
+    results = {}
+    for kind, path in (('pickle', pickle_path), ('compact', vocab_path)):
+        output = subprocess.run(
+            [sys.executable, __file__, '_measure', kind, str(path), str(lookups)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[kind] = json.loads(output.strip().splitlines()[-1])
+        results[kind]['file_mb'] = path.stat().st_size / 1024 ** 2
+
+    print(f"어휘 {size:,}개 (변환 {convert_sec:.2f}초)")
+    print(f"{'형식':>8} {'파일(MB)':>10} {'로드(ms)':>10} {'RSS 증가(MB)':>14} {'조회(us)':>10}")
+    for kind, stats in results.items():
+        print(f"{kind:>8} {stats['file_mb']:>10.1f} {stats['load_ms']:>10.1f} "
+              f"{stats['rss_mb']:>14.1f} {stats['lookup_us']:>10.2f}")
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="압축 어휘 사전 변환 / 검증 / 벤치마크")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="neural_vocab.pkl → 압축 어휘 파일")
+    convert.add_argument('pickle_path')
+    convert.add_argument('vocab_path', nargs='?')
+    bench_parser = commands.add_parser('bench', help="로드 시간 / 메모리 비교")
+    bench_parser.add_argument('--size', type=int, default=500000)
+    bench_parser.add_argument('--lookups', type=int, default=10000)
+    measure = commands.add_parser('_measure')
+    measure.add_argument('kind')
+    measure.add_argument('path')
+    measure.add_argument('lookups', type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        vocab_path = convert_pickle(args.pickle_path, args.vocab_path)
+        ok = verify(args.pickle_path, vocab_path)
+        print(f"{'✅' if ok else '❌'} 어휘 변환 {'완료' if ok else '검증 실패'}: {vocab_path}")
+        return 0 if ok else 1
+    if args.command == 'bench':
+        bench(args.size, args.lookups)
+        return 0
+    _measure_load(args.kind, args.path, args.lookups)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간대별 기상 데이터 저장소
+
+weather_data_2025.xlsx 를 한 번만 파싱해 열(column) 단위 .npy 캐시로 변환하고,
+이후에는 메모리 매핑으로 바로 엽니다. 캐시는 2025-08-01 00시 기준 시간 오프셋으로
+인덱싱되므로 임의의 시간 구간 기상 조인은 DataFrame 병합 없이 O(1) 슬라이싱입니다.
+원본 파일의 수정시각/크기(필요 시 SHA-256)나 날씨 인코더가 바뀌면 캐시를 다시 만듭니다.
+파일이 손상되어 읽을 수 없으면 기상 데이터 없이(weather=None) 예측합니다.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from models.feature_tables import DEFAULT_ENCODERS, PERIOD_START, PERIOD_HOURS
+except ImportError:  # models/ 폴더에서 직접 실행한 경우
+    from feature_tables import DEFAULT_ENCODERS, PERIOD_START, PERIOD_HOURS
+
+WEATHER_FILENAME = 'weather_data_2025.xlsx'
+CACHE_VERSION = 1
+
+# 캐시 열 이름 → 엑셀 열 이름 후보
+COLUMN_ALIASES = {
+    'timestamp': ['일시', '일시(시간)', 'datetime', 'timestamp', 'date_time'],
+    'date': ['날짜', '일자', 'date'],
+    'hour': ['시간', '시', 'hour'],
+    'weather_temp': ['기온', '기온(°C)', '온도', 'temp', 'temperature', 'weather_temp'],
+    'weather_humidity': ['습도', '습도(%)', 'humidity', 'weather_humidity'],
+    'weather_condition': ['날씨', '기상', '기상상태', 'weather', 'condition', 'weather_condition']
+}
+
+WEATHER_COLUMNS = ['weather_temp', 'weather_humidity', 'weather_condition']
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _find_column(frame, key):
+    """별칭 목록에서 실제 열 이름 찾기"""
+    lowered = {str(col).strip().lower(): col for col in frame.columns}
+    for alias in COLUMN_ALIASES[key]:
+        if alias.lower() in lowered:
+            return lowered[alias.lower()]
+    return None
+
+
+class WeatherStore:
+    """메모리 매핑 기상 캐시"""
+
+    def __init__(self, source_path, cache_dir=None, weather_encoder=None):
+        self.source_path = Path(source_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.source_path.parent / '.weather_cache'
+        self.weather_encoder = weather_encoder or DEFAULT_ENCODERS['weather_encoder']
+        self.columns = None
+
+    @classmethod
+    def find(cls, search_dirs, weather_encoder=None):
+        """검색 폴더에서 기상 파일을 찾아 저장소 생성 (없으면 None)"""
+        for directory in search_dirs:
+            path = Path(directory) / WEATHER_FILENAME
+            if path.exists():
+                return cls(path, weather_encoder=weather_encoder)
+        return None
+
+    @property
+    def meta_path(self):
+        return self.cache_dir / 'meta.json'
+
+    def open(self):
+        """캐시 검증 후 메모리 매핑으로 열기 (필요 시 재생성, 읽을 수 없는 파일이면 None)"""
+        try:
+            if not self._cache_valid():
+                self.rebuild()
+            self.columns = {
+                name: np.load(self.cache_dir / f'{name}.npy', mmap_mode='r')
+                for name in WEATHER_COLUMNS
+            }
+        except Exception as e:
+            print(f"❌ 기상 데이터 로딩 실패, 기상 정보 없이 예측합니다: {e}")
+            self.columns = None
+            return None
+        return self
+
+    def encoder_hash(self):
+        """날씨 인코더 해시 (인코더가 바뀌면 캐시된 날씨 코드 재생성)"""
+        encoded = json.dumps(sorted((str(k), int(v)) for k, v in self.weather_encoder.items()), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _source_signature(self):
+        stat = self.source_path.stat()
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def _cache_valid(self):
+        """원본 수정시각/크기 비교, 수정시각만 바뀐 경우 해시로 재확인"""
+        if not self.meta_path.exists():
+            return False
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if meta.get('version') != CACHE_VERSION or meta.get('hours') != PERIOD_HOURS:
+            return False
+        if meta.get('encoder') != self.encoder_hash():
+            return False
+        if not all((self.cache_dir / f'{name}.npy').exists() for name in WEATHER_COLUMNS):
+            return False
+
+        signature = self._source_signature()
+        if signature['size'] != meta.get('size'):
+            return False
+        if signature['mtime_ns'] == meta.get('mtime_ns'):
+            return True
+
+        # 내용은 같고 수정시각만 바뀐 경우 (복사/동기화) 캐시 재사용
+        if file_sha256(self.source_path) != meta.get('sha256'):
+            return False
+        meta.update(signature)
+        self._write_meta(meta)
+        return True
+
+    def rebuild(self):
+        """엑셀 → 열 단위 .npy 캐시 변환"""
+        import pandas as pd
+
+        frame = pd.read_excel(self.source_path)
+        timestamps = self._parse_timestamps(frame, pd)
+        offsets = ((timestamps - pd.Timestamp(PERIOD_START)) // pd.Timedelta(hours=1)).to_numpy()
+        in_period = (offsets >= 0) & (offsets < PERIOD_HOURS)
+        offsets = offsets[in_period].astype(np.int64)
+
+        arrays = {
+            'weather_temp': np.full(PERIOD_HOURS, np.nan, dtype=np.float32),
+            'weather_humidity': np.full(PERIOD_HOURS, np.nan, dtype=np.float32),
+            'weather_condition': np.full(PERIOD_HOURS, -1, dtype=np.int8)
+        }
+        for name in ('weather_temp', 'weather_humidity'):
+            column = _find_column(frame, name)
+            if column is not None:
+                values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float32)
+                arrays[name][offsets] = values[in_period]
+        column = _find_column(frame, 'weather_condition')
+        if column is not None:
+            codes = frame[column].map(self.weather_encoder).fillna(-1).to_numpy(dtype=np.int8)
+            arrays['weather_condition'][offsets] = codes[in_period]
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for name, values in arrays.items():
+            # 임시 파일에 쓴 뒤 교체 (다른 프로세스가 읽는 중에도 안전)
+            tmp_path = self.cache_dir / f'{name}.tmp.npy'
+            np.save(tmp_path, values)
+            os.replace(tmp_path, self.cache_dir / f'{name}.npy')
+
+        meta = {
+            'version': CACHE_VERSION,
+            'source': str(self.source_path),
+            'sha256': file_sha256(self.source_path),
+            'hours': PERIOD_HOURS,
+            'encoder': self.encoder_hash(),
+            'rows': int(in_period.sum())
+        }
+        meta.update(self._source_signature())
+        self._write_meta(meta)
+        print(f"✅ 기상 데이터 캐시 생성 완료: {meta['rows']}시간")
+
+    def _parse_timestamps(self, frame, pd):
+        """일시 열 (또는 날짜 + 시간 열) → Timestamp 시리즈"""
+        column = _find_column(frame, 'timestamp')
+        if column is not None:
+            return pd.to_datetime(frame[column])
+
+        date_column = _find_column(frame, 'date')
+        hour_column = _find_column(frame, 'hour')
+        if date_column is None:
+            raise ValueError(f"{self.source_path.name}: 일시/날짜 열을 찾을 수 없습니다")
+        timestamps = pd.to_datetime(frame[date_column])
+        if hour_column is not None:
+            timestamps = timestamps + pd.to_timedelta(pd.to_numeric(frame[hour_column]), unit='h')
+        return timestamps
+
+    def _write_meta(self, meta):
+        tmp_path = self.meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.meta_path)
+
+    def window(self, start_offset, hours):
+        """시간 구간 기상 데이터 (메모리 매핑 슬라이스 뷰, O(1))"""
+        if self.columns is None and self.open() is None:
+            raise ValueError(f"기상 데이터를 열 수 없습니다: {self.source_path}")
+        if start_offset < 0 or start_offset + hours > PERIOD_HOURS:
+            raise ValueError(f"기상 데이터 범위를 벗어났습니다: {start_offset} + {hours}시간")
+        return {name: values[start_offset:start_offset + hours] for name, values in self.columns.items()}
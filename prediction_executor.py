@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예측 실행기 - 제한된 작업자 풀 + 요청 ID + 취소 + 중복 요청 병합
+
+예측 버튼을 누를 때마다 스레드를 새로 만드는 대신 하나의 작업자 풀에서 실행합니다.
+새 요청이 들어오면 이전 요청은 취소되고(대기 중이면 즉시, 실행 중이면 다음 확인 지점에서),
+결과는 가장 최근 요청에 대해서만 적용됩니다. 같은 입력의 요청이 진행 중이면 새로 계산하지 않고 합칩니다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PredictionCancelled(Exception):
+    """더 새로운 요청에 의해 대체된 예측"""
+
+
+class CancelToken:
+    """실행 중 작업의 협력적 취소 신호"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def sleep(self, seconds):
+        """취소 가능한 대기 (대기 중 취소되면 즉시 PredictionCancelled 발생)"""
+        if self._event.wait(seconds):
+            raise PredictionCancelled()
+
+    def check(self):
+        """취소되었으면 PredictionCancelled 발생 (작업 중간 확인 지점)"""
+        if self._event.is_set():
+            raise PredictionCancelled()
+
+
+class PredictionExecutor:
+    """최신 요청 우선 예측 실행기"""
+
+    def __init__(self, max_workers=1):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prediction')
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._latest_id = 0
+        self._pending = {}  # 요청 키 → (future, CancelToken)
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def submit(self, key, func):
+        """예측 요청 제출
+
+        key: 입력을 정규화한 해시 가능한 값 (같은 키의 진행 중 요청은 병합)
+        func: func(cancel_token) 형태의 예측 함수
+        반환: (request_id, future)
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._latest_id = self._next_id
+
+            # 대체된 요청 취소 (대기 중이면 실행 전 제거, 실행 중이면 협력적 취소)
+            for other_key, (future, token) in list(self._pending.items()):
+                if other_key != key:
+                    token.cancel()
+                    future.cancel()
+                    del self._pending[other_key]
+                    self.cancelled += 1
+
+            # 같은 입력의 요청이 진행 중이면 병합
+            if key in self._pending:
+                self.coalesced += 1
+                return request_id, self._pending[key][0]
+
+            token = CancelToken()
+            future = self._pool.submit(self._run, key, func, token)
+            self._pending[key] = (future, token)
+            return request_id, future
+
+    def _run(self, key, func, token):
+        try:
+            token.check()
+            return func(token)
+        finally:
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is not None and entry[1] is token:
+                    del self._pending[key]
+
+    def is_latest(self, request_id):
+        """가장 최근 요청인지 확인 (결과 적용 여부 판단)"""
+        with self._lock:
+            return request_id == self._latest_id
+
+    def shutdown(self):
+        """대기/실행 중 요청 모두 취소 후 종료"""
+        with self._lock:
+            for future, token in self._pending.values():
+                token.cancel()
+                future.cancel()
+            self._pending.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
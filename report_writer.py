@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예측 보고서 스트리밍 기록기
+
+보고서를 (시트 이름, 헤더, 행 생성기) 목록으로 표현하고, 행을 생성기에서 하나씩 받아
+바로 파일에 씁니다. 엑셀은 openpyxl write-only 워크북을 사용하므로 시트 전체를
+DataFrame 이나 셀 객체로 메모리에 올리지 않습니다. CSV / Parquet 도 같은 시트 목록으로 기록합니다.
+"""
+
+import csv
+import time
+from pathlib import Path
+
+# 계측 구간 → 상태 표시줄 / 보고서 표시 이름
+STAGE_LABELS = {
+    'gui.load_models': '모델 로딩',
+    'predict.ml': 'ML 추론',
+    'predict.dl': 'DL 생성',
+    'predict.render': '결과 표시',
+    'report.write': '보고서 기록'
+}
+
+REPORT_FORMATS = {'.xlsx': 'xlsx', '.csv': 'csv', '.parquet': 'parquet'}
+
+# 진행 상황 콜백 호출 간격 (행)
+PROGRESS_EVERY = 1000
+
+# Parquet 행 그룹 크기 (행)
+PARQUET_ROW_GROUP = 10000
+
+# 시간대별 예측 배열 → 행 변환 단위 (행)
+HOURLY_CHUNK = 1024
+
+# 위험 등급별 엑셀 공유 스타일 (등급 → (스타일 이름, 배경색))
+RISK_LEVEL_STYLES = {
+    '낮음': ('risk_low', 'C6EFCE'),
+    '보통': ('risk_medium', 'FFEB9C'),
+    '높음': ('risk_high', 'FFC7CE')
+}
+
+
+class ReportSheet:
+    """보고서 시트 하나 (행은 생성기에서 지연 생성)"""
+
+    def __init__(self, name, header, rows, column_styles=None):
+        self.name = name
+        self.header = list(header)
+        self.rows = rows
+        # 엑셀 열 서식 {열 번호: {값: 공유 스타일 이름}} (날짜/시각은 openpyxl 이 표시 형식 자동 지정)
+        self.column_styles = column_styles or {}
+
+
+def timing_info(system_info, timings, started):
+    """시스템 정보 + 구간별 소요시간 항목 (보고서 기록 시간은 마지막 시트를 쓰는 시점까지)
+
+    started: 보고서 기록을 시작한 time.perf_counter() 값
+    """
+    info = dict(system_info, **{
+        f"소요시간 - {STAGE_LABELS.get(name, name)}": f"{elapsed_ms:.1f}ms" for name, elapsed_ms in timings.items()
+    })
+    info[f"소요시간 - {STAGE_LABELS['report.write']}"] = lambda: f"{(time.perf_counter() - started) * 1000:.1f}ms"
+    return info
+
+
+def build_report_sheets(prediction_results, system_info):
+    """예측 결과 → 보고서 시트 목록 (예측결과, 위험키워드, 안전대책, [시간대별예측], 시스템정보)"""
+    user_info = prediction_results['user_info']
+
+    def result_rows():
+        yield ['사용자명', user_info['name']]
+        yield ['성별', user_info['gender']]
+        yield ['나이', user_info['age']]
+        yield ['근속연수', user_info['service_years']]
+        yield ['임무', user_info['mission']]
+        yield ['위험지수', f"{prediction_results['risk_score']:.1f}"]
+        yield ['예측시간', prediction_results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')]
+
+    def keyword_rows():
+        for rank, keyword in enumerate(prediction_results['keywords'], 1):
+            yield [rank, keyword]
+
+    def safety_rows():
+        for line in prediction_results['safety_tips'].split('\n'):
+            if line.strip():
+                yield [line.strip()]
+
+    def system_rows():
+        # 값이 함수이면 기록 시점에 호출 (보고서 기록 소요 시간 등)
+        for key, value in system_info.items():
+            yield [key, value() if callable(value) else value]
+
+    sheets = [
+        ReportSheet('예측결과', ['항목', '값'], result_rows()),
+        ReportSheet('위험키워드', ['순위', '위험 키워드'], keyword_rows()),
+        ReportSheet('안전대책', ['안전대책'], safety_rows())
+    ]
+    if prediction_results.get('hourly') is not None:
+        level_styles = {level: style for level, (style, _) in RISK_LEVEL_STYLES.items()}
+        sheets.append(ReportSheet(
+            '시간대별예측', ['예측시각', '위험지수', '시간대', '위험등급'],
+            hourly_rows(prediction_results['hourly']), column_styles={3: level_styles}
+        ))
+    sheets.append(ReportSheet('시스템정보', ['항목', '값'], system_rows()))
+    return sheets
+
+
+def hourly_rows(series, chunk_size=HOURLY_CHUNK):
+    """시간대별 예측 배열 → 행 (chunk_size 행씩 잘라 한 번에 파이썬 값으로 변환)"""
+    total = len(series['risk_score'])
+    for start in range(0, total, chunk_size):
+        stop = start + chunk_size
+        yield from zip(
+            series['timestamp'][start:stop].tolist(),
+            series['risk_score'][start:stop].tolist(),
+            series['hour_of_day'][start:stop].tolist(),
+            series['risk_level'][start:stop].tolist()
+        )
+
+
+class _ProgressCounter:
+    """행 수 집계 + 일정 간격 진행 상황 콜백"""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.rows = 0
+
+    def tick(self, sheet_name):
+        self.rows += 1
+        if self.callback is not None and self.rows % PROGRESS_EVERY == 0:
+            self.callback(sheet_name, self.rows)
+
+    def finish(self, sheet_name):
+        if self.callback is not None:
+            self.callback(sheet_name, self.rows)
+
+
+def _add_named_styles(workbook):
+    """헤더 / 위험 등급 공유 스타일 등록 (셀마다 서식 객체를 만들지 않음)"""
+    from openpyxl.styles import Font, NamedStyle, PatternFill
+
+    workbook.add_named_style(NamedStyle(name='report_header', font=Font(bold=True)))
+    for style_name, color in RISK_LEVEL_STYLES.values():
+        workbook.add_named_style(NamedStyle(
+            name=style_name, fill=PatternFill(fill_type='solid', start_color=color, end_color=color)
+        ))
+
+
+def _styled_cell(worksheet, value, style_name):
+    """공유 스타일 이름을 지정한 write-only 셀"""
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.style = style_name
+    return cell
+
+
+def write_xlsx(path, sheets, progress=None):
+    """write-only 워크북으로 엑셀 스트리밍 기록"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    _add_named_styles(workbook)
+    counter = _ProgressCounter(progress)
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(sheet.name)
+        worksheet.append([_styled_cell(worksheet, title, 'report_header') for title in sheet.header])
+        # 값과 스타일이 같은 셀은 시트마다 한 번만 만들어 모든 행에서 재사용
+        # (write-only 시트는 append 시점에 행을 바로 직렬화하므로 셀 공유가 안전)
+        styled_cells = {
+            column: {value: _styled_cell(worksheet, value, style_name) for value, style_name in styles.items()}
+            for column, styles in sheet.column_styles.items()
+        }
+        for row in sheet.rows:
+            if styled_cells:
+                row = list(row)
+                for column, cells in styled_cells.items():
+                    row[column] = cells.get(row[column], row[column])
+            worksheet.append(row)
+            counter.tick(sheet.name)
+        counter.finish(sheet.name)
+    workbook.save(path)
+    return counter.rows
+
+
+def _sheet_path(path, sheet, multiple):
+    """시트가 여러 개면 <이름>_<시트>.<확장자> 로 분리"""
+    path = Path(path)
+    if not multiple:
+        return path
+    return path.with_name(f"{path.stem}_{sheet.name}{path.suffix}")
+
+
+def write_csv(path, sheets, progress=None):
+    """시트별 CSV 스트리밍 기록 (엑셀 호환 UTF-8 BOM)"""
+    counter = _ProgressCounter(progress)
+    sheets = list(sheets)
+    for sheet in sheets:
+        with open(_sheet_path(path, sheet, len(sheets) > 1), 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(sheet.header)
+            for row in sheet.rows:
+                writer.writerow(row)
+                counter.tick(sheet.name)
+        counter.finish(sheet.name)
+    return counter.rows
+
+
+def _arrow_column(pa, values):
+    """열 값 → Arrow 배열 (자료형이 섞인 열은 문자열로 통일)"""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None else str(value) for value in values])
+
+
+def write_parquet(path, sheets, progress=None):
+    """시트별 Parquet 기록 (행 그룹 단위 스트리밍, pyarrow 필요)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 저장에는 pyarrow 가 필요합니다: pip install pyarrow") from None
+
+    counter = _ProgressCounter(progress)
+    sheets = list(sheets)
+    for sheet in sheets:
+        writer = None
+        batch = []
+
+        def flush():
+            nonlocal writer
+            columns = list(zip(*batch)) if batch else [[] for _ in sheet.header]
+            table = pa.Table.from_arrays([_arrow_column(pa, column) for column in columns], names=sheet.header)
+            if writer is None:
+                writer = pq.ParquetWriter(_sheet_path(path, sheet, len(sheets) > 1), table.schema)
+            writer.write_table(table)
+            batch.clear()
+
+        try:
+            for row in sheet.rows:
+                batch.append(row)
+                counter.tick(sheet.name)
+                if len(batch) >= PARQUET_ROW_GROUP:
+                    flush()
+            if batch or writer is None:
+                flush()
+        finally:
+            if writer is not None:
+                writer.close()
+        counter.finish(sheet.name)
+    return counter.rows
+
+
+def report_paths(path, sheets):
+    """보고서 형식별 실제 기록 파일 목록 (엑셀은 한 파일, CSV / Parquet 은 시트가 여러 개면 시트별 파일)"""
+    if REPORT_FORMATS.get(Path(path).suffix.lower(), 'xlsx') == 'xlsx':
+        return [Path(path)]
+    return [_sheet_path(path, sheet, len(sheets) > 1) for sheet in sheets]
+
+
+def write_report(path, sheets, progress=None):
+    """확장자에 따라 엑셀 / CSV / Parquet 으로 보고서 기록 → (기록한 행 수, 기록한 파일 목록)"""
+    sheets = list(sheets)
+    report_format = REPORT_FORMATS.get(Path(path).suffix.lower(), 'xlsx')
+    writer = {'xlsx': write_xlsx, 'csv': write_csv, 'parquet': write_parquet}[report_format]
+    return writer(path, sheets, progress), report_paths(path, sheets)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시작 시간 리포트 / 회귀 검사 스크립트
+main.py 의 모듈별 임포트 시간과 첫 창 표시까지의 시간을 측정합니다.
+
+사용법:
+    python startup_report.py                       # 리포트 출력
+    python startup_report.py --check               # 예산 초과 시 종료 코드 1
+    python startup_report.py --check --import-budget-ms 300 --window-budget-ms 1500
+
+첫 창 표시 시간은 디스플레이가 있는 환경에서만 측정됩니다.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# 시작 시점에 임포트되면 안 되는 무거운 모듈 (사용 시점에만 임포트)
+DEFERRED_MODULES = ['pandas', 'torch', 'sklearn', 'openpyxl']
+
+DEFAULT_IMPORT_BUDGET_MS = 500
+DEFAULT_WINDOW_BUDGET_MS = 2000
+
+
+def measure_imports(module='main'):
+    """python -X importtime 결과를 최상위 패키지별 누적 시간(ms)으로 집계"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, raw_name = line.split(':', 1)[1].split('|')
+        name = raw_name.strip()
+        level = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+        entries.append((level, name, int(cumulative_us)))
+
+    # main 이 직접 임포트한 모듈(1단계)을 최상위 패키지별로 합산
+    # (importtime 은 하위 모듈을 상위 모듈보다 먼저 출력)
+    packages = {}
+    children = {}
+    total_us = 0
+    for level, name, cumulative_us in entries:
+        if level == 1:
+            top = name.split('.')[0]
+            children[top] = children.get(top, 0) + cumulative_us
+        elif level == 0:
+            if name == module:
+                total_us = cumulative_us
+                packages = children
+            children = {}
+
+    return {
+        'total_ms': total_us / 1000,
+        'modules_ms': {name: us / 1000 for name, us in sorted(packages.items(), key=lambda x: -x[1])},
+        'imported': sorted({name.split('.')[0] for _, name, _ in entries})
+    }
+
+
+def measure_first_window(timeout=30):
+    """main.py 를 측정 모드로 실행해 첫 창 표시까지 시간 측정 (디스플레이 없으면 None)"""
+    env = dict(os.environ, SAFETY_STARTUP_PROBE=repr(time.time()))
+    try:
+        result = subprocess.run(
+            [sys.executable, 'main.py'], cwd=PROJECT_DIR, env=env,
+            capture_output=True, text=True, timeout=timeout, stdin=subprocess.DEVNULL
+        )
+    except subprocess.TimeoutExpired:
+        return None
+
+    for line in result.stdout.splitlines():
+        if line.startswith('{'):
+            return json.loads(line)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="안전 예측 시스템 시작 시간 리포트")
+    parser.add_argument('--check', action='store_true', help="예산 초과 시 종료 코드 1")
+    parser.add_argument('--import-budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    parser.add_argument('--window-budget-ms', type=float, default=DEFAULT_WINDOW_BUDGET_MS)
+    parser.add_argument('--json', dest='json_path', help="측정 결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    report = {'imports': measure_imports(), 'window': measure_first_window()}
+
+    print("⏱️ 시작 시간 리포트")
+    print(f"\n📦 main 임포트 합계: {report['imports']['total_ms']:.1f}ms")
+    for name, ms in list(report['imports']['modules_ms'].items())[:15]:
+        print(f"   {name:<24} {ms:>8.1f}ms")
+
+    window = report['window']
+    if window is None:
+        print("\n🪟 첫 창 표시: 측정 불가 (디스플레이 없음)")
+    else:
+        print(f"\n🪟 첫 창 표시: {window['first_window_ms']:.1f}ms")
+
+    # 예산 검사
+    failures = []
+    eager = [name for name in DEFERRED_MODULES if name in report['imports']['imported']]
+    if eager:
+        failures.append(f"시작 시 임포트되면 안 되는 모듈: {', '.join(eager)}")
+    if report['imports']['total_ms'] > args.import_budget_ms:
+        failures.append(f"임포트 시간 {report['imports']['total_ms']:.1f}ms > 예산 {args.import_budget_ms:.0f}ms")
+    if window is not None:
+        eager = [name for name in window['heavy_modules_at_first_window'] if name in DEFERRED_MODULES]
+        if eager:
+            failures.append(f"첫 창 표시 시점에 로드된 모듈: {', '.join(eager)}")
+        if window['first_window_ms'] > args.window_budget_ms:
+            failures.append(f"첫 창 표시 {window['first_window_ms']:.1f}ms > 예산 {args.window_budget_ms:.0f}ms")
+
+    if args.json_path:
+        report['failures'] = failures
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        print("\n❌ 시작 시간 예산 초과:")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1 if args.check else 0
+
+    print("\n✅ 시작 시간 예산 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())